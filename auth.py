@@ -1,3 +1,4 @@
+import logging
 from datetime import datetime, timezone, timedelta
 
 from app.core.config import get_settings
@@ -8,6 +9,7 @@ from app.exceptions.auth import (
     InvalidJWTTokenError,
     JWTTokenExpiredError,
 )
+from app.exceptions import PasswordHasherBusyHTTPError
 from app.exceptions.base import ObjectAlreadyExistsError
 from app.schemes.users import (
     SUserAdd,
@@ -20,10 +22,23 @@ from app.repositories.users import UsersRepository
 from app.repositories.roles import RolesRepository
 import jwt
 from passlib.context import CryptContext
+from sqlalchemy import select, update
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import joinedload
+
+from app.core.hashing import bcrypt_rounds, get_password_hasher
+from app.core.token_cache import token_cache
+from app.models import UserModel
+
+logger = logging.getLogger(__name__)
 
 
 class AuthService(BaseService):
-    pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+    pwd_context = CryptContext(
+        schemes=["bcrypt"],
+        deprecated="auto",
+        bcrypt__rounds=get_settings().BCRYPT_ROUNDS,
+    )
 
     @classmethod
     def create_access_token(cls, data: dict) -> str:
@@ -44,28 +59,50 @@ class AuthService(BaseService):
     def hash_password(cls, plain_password) -> str:
         return cls.pwd_context.hash(plain_password)
 
+    @classmethod
+    async def verify_password_async(cls, plain_password, hashed_password) -> bool:
+        """Проверка пароля в пуле bcrypt, не блокируя цикл событий"""
+        return await get_password_hasher().verify(plain_password, hashed_password)
+
+    @classmethod
+    async def hash_password_async(cls, plain_password) -> str:
+        """Хеширование пароля в пуле bcrypt, не блокируя цикл событий"""
+        return await get_password_hasher().hash(plain_password)
+
+    @classmethod
+    def password_needs_rehash(cls, hashed_password: str) -> bool:
+        """Хеш создан с другим cost-фактором или устаревшей схемой"""
+        if cls.pwd_context.needs_update(hashed_password):
+            return True
+        return bcrypt_rounds(hashed_password) != get_settings().BCRYPT_ROUNDS
+
     @classmethod
     def decode_token(cls, token: str) -> dict:
+        claims = token_cache.get(token)
+        if claims is not None:
+            return claims
         settings = get_settings()
         try:
-            return jwt.decode(token, settings.SECRET_KEY, [settings.ALGORITHM])
+            claims = jwt.decode(token, settings.SECRET_KEY, [settings.ALGORITHM])
+            token_cache.put(token, claims)
+            return claims
         except jwt.exceptions.DecodeError as ex:
             raise InvalidJWTTokenError from ex
         except jwt.exceptions.ExpiredSignatureError as ex:
             raise JWTTokenExpiredError from ex
 
-    def register_user(self, user_data: SUserAddRequest):
+    async def register_user(self, user_data: SUserAddRequest):
         users_repo = UsersRepository(self.db)
         roles_repo = RolesRepository(self.db)
         
         # Проверка существующего пользователя
-        existing = users_repo.get_one_or_none(email=user_data.email)
+        existing = await users_repo.get_one_or_none(email=user_data.email)
         if existing:
             raise UserAlreadyExistsError
         
         # Получение роли по умолчанию (volunteer)
         if user_data.role_id is None:
-            volunteer_role = roles_repo.get_one_or_none(name="volunteer")
+            volunteer_role = await roles_repo.get_one_or_none(name="volunteer")
             if not volunteer_role:
                 raise ValueError("Роль volunteer не найдена в базе")
             role_id = volunteer_role.id
@@ -73,7 +110,7 @@ class AuthService(BaseService):
             role_id = user_data.role_id
 
         try:
-            hashed_password: str = self.hash_password(user_data.password)
+            hashed_password: str = await self.hash_password_async(user_data.password)
             new_user_data = SUserAdd(
                 email=user_data.email,
                 hashed_password=hashed_password,
@@ -81,16 +118,16 @@ class AuthService(BaseService):
                 role_id=role_id,
                 city=user_data.city,
             )
-            return users_repo.add(new_user_data)
+            return await users_repo.add(new_user_data)
         except ObjectAlreadyExistsError:
             raise UserAlreadyExistsError
 
-    def login_user(self, user_data: SUserAuth):
+    async def login_user(self, user_data: SUserAuth):
         users_repo = UsersRepository(self.db)
-        user = users_repo.get_one_or_none_with_role(email=user_data.email)
+        user = await users_repo.get_one_or_none_with_role(email=user_data.email)
         if not user:
             raise UserNotFoundError
-        if not self.verify_password(user_data.password, user.hashed_password):
+        if not await self.verify_password_async(user_data.password, user.hashed_password):
             raise InvalidPasswordError
         access_token: str = self.create_access_token(
             {
@@ -98,55 +135,92 @@ class AuthService(BaseService):
                 "role": user.role.name,
             }
         )
+        if self.password_needs_rehash(user.hashed_password):
+            # Пароль известен только сейчас — перехешируем с текущим cost-фактором.
+            # Вход от этого не зависит: при занятом пуле повторим в следующий раз
+            try:
+                new_hash: str = await self.hash_password_async(user_data.password)
+                await self.db.execute(
+                    update(UserModel)
+                    .where(UserModel.id == user.id)
+                    .values(hashed_password=new_hash)
+                )
+                await self.db.commit()
+            except (PasswordHasherBusyHTTPError, SQLAlchemyError):
+                logger.warning("Пароль пользователя %s не перехеширован", user.id, exc_info=True)
+                await self.db.rollback()
         return access_token
 
-    def get_me(self, user_id: int):
-        from app.models import RegistrationModel, CertificateModel, EventModel
+    async def get_me(self, user_id: int) -> SUserGetWithRels:
+        """
+        Профиль пользователя с ролью, записями и сертификатами.
+
+        Число запросов постоянно (3) и не зависит от количества записей:
+        пользователь с ролью, записи вместе с мероприятиями одним JOIN
+        и сертификаты. Схема ответа собирается один раз.
+        """
+        from app.models import (
+            RegistrationModel,
+            CertificateModel,
+            EventModel,
+        )
         from app.schemes.registrations import SRegistrationWithEvent
         from app.schemes.certificates import SCertificateGet
-        
-        users_repo = UsersRepository(self.db)
-        user: SUserGetWithRels | None = users_repo.get_one_or_none_with_role(
-            id=user_id
-        )
+        from app.schemes.roles import SRoleGet
+
+        user = (
+            await self.db.execute(
+                select(UserModel)
+                .options(joinedload(UserModel.role))
+                .where(UserModel.id == user_id)
+            )
+        ).scalar_one_or_none()
         if not user:
             raise UserNotFoundError
-        
-        # Получаем регистрации пользователя
-        registrations = self.db.query(RegistrationModel).filter(
-            RegistrationModel.volunteer_id == user_id
-        ).all()
-        
-        user_registrations = []
-        for reg in registrations:
-            event = self.db.query(EventModel).filter(EventModel.id == reg.event_id).first()
-            reg_data = SRegistrationWithEvent(
-                id=reg.id,
-                event_id=reg.event_id,
-                volunteer_id=reg.volunteer_id,
-                registered_at=reg.registered_at,
-                hours_earned=reg.hours_earned,
-                status=reg.status,
-                event_title=event.title if event else None,
-                scheduled_at=event.scheduled_at if event else None,
-                location=event.location if event else None,
+
+        # Записи вместе с данными мероприятий — один запрос вместо N+1
+        registrations = (
+            await self.db.execute(
+                select(
+                    RegistrationModel.id,
+                    RegistrationModel.event_id,
+                    RegistrationModel.volunteer_id,
+                    RegistrationModel.registered_at,
+                    RegistrationModel.hours_earned,
+                    RegistrationModel.status,
+                    EventModel.title.label("event_title"),
+                    EventModel.scheduled_at,
+                    EventModel.location,
+                )
+                .outerjoin(EventModel, EventModel.id == RegistrationModel.event_id)
+                .where(RegistrationModel.volunteer_id == user_id)
+                .order_by(RegistrationModel.id)
             )
-            user_registrations.append(reg_data)
-        
-        # Получаем сертификаты пользователя
-        certificates = self.db.query(CertificateModel).filter(
-            CertificateModel.volunteer_id == user_id
         ).all()
-        
-        user_certificates = [
-            SCertificateGet.model_validate(cert, from_attributes=True)
-            for cert in certificates
-        ]
-        
-        # Добавляем данные в объект пользователя
-        user_dict = user.model_dump()
-        user_dict['registrations'] = [r.model_dump() for r in user_registrations]
-        user_dict['certificates'] = [c.model_dump() for c in user_certificates]
-        
-        return SUserGetWithRels(**user_dict)
 
+        certificates = (
+            await self.db.execute(
+                select(CertificateModel)
+                .where(CertificateModel.volunteer_id == user_id)
+                .order_by(CertificateModel.id)
+            )
+        ).scalars().all()
+
+        return SUserGetWithRels(
+            id=user.id,
+            name=user.name,
+            email=user.email,
+            role_id=user.role_id,
+            total_hours=user.total_hours or 0,
+            rating=user.rating or 0.0,
+            city=user.city,
+            role=SRoleGet.model_validate(user.role, from_attributes=True),
+            registrations=[
+                SRegistrationWithEvent.model_validate(row, from_attributes=True)
+                for row in registrations
+            ],
+            certificates=[
+                SCertificateGet.model_validate(cert, from_attributes=True)
+                for cert in certificates
+            ],
+        )
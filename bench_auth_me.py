@@ -0,0 +1,96 @@
+"""
+Бенчмарк профиля волонтёра (AuthService.get_me, эндпоинт /auth/me).
+
+Показывает, что время ответа и число SQL-запросов не растут
+с количеством записей пользователя на мероприятия.
+
+Запуск:
+    python bench_auth_me.py
+"""
+import asyncio
+import statistics
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.pool import StaticPool
+
+from app.core.database import Base
+from app.models import EventModel, NGOModel, RegistrationModel, RoleModel, UserModel
+from app.services.auth import AuthService
+
+REGISTRATION_COUNTS = [10, 100, 1000, 2000]
+REPEATS = 30
+
+
+async def make_engine():
+    engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    return engine
+
+
+async def seed(engine, registrations: int) -> int:
+    async with AsyncSession(engine) as db:
+        role = RoleModel(name="volunteer")
+        ngo = NGOModel(name="НКО «Бенчмарк»")
+        db.add_all([role, ngo])
+        await db.flush()
+        user = UserModel(
+            name="Волонтёр",
+            email="bench@example.com",
+            hashed_password="x",
+            role_id=role.id,
+        )
+        db.add(user)
+        await db.flush()
+        now = datetime.now()
+        events = [
+            EventModel(title=f"Мероприятие {i}", ngo_id=ngo.id, scheduled_at=now + timedelta(hours=i))
+            for i in range(registrations)
+        ]
+        db.add_all(events)
+        await db.flush()
+        db.add_all(RegistrationModel(event_id=e.id, volunteer_id=user.id) for e in events)
+        user_id = user.id
+        await db.commit()
+        return user_id
+
+
+async def run(registrations: int) -> tuple[float, float, int]:
+    engine = await make_engine()
+    user_id = await seed(engine, registrations)
+
+    queries = 0
+
+    def count_query(*args):
+        nonlocal queries
+        queries += 1
+
+    timings = []
+    async with AsyncSession(engine) as db:
+        service = AuthService(db)
+        await service.get_me(user_id)  # прогрев
+        event.listen(engine.sync_engine, "before_cursor_execute", count_query)
+        for _ in range(REPEATS):
+            db.expunge_all()
+            started = time.perf_counter()
+            profile = await service.get_me(user_id)
+            timings.append((time.perf_counter() - started) * 1000)
+        event.remove(engine.sync_engine, "before_cursor_execute", count_query)
+
+    assert len(profile.registrations) == registrations
+    await engine.dispose()
+    return statistics.median(timings), max(timings), queries // REPEATS
+
+
+async def main() -> None:
+    print(f"{'registrations':>14} {'median, ms':>11} {'max, ms':>9} {'queries':>8}")
+    for registrations in REGISTRATION_COUNTS:
+        median, worst, queries = await run(registrations)
+        print(f"{registrations:>14} {median:>11.2f} {worst:>9.2f} {queries:>8}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
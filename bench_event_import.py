@@ -0,0 +1,89 @@
+"""
+Бенчмарк импорта мероприятий: по одному за вызов против пакетного импорта.
+
+Поштучный путь повторяет create_event: ORM-объект, COMMIT и REFRESH на
+каждое мероприятие. Пакетный — EventImportService: проверка всех строк
+и многострочные INSERT порциями по IMPORT_CHUNK_SIZE.
+
+Запуск:
+    python bench_event_import.py [--events 2000]
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from app.core.database import Base
+from app.models import EventModel, NGOModel
+from app.services.event_import import EventImportService
+
+
+def make_records(count: int) -> list[dict]:
+    start = datetime(2030, 1, 1, 10, 0)
+    return [
+        {
+            "title": f"Еженедельный субботник №{i}",
+            "ngo_id": 1,
+            "scheduled_at": (start + timedelta(days=7 * i)).isoformat(),
+            "location": "Москва, Сокольники",
+            "max_volunteers": 30,
+            "duration_hours": 3,
+        }
+        for i in range(count)
+    ]
+
+
+async def make_engine(path: str):
+    # Файловая БД: стоимость COMMIT на диск — главное, что экономит пакетный путь
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+    async with AsyncSession(engine) as db:
+        db.add(NGOModel(id=1, name="НКО «Бенчмарк»"))
+        await db.commit()
+    return engine
+
+
+async def per_call(engine, records: list[dict]) -> float:
+    started = time.perf_counter()
+    async with AsyncSession(engine) as db:
+        for record in records:
+            event = EventModel(**{**record, "scheduled_at": datetime.fromisoformat(record["scheduled_at"])})
+            db.add(event)
+            await db.commit()
+            await db.refresh(event)
+    return time.perf_counter() - started
+
+
+async def bulk(engine, records: list[dict]) -> float:
+    started = time.perf_counter()
+    async with AsyncSession(engine) as db:
+        result = await EventImportService(db).import_events(records)
+    assert result["created"] == len(records), result["errors"][:3]
+    return time.perf_counter() - started
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--events", type=int, default=2000)
+    args = parser.parse_args()
+    records = make_records(args.events)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bench_import.db")
+        print(f"events={args.events}")
+        print(f"{'path':>10} {'seconds':>8} {'events/s':>10}")
+        for name, run in (("per-call", per_call), ("bulk", bulk)):
+            engine = await make_engine(path)
+            elapsed = await run(engine, records)
+            await engine.dispose()
+            print(f"{name:>10} {elapsed:>8.2f} {args.events / elapsed:>10.0f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
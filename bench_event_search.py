@@ -0,0 +1,141 @@
+"""
+Бенчмарк полнотекстового поиска мероприятий на большом каталоге.
+
+Каталог синтетический: названия из шаблонов, описания — слова
+с распределением Ципфа (частые слова встречаются почти везде, редкие —
+в единицах мероприятий), как в живых текстах. Для каждого запроса
+печатаются число найденных и задержки p50/p95 того же SELECT, что
+выполняет /api/events/search. Стоимость ранжирования растёт с числом
+совпадений, поэтому запросы подобраны разной избирательности.
+
+Запуск:
+    python bench_event_search.py [--events 100000] [--repeat 50]
+"""
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import create_engine, func, select, text
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from app.core.database import Base
+from app.core.event_search import match_query, rebuild_search_index, search_matches
+from app.models import EventModel, NGOModel
+
+ACTIVITIES = [
+    "Субботник", "Уборка", "Посадка деревьев", "Сбор вещей", "Донорская акция",
+    "Экскурсия", "Мастер-класс", "Благотворительный марафон", "Ярмарка",
+    "Помощь приюту", "Горячая линия", "Концерт", "Турнир", "Фестиваль",
+    "Перепись птиц", "Ремонт детской площадки", "Сортировка одежды",
+]
+PLACES = [
+    "в парке", "в приюте для животных", "в детском доме", "в больнице",
+    "в библиотеке", "в музее", "у реки", "в школе", "во дворе", "онлайн",
+    "в доме престарелых", "на стадионе", "в лесу", "на набережной",
+]
+WORDS = (
+    "волонтеры помогают организаторам встречать гостей регистрация участников "
+    "навигация площадка уборка территории посадка деревьев кустарников сбор мусора "
+    "сортировка пакеты перчатки инвентарь выдаем бесплатно обед чай горячий "
+    "дети подростки пожилые люди животные собаки кошки выгул корм лечение "
+    "консультации юристы психологи поддержка звонки обращения горячая линия "
+    "экология переработка пластик бумага батарейки стекло раздельный сбор "
+    "спорт забег марафон дистанция медали вода питание медицинская помощь "
+    "музей экскурсия выставка картины история краеведение архив фотографии "
+    "ремонт покраска скамейки качели песочница инструменты стройматериалы "
+    "книги чтение школьники уроки репетиторство математика русский английский"
+).split()
+
+
+def make_events(count: int) -> list[dict]:
+    rng = random.Random(42)
+    # Частота слова обратно пропорциональна его рангу
+    weights = [1 / rank for rank in range(1, len(WORDS) + 1)]
+    start = datetime(2030, 1, 1, 10, 0)
+    return [
+        {
+            "title": f"{rng.choice(ACTIVITIES)} {rng.choice(PLACES)}",
+            "description": " ".join(rng.choices(WORDS, weights, k=rng.randint(15, 40))),
+            "ngo_id": 1,
+            "scheduled_at": start + timedelta(hours=i),
+            "status": "active",
+            "seats_taken": 0,
+        }
+        for i in range(count)
+    ]
+
+
+QUERIES = [
+    "архив фотографии",
+    "перепись птиц в лесу",
+    "экскурсия в музей",
+    "ремонт площадки",
+    "субботник",
+    "помощь",
+]
+
+
+def build(path: str, count: int) -> float:
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(engine)
+    with engine.begin() as conn:
+        conn.execute(NGOModel.__table__.insert(), [{"id": 1, "name": "НКО «Бенчмарк»"}])
+        conn.execute(EventModel.__table__.insert(), make_events(count))
+    started = time.perf_counter()
+    with engine.begin() as conn:
+        rebuild_search_index(conn)
+    engine.dispose()
+    return time.perf_counter() - started
+
+
+async def measure(path: str, repeat: int) -> None:
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    async with AsyncSession(engine) as db:
+        print(f"{'query':>24} {'found':>6} {'matches':>8} {'p50 ms':>8} {'p95 ms':>8}")
+        for query in QUERIES:
+            matches = search_matches(query, "sqlite", 20)
+            statement = (
+                select(EventModel.id, EventModel.title)
+                .join(matches, matches.c.event_id == EventModel.id)
+                .order_by(matches.c.rank)
+            )
+            total = (
+                await db.execute(
+                    select(func.count()).select_from(text("events_search"))
+                    .where(text("events_search MATCH :query"))
+                    .params(query=match_query(query, "sqlite"))
+                )
+            ).scalar_one()
+            timings = []
+            for _ in range(repeat):
+                started = time.perf_counter()
+                rows = (await db.execute(statement)).all()
+                timings.append((time.perf_counter() - started) * 1000)
+            p95 = statistics.quantiles(timings, n=20)[-1]
+            print(
+                f"{query:>24} {len(rows):>6} {total:>8} "
+                f"{statistics.median(timings):>8.2f} {p95:>8.2f}"
+            )
+    await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--events", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bench_search.db")
+        seconds = build(path, args.events)
+        print(f"events={args.events} index rebuild {seconds:.1f} s")
+        asyncio.run(measure(path, args.repeat))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,442 @@
+"""
+Сквозной HTTP-бенчмарк: сценарии пользователей через настоящий main.app.
+
+Цели (--target):
+- asgi — приложение в этом же процессе через httpx.ASGITransport, без сети;
+  startup/shutdown выполняются как при обычном запуске;
+- uvicorn — локально запущенный `uvicorn main:app`: добавляются сокеты,
+  HTTP-парсер и отдельный процесс.
+
+Сценарии (--scenarios):
+- auth — регистрация → вход → /auth/me (шаги идут волнами, чтобы у каждого
+  шага были свои задержки и число SQL-запросов);
+- catalogue — первая страница каталога, обход по курсору, карточки, поиск;
+- signup_rush — одновременная запись волонтёров на одно мероприятие,
+  мест вдвое меньше, чем желающих;
+- complete — завершение мероприятия с 1000 записавшихся: ответ 202
+  и время до окончания начисления фоновой задачей.
+
+По каждому шагу: p50/p95/p99, запросов в секунду и SQL-запросов на
+HTTP-запрос (счётчики queries из /api/metrics/pool, поэтому они видны
+и для uvicorn). Результат сравнивается с bench_http_baseline.json:
+p95 или пропускная способность хуже допуска либо больше SQL-запросов —
+регрессия, код выхода 1. --save-baseline записывает текущий прогон
+как baseline для выбранной цели.
+
+База — временный файл SQLite в режиме WAL (SQLITE_PATH), как в
+инсталляциях без MySQL; для MySQL задайте USE_MOCK_DB=false и настройки
+DB_* заранее. Опрос очереди задач отключён (воркеры будит notify_workers),
+чтобы фоновые запросы не попадали в счётчики.
+
+Запуск:
+    python bench_http.py [--target asgi|uvicorn] [--scenarios auth,catalogue]
+                         [--concurrency 32] [--tolerance 0.25] [--save-baseline]
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+import httpx
+
+_workdir = tempfile.mkdtemp(prefix="bench_http_")
+os.environ.setdefault("USE_MOCK_DB", "true")
+os.environ.setdefault("SQLITE_PATH", os.path.join(_workdir, "bench_http.db"))
+os.environ.setdefault("JOB_POLL_INTERVAL_SECONDS", "3600")
+os.environ.setdefault("RECOMMENDATIONS_INTERVAL_SECONDS", "86400")
+os.environ.setdefault("RECOMMENDATIONS_FULL_INTERVAL_SECONDS", "86400")
+
+from sqlalchemy import func, insert, select  # noqa: E402
+
+from app.core.database import engine  # noqa: E402
+from app.core.event_search import rebuild_search_index  # noqa: E402
+from app.models import EventModel, NGOModel, RegistrationModel, RoleModel, UserModel  # noqa: E402
+from app.services.auth import AuthService  # noqa: E402
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "bench_http_baseline.json")
+UVICORN_PORT = 8765
+
+AUTH_USERS = 50
+CATALOGUE_EVENTS = 2000
+CATALOGUE_READERS = 200
+RUSH_VOLUNTEERS = 500
+COMPLETE_VOLUNTEERS = 1000
+
+
+def bearer(user_id: int, role: str = "volunteer") -> dict:
+    token = AuthService.create_access_token({"user_id": user_id, "role": role})
+    return {"Authorization": f"Bearer {token}"}
+
+
+ADMIN_EMAIL = "admin@bench.example.com"
+# Заполняется в seed_admin(): права проверяются по роли в БД, а не по токену
+ADMIN: dict = {}
+
+
+class Bench:
+    """HTTP-клиент, ограничение параллельности и замеры по шагам"""
+
+    def __init__(self, client: httpx.AsyncClient, concurrency: int) -> None:
+        self.client = client
+        self.semaphore = asyncio.Semaphore(concurrency)
+
+    async def sql_queries(self) -> int:
+        response = await self.client.get("/api/metrics/pool", headers=ADMIN)
+        response.raise_for_status()
+        return sum(engine_stats.get("queries", 0) for engine_stats in response.json().values())
+
+    async def _timed(self, method: str, url: str, kwargs: dict) -> tuple[float, httpx.Response]:
+        async with self.semaphore:
+            started = time.perf_counter()
+            response = await self.client.request(method, url, **kwargs)
+            return (time.perf_counter() - started) * 1000, response
+
+    async def step(
+        self, requests: list[tuple[str, str, dict]], expected: tuple[int, ...] = (200,)
+    ) -> tuple[dict, list[httpx.Response]]:
+        """Волна запросов (method, url, kwargs) и её сводка"""
+        queries_before = await self.sql_queries()
+        started = time.perf_counter()
+        results = await asyncio.gather(
+            *(self._timed(method, url, kwargs) for method, url, kwargs in requests)
+        )
+        elapsed = time.perf_counter() - started
+        queries = await self.sql_queries() - queries_before
+
+        latencies = [latency for latency, _ in results]
+        responses = [response for _, response in results]
+        return summarize(
+            latencies,
+            elapsed,
+            queries,
+            errors=sum(response.status_code not in expected for response in responses),
+        ), responses
+
+
+def summarize(latencies: list[float], elapsed: float, queries: int, errors: int = 0) -> dict:
+    if len(latencies) > 1:
+        quantiles = statistics.quantiles(latencies, n=100, method="inclusive")
+        p50, p95, p99 = quantiles[49], quantiles[94], quantiles[98]
+    else:
+        p50 = p95 = p99 = latencies[0]
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "p50_ms": round(p50, 2),
+        "p95_ms": round(p95, 2),
+        "p99_ms": round(p99, 2),
+        "rps": round(len(latencies) / elapsed, 1),
+        "queries_per_request": round(queries / len(latencies), 2),
+    }
+
+
+# Данные сценариев вставляются напрямую в БД: замеряется только HTTP-путь
+
+
+def seed_admin() -> None:
+    with engine.begin() as conn:
+        user_id = conn.execute(
+            select(UserModel.id).where(UserModel.email == ADMIN_EMAIL)
+        ).scalar_one_or_none()
+        if user_id is None:
+            role_id = conn.execute(select(RoleModel.id).where(RoleModel.name == "admin")).scalar_one()
+            user_id = conn.execute(
+                insert(UserModel).values(
+                    name="Администратор", email=ADMIN_EMAIL, hashed_password="x", role_id=role_id
+                )
+            ).inserted_primary_key[0]
+    ADMIN.update(bearer(user_id, "admin"))
+
+
+def seed_volunteers(conn, prefix: str, count: int) -> list[int]:
+    role_id = conn.execute(select(RoleModel.id).where(RoleModel.name == "volunteer")).scalar_one()
+    conn.execute(insert(UserModel), [
+        {"name": f"{prefix} {i}", "email": f"{prefix}{i}@bench.example.com", "hashed_password": "x", "role_id": role_id}
+        for i in range(count)
+    ])
+    return conn.execute(
+        select(UserModel.id).where(UserModel.email.like(f"{prefix}%@bench.example.com")).order_by(UserModel.id)
+    ).scalars().all()
+
+
+def seed_event(conn, title: str, max_volunteers: int | None = None) -> int:
+    ngo_id = conn.execute(select(func.min(NGOModel.id))).scalar_one()
+    return conn.execute(
+        insert(EventModel).values(
+            title=title, ngo_id=ngo_id, status="active", seats_taken=0,
+            scheduled_at=datetime.now() + timedelta(days=3), max_volunteers=max_volunteers,
+        )
+    ).inserted_primary_key[0]
+
+
+def seed_catalogue(count: int) -> None:
+    words = ("субботник", "марафон", "экскурсия", "ремонт", "концерт", "сбор вещей", "уборка парка")
+    start = datetime.now() + timedelta(days=1)
+    with engine.begin() as conn:
+        ngo_id = conn.execute(select(func.min(NGOModel.id))).scalar_one()
+        conn.execute(insert(EventModel), [
+            {
+                "title": f"{words[i % len(words)].capitalize()} №{i}",
+                "description": f"Нужны волонтёры: {words[(i * 3) % len(words)]}, {words[(i * 5) % len(words)]}.",
+                "ngo_id": ngo_id, "status": "active", "seats_taken": 0,
+                "scheduled_at": start + timedelta(hours=i), "max_volunteers": 30,
+            }
+            for i in range(count)
+        ])
+        rebuild_search_index(conn)
+
+
+async def scenario_auth(bench: Bench) -> dict:
+    run_id = time.time_ns()
+    users = [
+        {"name": f"Волонтёр {i}", "email": f"auth{run_id}-{i}@bench.example.com", "password": "benchpass123"}
+        for i in range(AUTH_USERS)
+    ]
+    register, _ = await bench.step(
+        [("POST", "/auth/register", {"json": user}) for user in users], expected=(200, 201)
+    )
+    login, responses = await bench.step([
+        ("POST", "/auth/login", {"json": {"email": user["email"], "password": user["password"]}})
+        for user in users
+    ])
+    tokens = [response.json()["access_token"] for response in responses if response.status_code == 200]
+    me, _ = await bench.step([
+        ("GET", "/auth/me", {"headers": {"Authorization": f"Bearer {token}"}}) for token in tokens
+    ])
+    return {"register": register, "login": login, "me": me}
+
+
+async def scenario_catalogue(bench: Bench) -> dict:
+    seed_catalogue(CATALOGUE_EVENTS)
+
+    first_page, responses = await bench.step(
+        [("GET", "/api/events", {"params": {"per_page": 20}})] * CATALOGUE_READERS
+    )
+    cursor = responses[0].headers.get("X-Next-Cursor")
+    ids = [event["id"] for event in responses[0].json()]
+
+    # Каждый читатель уходит на свою глубину: кэш страниц почти не помогает
+    cursors = []
+    while cursor and len(cursors) < CATALOGUE_READERS:
+        cursors.append(cursor)
+        response = await bench.client.get("/api/events", params={"per_page": 20, "cursor": cursor})
+        ids.extend(event["id"] for event in response.json())
+        cursor = response.headers.get("X-Next-Cursor")
+    pages, _ = await bench.step([
+        ("GET", "/api/events", {"params": {"per_page": 20, "cursor": cursor}}) for cursor in cursors
+    ])
+    detail, _ = await bench.step([
+        ("GET", f"/api/events/{event_id}", {}) for event_id in ids[:CATALOGUE_READERS]
+    ])
+    queries = ("субботник", "уборка парка", "экскурсия сбор", "марафон №1", "ремонт", "концерт")
+    search, _ = await bench.step([
+        ("GET", "/api/events/search", {"params": {"q": queries[i % len(queries)]}})
+        for i in range(CATALOGUE_READERS)
+    ])
+    return {"first_page": first_page, "pages": pages, "detail": detail, "search": search}
+
+
+async def scenario_signup_rush(bench: Bench) -> dict:
+    seats = RUSH_VOLUNTEERS // 2
+    with engine.begin() as conn:
+        volunteers = seed_volunteers(conn, "rush", RUSH_VOLUNTEERS)
+        event_id = seed_event(conn, "Забег в день города", max_volunteers=seats)
+
+    signup, responses = await bench.step(
+        [("POST", f"/api/events/{event_id}/signup", {"headers": bearer(user_id)}) for user_id in volunteers],
+        expected=(200, 409),
+    )
+    accepted = sum(response.status_code == 200 for response in responses)
+    with engine.connect() as conn:
+        seats_taken = conn.execute(select(EventModel.seats_taken).where(EventModel.id == event_id)).scalar_one()
+    assert accepted == seats_taken == seats, (accepted, seats_taken, seats)
+    return {"signup": signup}
+
+
+async def scenario_complete(bench: Bench) -> dict:
+    with engine.begin() as conn:
+        volunteers = seed_volunteers(conn, "complete", COMPLETE_VOLUNTEERS)
+        event_id = seed_event(conn, "Городской фестиваль")
+        conn.execute(insert(RegistrationModel), [
+            {"event_id": event_id, "volunteer_id": user_id} for user_id in volunteers
+        ])
+
+    queries_before = await bench.sql_queries()
+    started = time.perf_counter()
+    response = await bench.client.post(f"/api/events/{event_id}/complete", headers=ADMIN)
+    request_ms = (time.perf_counter() - started) * 1000
+    queries_request = await bench.sql_queries() - queries_before
+    assert response.status_code == 202, response.text
+    job_id = response.json()["job_id"]
+
+    polls = 0
+    while True:
+        job = (await bench.client.get(f"/api/jobs/{job_id}", headers=ADMIN)).json()
+        polls += 1
+        if job["status"] in ("done", "failed"):
+            break
+        await asyncio.sleep(0.01)
+    settle_ms = (time.perf_counter() - started) * 1000
+    assert job["status"] == "done", job["last_error"]
+    # Опрос /api/jobs — один запрос на вызов, в расход задачи не входит
+    queries_settle = await bench.sql_queries() - queries_before - queries_request - polls
+
+    return {
+        "complete": summarize([request_ms], request_ms / 1000, queries_request),
+        "settle": summarize([settle_ms], settle_ms / 1000, queries_settle),
+    }
+
+
+SCENARIOS = {
+    "auth": scenario_auth,
+    "catalogue": scenario_catalogue,
+    "signup_rush": scenario_signup_rush,
+    "complete": scenario_complete,
+}
+
+
+async def wait_for_jobs(client: httpx.AsyncClient, timeout: float = 60) -> None:
+    """Дождаться задач, поставленных при старте (пересчёт рекомендаций)"""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        pending = [
+            job for status in ("queued", "running")
+            for job in (await client.get("/api/jobs/", params={"status": status}, headers=ADMIN)).json()
+        ]
+        if not pending:
+            return
+        await asyncio.sleep(0.1)
+    raise TimeoutError("Фоновые задачи не завершились")
+
+
+async def run_scenarios(client: httpx.AsyncClient, names: list[str], concurrency: int) -> dict:
+    seed_admin()
+    await wait_for_jobs(client)
+    bench = Bench(client, concurrency)
+    results = {}
+    for name in names:
+        results[name] = await SCENARIOS[name](bench)
+    return results
+
+
+async def run_asgi(names: list[str], concurrency: int) -> dict:
+    from main import app
+
+    transport = httpx.ASGITransport(app=app)
+    async with app.router.lifespan_context(app):
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=120) as client:
+            return await run_scenarios(client, names, concurrency)
+
+
+async def run_uvicorn(names: list[str], concurrency: int) -> dict:
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(UVICORN_PORT), "--log-level", "warning"],
+        env=os.environ.copy(),
+    )
+    try:
+        base_url = f"http://127.0.0.1:{UVICORN_PORT}"
+        limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+        async with httpx.AsyncClient(base_url=base_url, timeout=120, limits=limits) as client:
+            for _ in range(300):
+                try:
+                    if (await client.get("/api")).status_code == 200:
+                        break
+                except httpx.TransportError:
+                    pass
+                await asyncio.sleep(0.1)
+            else:
+                raise RuntimeError("uvicorn не запустился")
+            return await run_scenarios(client, names, concurrency)
+    finally:
+        server.terminate()
+        server.wait(timeout=30)
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list[str]:
+    """Регрессии относительно baseline той же цели"""
+    regressions = []
+    for scenario, steps in results.items():
+        for step, stats in steps.items():
+            base = baseline.get(scenario, {}).get(step)
+            if base is None:
+                continue
+            name = f"{scenario}.{step}"
+            if stats["p95_ms"] > base["p95_ms"] * (1 + tolerance):
+                regressions.append(f"{name}: p95 {stats['p95_ms']} ms, в baseline {base['p95_ms']} ms")
+            if stats["requests"] > 1 and stats["rps"] < base["rps"] / (1 + tolerance):
+                regressions.append(f"{name}: {stats['rps']} rps, в baseline {base['rps']} rps")
+            if stats["queries_per_request"] > base["queries_per_request"]:
+                regressions.append(
+                    f"{name}: {stats['queries_per_request']} SQL на запрос, "
+                    f"в baseline {base['queries_per_request']}"
+                )
+    return regressions
+
+
+def report(results: dict, baseline: dict) -> None:
+    print(
+        f"{'step':>22} {'n':>5} {'err':>4} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} "
+        f"{'rps':>8} {'sql/req':>8} {'p95 vs base':>12}"
+    )
+    for scenario, steps in results.items():
+        for step, stats in steps.items():
+            base = baseline.get(scenario, {}).get(step)
+            delta = f"{(stats['p95_ms'] / base['p95_ms'] - 1) * 100:+.0f}%" if base else "—"
+            print(
+                f"{scenario + '.' + step:>22} {stats['requests']:>5} {stats['errors']:>4} "
+                f"{stats['p50_ms']:>8.2f} {stats['p95_ms']:>8.2f} {stats['p99_ms']:>8.2f} "
+                f"{stats['rps']:>8.1f} {stats['queries_per_request']:>8.2f} {delta:>12}"
+            )
+
+
+async def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--target", choices=("asgi", "uvicorn"), default="asgi")
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS))
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--tolerance", type=float, default=0.25, help="допустимое ухудшение p95 и rps")
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--save-baseline", action="store_true")
+    args = parser.parse_args()
+
+    names = [name.strip() for name in args.scenarios.split(",") if name.strip()]
+    unknown = set(names) - set(SCENARIOS)
+    if unknown:
+        parser.error(f"неизвестные сценарии: {', '.join(sorted(unknown))}")
+
+    run = run_asgi if args.target == "asgi" else run_uvicorn
+    results = await run(names, args.concurrency)
+
+    stored = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline, encoding="utf-8") as f:
+            stored = json.load(f)
+    baseline = stored.get(args.target, {})
+
+    print(f"target={args.target} concurrency={args.concurrency} database={engine.url}")
+    report(results, baseline)
+
+    if args.save_baseline:
+        stored[args.target] = {**baseline, **results}
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(stored, f, ensure_ascii=False, indent=2)
+        print(f"baseline сохранён: {args.baseline}")
+        return 0
+    if not baseline:
+        print("baseline для этой цели нет — запустите с --save-baseline")
+        return 0
+
+    regressions = compare(results, baseline, args.tolerance)
+    for regression in regressions:
+        print(f"РЕГРЕССИЯ {regression}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -0,0 +1,65 @@
+"""
+Бенчмарк пропускной способности логина (проверка bcrypt) от размера пула.
+
+Для каждого размера пула запускается пачка одновременных проверок пароля
+через PasswordHasher и параллельно измеряется задержка цикла событий:
+если bcrypt выполнялся бы в цикле событий, остальные эндпоинты стояли бы.
+
+Запуск:
+    python bench_login.py [--executor thread|process] [--rounds 10]
+"""
+import argparse
+import asyncio
+import time
+
+from app.core.hashing import PasswordHasher, _hash
+
+POOL_SIZES = [1, 2, 4, 8]
+LOGINS = 64
+PASSWORD = "testpass123"
+
+
+async def loop_lag(stop: asyncio.Event, samples: list[float]) -> None:
+    """Насколько позже запланированного просыпается цикл событий"""
+    while not stop.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(0.005)
+        samples.append((time.perf_counter() - started - 0.005) * 1000)
+
+
+async def run(workers: int, executor: str, hashed: str) -> tuple[float, float]:
+    hasher = PasswordHasher(workers=workers, queue_size=LOGINS, executor=executor)
+    await hasher.verify(PASSWORD, hashed)  # прогрев пула
+
+    stop = asyncio.Event()
+    lag: list[float] = []
+    lag_task = asyncio.create_task(loop_lag(stop, lag))
+
+    started = time.perf_counter()
+    results = await asyncio.gather(*(hasher.verify(PASSWORD, hashed) for _ in range(LOGINS)))
+    elapsed = time.perf_counter() - started
+
+    stop.set()
+    await lag_task
+    hasher.shutdown()
+
+    assert all(results)
+    return LOGINS / elapsed, max(lag, default=0.0)
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--executor", choices=["thread", "process"], default="thread")
+    parser.add_argument("--rounds", type=int, default=10)
+    args = parser.parse_args()
+
+    hashed = _hash(PASSWORD, args.rounds)
+    print(f"executor={args.executor} rounds={args.rounds} logins={LOGINS}")
+    print(f"{'workers':>8} {'logins/s':>9} {'max loop lag, ms':>17}")
+    for workers in POOL_SIZES:
+        throughput, max_lag = await run(workers, args.executor, hashed)
+        print(f"{workers:>8} {throughput:>9.1f} {max_lag:>17.2f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
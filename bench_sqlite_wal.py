@@ -0,0 +1,153 @@
+"""
+Бенчмарк файловой SQLite: чтение каталога во время волны записей.
+
+Писатели повторяют signup_for_event (INSERT записи, условный UPDATE
+seats_taken, COMMIT) на одно мероприятие, параллельно читатели листают
+каталог. Сравниваются:
+- rollback — журнал по умолчанию (DELETE) и общий пул: запись блокирует
+  чтение, параллельные писатели упираются в busy_timeout;
+- wal — file_engines(): WAL, один писатель и пул читателей с query_only.
+
+Запуск:
+    python bench_sqlite_wal.py [--signups 2000] [--writers 16] [--readers 8]
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import create_engine, insert, or_, select, update
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from app.core.config import get_settings
+from app.core.database import Base
+from app.core.db_pool import PoolMetrics
+from app.core.sqlite_mode import file_engines
+from app.models import EventModel, NGOModel, RegistrationModel, RoleModel, UserModel
+
+
+def seed(path: str, users: int, events: int) -> None:
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(engine)
+    start = datetime.now() + timedelta(days=1)
+    with engine.begin() as conn:
+        conn.execute(insert(RoleModel), [{"id": 1, "name": "volunteer"}])
+        conn.execute(insert(NGOModel), [{"id": 1, "name": "НКО «Бенчмарк»"}])
+        conn.execute(insert(UserModel), [
+            {"name": f"Волонтёр {i}", "email": f"v{i}@example.com", "hashed_password": "x", "role_id": 1}
+            for i in range(users)
+        ])
+        conn.execute(insert(EventModel), [
+            {
+                "title": f"Мероприятие {i}", "ngo_id": 1, "status": "active", "seats_taken": 0,
+                "scheduled_at": start + timedelta(hours=i), "max_volunteers": users + 1,
+            }
+            for i in range(events)
+        ])
+    engine.dispose()
+
+
+async def signup(writer, event_id: int, user_id: int) -> None:
+    async with AsyncSession(writer) as db:
+        await db.execute(insert(RegistrationModel).values(event_id=event_id, volunteer_id=user_id))
+        await db.execute(
+            update(EventModel)
+            .where(
+                EventModel.id == event_id,
+                EventModel.status == "active",
+                or_(EventModel.max_volunteers.is_(None), EventModel.seats_taken < EventModel.max_volunteers),
+            )
+            .values(seats_taken=EventModel.seats_taken + 1)
+        )
+        await db.commit()
+
+
+async def browse(reader) -> None:
+    async with AsyncSession(reader) as db:
+        (await db.execute(
+            select(EventModel.id, EventModel.title, EventModel.seats_taken)
+            .where(EventModel.status == "active")
+            .order_by(EventModel.scheduled_at, EventModel.id)
+            .limit(20)
+        )).all()
+
+
+async def run(writer, reader, signups: int, writers: int, readers: int) -> dict:
+    pending = iter(range(1, signups + 1))
+    write_errors = 0
+    read_latencies: list[float] = []
+    done = asyncio.Event()
+
+    async def write_loop():
+        nonlocal write_errors
+        for user_id in pending:
+            try:
+                await signup(writer, 1, user_id)
+            except OperationalError:
+                # database is locked: busy_timeout истёк
+                write_errors += 1
+
+    async def read_loop():
+        while not done.is_set():
+            started = time.perf_counter()
+            await browse(reader)
+            read_latencies.append((time.perf_counter() - started) * 1000)
+
+    started = time.perf_counter()
+    reading = [asyncio.create_task(read_loop()) for _ in range(readers)]
+    await asyncio.gather(*(write_loop() for _ in range(writers)))
+    elapsed = time.perf_counter() - started
+    done.set()
+    await asyncio.gather(*reading)
+
+    quantiles = statistics.quantiles(read_latencies, n=100)
+    return {
+        "signups/s": (signups - write_errors) / elapsed,
+        "write_errors": write_errors,
+        "reads/s": len(read_latencies) / elapsed,
+        "read_p50": quantiles[49],
+        "read_p95": quantiles[94],
+        "read_p99": quantiles[98],
+    }
+
+
+def rollback_engines(path: str):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    return engine, engine
+
+
+def wal_engines(path: str):
+    _, writer, reader = file_engines(path, get_settings(), PoolMetrics(), PoolMetrics())
+    return writer, reader
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--signups", type=int, default=2000)
+    parser.add_argument("--writers", type=int, default=16)
+    parser.add_argument("--readers", type=int, default=8)
+    parser.add_argument("--events", type=int, default=500)
+    args = parser.parse_args()
+
+    print(f"signups={args.signups} writers={args.writers} readers={args.readers} events={args.events}")
+    print(f"{'mode':>8} {'signups/s':>10} {'errors':>7} {'reads/s':>8} {'p50 ms':>7} {'p95 ms':>7} {'p99 ms':>7}")
+    for name, make in (("rollback", rollback_engines), ("wal", wal_engines)):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "bench_wal.db")
+            seed(path, args.signups, args.events)
+            writer, reader = make(path)
+            result = await run(writer, reader, args.signups, args.writers, args.readers)
+            await writer.dispose()
+            await reader.dispose()
+        print(
+            f"{name:>8} {result['signups/s']:>10.0f} {result['write_errors']:>7} {result['reads/s']:>8.0f} "
+            f"{result['read_p50']:>7.2f} {result['read_p95']:>7.2f} {result['read_p99']:>7.2f}"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
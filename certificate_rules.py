@@ -0,0 +1,148 @@
+from datetime import datetime
+
+from sqlalchemy import (
+    String,
+    and_,
+    cast,
+    exists,
+    func,
+    insert,
+    literal,
+    select,
+    union_all,
+)
+
+from app.models import (
+    CertificateModel,
+    CertificateRuleModel,
+    EventModel,
+    RegistrationModel,
+    UserModel,
+)
+from app.services.base import BaseService
+
+# Пользователей в одной транзакции при обходе всей таблицы
+BACKFILL_CHUNK_SIZE = 1000
+
+
+class CertificateRulesService(BaseService):
+    """
+    Автоматическая выдача сертификатов по порогам часов.
+
+    Правила проверяются одним INSERT ... SELECT для всего набора
+    волонтёров: глобальные — по users.total_hours, правила НКО — по сумме
+    hours_earned на завершённых мероприятиях этого НКО. Повторная выдача
+    исключена NOT EXISTS и уникальным ключом (volunteer_id, rule_id).
+    Коммит остаётся за вызывающим кодом.
+    """
+
+    @staticmethod
+    def _issue_statement(volunteer_filter):
+        """INSERT ... SELECT для волонтёров, отобранных volunteer_filter(column)"""
+        rule = CertificateRuleModel
+        already_issued = exists().where(
+            CertificateModel.volunteer_id == UserModel.id,
+            CertificateModel.rule_id == rule.id,
+        )
+
+        global_rules = (
+            select(UserModel.id.label("volunteer_id"), rule.id.label("rule_id"))
+            .join(
+                rule,
+                and_(
+                    rule.ngo_id.is_(None),
+                    rule.is_active.is_(True),
+                    func.coalesce(UserModel.total_hours, 0) >= rule.hours_required,
+                ),
+            )
+            .where(volunteer_filter(UserModel.id), ~already_issued)
+        )
+
+        ngo_hours = (
+            select(
+                RegistrationModel.volunteer_id,
+                EventModel.ngo_id,
+                func.sum(RegistrationModel.hours_earned).label("hours"),
+            )
+            .join(EventModel, EventModel.id == RegistrationModel.event_id)
+            .where(
+                RegistrationModel.status == "completed",
+                volunteer_filter(RegistrationModel.volunteer_id),
+            )
+            .group_by(RegistrationModel.volunteer_id, EventModel.ngo_id)
+            .subquery()
+        )
+        ngo_rules = (
+            select(ngo_hours.c.volunteer_id, rule.id.label("rule_id"))
+            .join(
+                rule,
+                and_(
+                    rule.ngo_id == ngo_hours.c.ngo_id,
+                    rule.is_active.is_(True),
+                    ngo_hours.c.hours >= rule.hours_required,
+                ),
+            )
+            .where(
+                ~exists().where(
+                    CertificateModel.volunteer_id == ngo_hours.c.volunteer_id,
+                    CertificateModel.rule_id == rule.id,
+                )
+            )
+        )
+
+        earned = union_all(global_rules, ngo_rules).subquery()
+        rows = (
+            select(
+                earned.c.volunteer_id,
+                earned.c.rule_id,
+                rule.title,
+                rule.hours_required,
+                (
+                    literal("Сертификат «") + rule.title + literal("»: не менее ")
+                    + cast(rule.hours_required, String(12))
+                    + literal(" часов волонтёрской деятельности.")
+                ),
+                literal(datetime.utcnow()),
+            )
+            .join(rule, rule.id == earned.c.rule_id)
+        )
+        return (
+            insert(CertificateModel)
+            .from_select(
+                ["volunteer_id", "rule_id", "title", "hours_required", "text", "issued_at"],
+                rows,
+            )
+            # Параллельная проверка тех же волонтёров не должна ронять транзакцию
+            .prefix_with("OR IGNORE", dialect="sqlite")
+            .prefix_with("IGNORE", dialect="mysql")
+        )
+
+    async def issue_for_volunteers(self, volunteer_ids) -> int:
+        """
+        Выдача сертификатов волонтёрам из volunteer_ids (список или
+        подзапрос). Возвращает число выданных сертификатов.
+        """
+        result = await self.db.execute(
+            self._issue_statement(lambda column: column.in_(volunteer_ids))
+        )
+        return result.rowcount
+
+    async def backfill(self, chunk_size: int = BACKFILL_CHUNK_SIZE) -> dict:
+        """
+        Проверка правил по всей таблице users диапазонами первичного ключа.
+        Каждый диапазон — отдельная короткая транзакция, поэтому блокировки
+        не держатся на время всего обхода.
+        """
+        max_id = (await self.db.execute(select(func.max(UserModel.id)))).scalar() or 0
+        await self.db.commit()
+
+        issued = chunks = 0
+        for low in range(0, max_id, chunk_size):
+            high = low + chunk_size
+            result = await self.db.execute(
+                self._issue_statement(lambda column: column.between(low + 1, high))
+            )
+            await self.db.commit()
+            issued += result.rowcount
+            chunks += 1
+        return {"issued": issued, "chunks": chunks}
@@ -6,9 +6,10 @@ from pydantic import BaseModel
 class SCertificateGet(BaseModel):
     id: int
     volunteer_id: int
-    title: str
+    # У сертификатов, выданных до появления правил, title и hours_required пусты
+    title: Optional[str] = None
     description: Optional[str] = None
-    hours_required: int = 0
+    hours_required: Optional[int] = None
     issued_at: datetime
 
     class Config:
@@ -1,4 +1,6 @@
 from functools import lru_cache
+from typing import Literal
+
 from pydantic import BaseSettings
 
 
@@ -13,6 +15,65 @@ class Settings(BaseSettings):
     DB_USER: str = "root"
     DB_PASS: str = ""
     DB_PORT: int = 3306
+    # Пул соединений MySQL (на один процесс-воркер)
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30
+    DB_POOL_RECYCLE: int = 3600
+    # Проверка соединения при выдаче из пула; опечатка — ошибка при старте
+    DB_POOL_PRE_PING: Literal["always", "idle", "never"] = "idle"
+    DB_POOL_PRE_PING_IDLE_SECONDS: float = 30
+    # SQLite без MySQL (USE_MOCK_DB=true): путь к файлу базы, пусто — in-memory.
+    # Файл открывается в WAL: один писатель и пул читателей
+    SQLITE_PATH: str = ""
+    SQLITE_READ_POOL_SIZE: int = 4
+    SQLITE_SYNCHRONOUS: str = "NORMAL"
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000
+    SQLITE_MMAP_SIZE: int = 256 * 1024 * 1024
+    SQLITE_CACHE_SIZE_KB: int = 64 * 1024
+    # Начальные данные (роли, примеры НКО и мероприятий) при создании схемы;
+    # в production — false
+    DB_SEED_ON_STARTUP: bool = True
+    # Хеширование паролей (bcrypt) в отдельном пуле
+    BCRYPT_ROUNDS: int = 12
+    PASSWORD_HASH_EXECUTOR: str = "thread"  # thread | process
+    PASSWORD_HASH_WORKERS: int = 4
+    PASSWORD_HASH_QUEUE_SIZE: int = 32
+    # LRU-кэш проверенных JWT (0 — отключить)
+    TOKEN_CACHE_SIZE: int = 10000
+    # TTL кэша ролей для проверки прав (0 — отключить)
+    ROLE_CACHE_TTL_SECONDS: int = 30
+    # Read-реплики: асинхронные URL через запятую (mysql+aiomysql://...)
+    DB_REPLICA_URLS: str = ""
+    DB_REPLICA_HEALTH_INTERVAL: float = 5
+    DB_REPLICA_HEALTH_TIMEOUT: float = 2
+    # Кэш ответов каталога мероприятий (0 — отключить, ETag работает всегда)
+    CATALOGUE_CACHE_TTL_SECONDS: float = 5
+    CATALOGUE_CACHE_SIZE: int = 256
+    # Сверка рейтинга волонтёров с БД (для нескольких воркеров)
+    LEADERBOARD_RECONCILE_SECONDS: float = 60
+    # Рендеринг сертификатов в PDF и кэш готовых файлов
+    CERTIFICATE_CACHE_DIR: str = "var/certificates"
+    CERTIFICATE_RENDER_WORKERS: int = 2
+    CERTIFICATE_FONT_PATH: str = "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf"
+    # Фоновые задачи (таблица jobs)
+    JOB_WORKERS: int = 2
+    JOB_POLL_INTERVAL_SECONDS: float = 1
+    JOB_MAX_ATTEMPTS: int = 5
+    JOB_BACKOFF_BASE_SECONDS: float = 2
+    JOB_BACKOFF_MAX_SECONDS: float = 300
+    # Задача в running дольше этого срока считается брошенной упавшим воркером
+    JOB_LOCK_TIMEOUT_SECONDS: float = 600
+    # Поток свободных мест (SSE): частота обновлений на мероприятие и keep-alive
+    SEAT_UPDATES_PER_SECOND: float = 2
+    SEAT_STREAM_HEARTBEAT_SECONDS: float = 15
+    SEAT_STREAM_MAX_EVENTS: int = 100
+    # Рекомендации: сколько хранить на волонтёра и как часто пересчитывать
+    # (инкрементально — только волонтёров с новыми записями; полностью —
+    # чтобы учесть новые мероприятия у всех)
+    RECOMMENDATIONS_TOP_K: int = 20
+    RECOMMENDATIONS_INTERVAL_SECONDS: float = 300
+    RECOMMENDATIONS_FULL_INTERVAL_SECONDS: float = 6 * 3600
 
     class Config:
         env_file = ".env"
@@ -0,0 +1,104 @@
+"""
+Общие фикстуры тестов.
+
+Каждый тестовый файл получает свою временную SQLite-базу (tmp_path модуля),
+подмены зависимостей приложения действуют только на время его тестов.
+Данные, нужные одному файлу, сидируются в самом файле.
+"""
+from dataclasses import dataclass
+from typing import Callable
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.core.catalogue_cache import catalogue_cache
+from app.core.database import Base, get_db, get_read_db, get_read_session_factory
+from app.core.role_cache import role_cache
+from app.models import RoleModel, UserModel
+from app.services.auth import AuthService
+from main import app
+
+ADMIN_ID = 1000
+
+
+@dataclass
+class Database:
+    """Тестовая база файла: sync-сессии для подготовки данных, async — для приложения"""
+
+    engine: Engine
+    async_engine: AsyncEngine
+    session: sessionmaker
+    async_session: async_sessionmaker
+
+
+@pytest.fixture(scope="module")
+def database(tmp_path_factory) -> Database:
+    """Временная БД файла и подмена зависимостей приложения на время его тестов"""
+    path = tmp_path_factory.mktemp("db") / "test.db"
+    engine = create_engine(f"sqlite:///{path}", connect_args={"check_same_thread": False})
+    async_engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    db = Database(
+        engine=engine,
+        async_engine=async_engine,
+        session=sessionmaker(autocommit=False, autoflush=False, bind=engine),
+        async_session=async_sessionmaker(
+            bind=async_engine, autoflush=False, expire_on_commit=False
+        ),
+    )
+
+    async def override_get_db():
+        async with db.async_session() as session:
+            yield session
+
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_read_db] = override_get_db
+    app.dependency_overrides[get_read_session_factory] = lambda: db.async_session
+    yield db
+    app.dependency_overrides.clear()
+    engine.dispose()
+
+
+@pytest.fixture(scope="function")
+def setup_database(database):
+    """Создание и удаление таблиц для каждого теста"""
+    Base.metadata.create_all(bind=database.engine)
+    catalogue_cache.invalidate()
+    role_cache.clear()
+    yield
+    Base.metadata.drop_all(bind=database.engine)
+
+
+@pytest.fixture
+def token_headers() -> Callable[..., dict]:
+    def make(user_id: int, role: str = "volunteer") -> dict:
+        token = AuthService.create_access_token({"user_id": user_id, "role": role})
+        return {"Authorization": f"Bearer {token}"}
+
+    return make
+
+
+@pytest.fixture
+def admin_headers(database, token_headers) -> Callable[[], dict]:
+    """Токен администратора; права проверяются по роли в БД, поэтому он есть и там"""
+
+    def make() -> dict:
+        db = database.session()
+        try:
+            if db.get(UserModel, ADMIN_ID) is None:
+                role = db.query(RoleModel).filter_by(name="admin").one_or_none()
+                db.add(UserModel(
+                    id=ADMIN_ID,
+                    name="Администратор",
+                    email="admin@example.com",
+                    hashed_password="x",
+                    role=role or RoleModel(name="admin"),
+                ))
+                db.commit()
+        finally:
+            db.close()
+        return token_headers(ADMIN_ID, "admin")
+
+    return make
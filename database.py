@@ -1,61 +1,184 @@
-from typing import Generator
+from typing import AsyncGenerator, Callable, Generator
 import os
 
-from sqlalchemy import create_engine
+from sqlalchemy import Column, MetaData, String, Table, create_engine, insert, inspect, select
+from sqlalchemy.exc import IntegrityError, InterfaceError, OperationalError, ProgrammingError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, declarative_base
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
 
 from app.core.config import get_settings
+from app.core.db_pool import (
+    PoolMetrics,
+    install_pool_events,
+    make_pool_class,
+    register_engine,
+)
+from app.core.replicas import ReplicaSet
+from app.core.sqlite_mode import file_engines, memory_engines
 
 Base = declarative_base()
+settings = get_settings()
 
 # Проверяем, нужно ли использовать in-memory БД
 USE_MOCK_DB = os.getenv("USE_MOCK_DB", "true").lower() == "true"
 
-if USE_MOCK_DB:
+# Именованная in-memory БД с общим кэшем: синхронный и асинхронный движки
+# работают с одной и той же базой в пределах процесса
+MOCK_DATABASE_PATH = "file:rukapomoshchi?mode=memory&cache=shared&uri=true"
+
+if USE_MOCK_DB and settings.SQLITE_PATH:
+    # SQLite в файле (WAL) — для инсталляций без MySQL
+    DATABASE_URL = f"sqlite:///{settings.SQLITE_PATH}"
+    ASYNC_DATABASE_URL = f"sqlite+aiosqlite:///{settings.SQLITE_PATH}"
+    print(f"📦 Используется SQLite в файле {settings.SQLITE_PATH} (WAL)")
+elif USE_MOCK_DB:
     # Используем SQLite в памяти - работает без настройки MySQL
-    DATABASE_URL = "sqlite:///:memory:"
+    DATABASE_URL = f"sqlite:///{MOCK_DATABASE_PATH}"
+    ASYNC_DATABASE_URL = f"sqlite+aiosqlite:///{MOCK_DATABASE_PATH}"
     print("📦 Используется in-memory база данных (SQLite)")
-    print("   Для использования MySQL установите USE_MOCK_DB=false в .env")
+    print("   Для хранения в файле задайте SQLITE_PATH, для MySQL — USE_MOCK_DB=false в .env")
 else:
     # Реальное подключение к MySQL
-    settings = get_settings()
-    DATABASE_URL = (
-        f"mysql+pymysql://{settings.DB_USER}:{settings.DB_PASS}@"
+    _credentials = (
+        f"{settings.DB_USER}:{settings.DB_PASS}@"
         f"{settings.DB_HOST}:{settings.DB_PORT}/{settings.DB_NAME}?charset=utf8mb4"
     )
+    DATABASE_URL = f"mysql+pymysql://{_credentials}"
+    ASYNC_DATABASE_URL = f"mysql+aiomysql://{_credentials}"
     print("📦 Используется MySQL база данных")
 
-if USE_MOCK_DB:
-    # Используем SQLite в памяти - работает без настройки MySQL
-    engine = create_engine(
-        DATABASE_URL,
-        connect_args={"check_same_thread": False},
-        echo=False
+engine_metrics = PoolMetrics()
+async_engine_metrics = PoolMetrics()
+sqlite_reader_metrics = PoolMetrics()
+# Пул читателей файловой SQLite; подключается к ReplicaSet
+sqlite_reader = None
+
+
+def _mysql_pool_options(pool_base: type, metrics: PoolMetrics) -> dict:
+    """Параметры пула MySQL из Settings"""
+    return {
+        "poolclass": make_pool_class(pool_base, metrics),
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        # "idle" — собственная проверка только простаивавших соединений
+        "pool_pre_ping": settings.DB_POOL_PRE_PING == "always",
+    }
+
+
+if USE_MOCK_DB and settings.SQLITE_PATH:
+    engine, async_engine, sqlite_reader = file_engines(
+        settings.SQLITE_PATH, settings, async_engine_metrics, sqlite_reader_metrics
     )
+elif USE_MOCK_DB:
+    # Используем SQLite в памяти - работает без настройки MySQL
+    engine, async_engine = memory_engines(MOCK_DATABASE_PATH, settings, async_engine_metrics)
 else:
     # Реальное подключение к MySQL
     try:
         engine = create_engine(
             DATABASE_URL,
-            pool_pre_ping=True,
-            pool_recycle=3600,
+            **_mysql_pool_options(QueuePool, engine_metrics),
+        )
+        async_engine = create_async_engine(
+            ASYNC_DATABASE_URL,
+            **_mysql_pool_options(AsyncAdaptedQueuePool, async_engine_metrics),
         )
     except Exception as e:
         print(f"⚠️ Ошибка подключения к MySQL: {e}")
         print("   Переключаюсь на in-memory БД (SQLite)")
-        DATABASE_URL = "sqlite:///:memory:"
+        DATABASE_URL = f"sqlite:///{MOCK_DATABASE_PATH}"
+        ASYNC_DATABASE_URL = f"sqlite+aiosqlite:///{MOCK_DATABASE_PATH}"
         USE_MOCK_DB = True
-        engine = create_engine(
-            DATABASE_URL,
-            connect_args={"check_same_thread": False},
-            echo=False
-        )
+        engine, async_engine = memory_engines(MOCK_DATABASE_PATH, settings, async_engine_metrics)
+
+_idle_ping_seconds = (
+    settings.DB_POOL_PRE_PING_IDLE_SECONDS
+    if settings.DB_POOL_PRE_PING == "idle" and not USE_MOCK_DB
+    else None
+)
+install_pool_events(engine, engine_metrics, _idle_ping_seconds)
+install_pool_events(async_engine.sync_engine, async_engine_metrics, _idle_ping_seconds)
+register_engine("primary", async_engine.sync_engine, async_engine_metrics)
+register_engine("primary_sync", engine, engine_metrics)
+
 
+def _create_replica_engines() -> list:
+    """Асинхронные движки read-реплик из DB_REPLICA_URLS"""
+    urls = [url.strip() for url in settings.DB_REPLICA_URLS.split(",") if url.strip()]
+    engines = []
+    if sqlite_reader is not None:
+        install_pool_events(sqlite_reader.sync_engine, sqlite_reader_metrics, None)
+        register_engine("sqlite_reader", sqlite_reader.sync_engine, sqlite_reader_metrics)
+        engines.append(sqlite_reader)
+    for index, url in enumerate(urls):
+        metrics = PoolMetrics()
+        if url.startswith("sqlite"):
+            replica = create_async_engine(url, echo=False)
+        else:
+            replica = create_async_engine(
+                url, **_mysql_pool_options(AsyncAdaptedQueuePool, metrics)
+            )
+        install_pool_events(replica.sync_engine, metrics, _idle_ping_seconds)
+        register_engine(f"replica_{index}", replica.sync_engine, metrics)
+        engines.append(replica)
+    return engines
+
+
+replicas = ReplicaSet(
+    _create_replica_engines(),
+    health_timeout=settings.DB_REPLICA_HEALTH_TIMEOUT,
+)
+
+# Синхронная сессия — для Alembic, init_database и служебных скриптов
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Асинхронная сессия — для обработчиков FastAPI
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine,
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False,
+)
+
+
+async def get_db() -> AsyncGenerator[AsyncSession, None]:
+    """Получение асинхронной сессии БД"""
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+async def get_read_db() -> AsyncGenerator[AsyncSession, None]:
+    """
+    Сессия для read-only эндпоинтов.
+
+    Чтение идёт на реплику (round-robin), без реплик — на primary.
+    После первой записи сессия до конца запроса работает с primary.
+    """
+    async with replicas.session(
+        async_engine, autoflush=False, expire_on_commit=False
+    ) as db:
+        try:
+            yield db
+        except (OperationalError, InterfaceError):
+            replicas.report_failure(db)
+            raise
+
+
+def get_read_session_factory() -> Callable[[], AsyncSession]:
+    """
+    Фабрика read-сессий для потоковых ответов.
+
+    Тело StreamingResponse отдаётся уже после закрытия зависимостей
+    запроса, поэтому генератор открывает собственную сессию.
+    """
+    return lambda: replicas.session(async_engine, autoflush=False, expire_on_commit=False)
 
-def get_db() -> Generator:
-    """Получение сессии БД"""
+
+def get_sync_db() -> Generator:
+    """Получение синхронной сессии БД (скрипты, миграции)"""
     db = SessionLocal()
     try:
         yield db
@@ -63,81 +186,166 @@ def get_db() -> Generator:
         db.close()
 
 
-def init_database():
-    """Инициализация базы данных с начальными данными"""
-    from sqlalchemy.orm import Session
+# Ревизия Alembic, которой соответствует Base.metadata; обновляется
+# вместе с каждой новой миграцией (проверяется в test_startup.py)
+SCHEMA_REVISION = "b6e8a0c2d4f7"
+
+# Таблица версий Alembic — вне Base.metadata, чтобы autogenerate её не трогал
+alembic_version = Table(
+    "alembic_version",
+    MetaData(),
+    Column("version_num", String(32), primary_key=True),
+)
+
+
+def _schema_revision(bind) -> str | None:
+    """Текущая ревизия схемы; None — база ещё не создавалась"""
+    try:
+        with bind.connect() as conn:
+            return conn.execute(select(alembic_version.c.version_num)).scalar()
+    except (OperationalError, ProgrammingError):
+        return None
+
+
+def _seed_rows() -> dict:
+    """Справочники и демонстрационные данные с явными id — для идемпотентной вставки"""
+    from datetime import datetime, timedelta
     from app.models import RoleModel, NGOModel, EventModel
-    
-    # Создаем все таблицы
-    Base.metadata.create_all(bind=engine)
-    
-    db = Session(engine)
+
+    now = datetime.now()
+    return {
+        RoleModel: [
+            {"id": 1, "name": "admin"},
+            {"id": 2, "name": "coordinator"},
+            {"id": 3, "name": "volunteer"},
+        ],
+        NGOModel: [
+            {"id": 1, "name": "НКО «Город добрых дел»", "description": "Организация занимается проведением благотворительных мероприятий."},
+            {"id": 2, "name": "НКО «Поддержка рядом»", "description": "Онлайн поддержка и консультации."},
+            {"id": 3, "name": "НКО «Чистый город»", "description": "Экологические инициативы и субботники."},
+        ],
+        EventModel: [
+            {
+                "id": 1,
+                "title": "Помощь в проведении благотворительного марафона",
+                "description": "Регистрация участников, навигация по площадке, помощь организаторам.",
+                "ngo_id": 1,
+                "scheduled_at": now + timedelta(days=30),
+                "location": "Москва, ВДНХ",
+                "max_volunteers": 30,
+                "duration_hours": 8,
+                "status": "active",
+                "seats_taken": 0,
+            },
+            {
+                "id": 2,
+                "title": "Онлайн‑поддержка горячей линии НКО",
+                "description": "Консультации по стандартным вопросам, помощь в навигации.",
+                "ngo_id": 2,
+                "scheduled_at": now + timedelta(days=15),
+                "location": "Онлайн",
+                "max_volunteers": 20,
+                "duration_hours": 4,
+                "status": "active",
+                "seats_taken": 0,
+            },
+            {
+                "id": 3,
+                "title": "Экологический субботник в парке",
+                "description": "Уборка территории, посадка деревьев, организация экологических квестов.",
+                "ngo_id": 3,
+                "scheduled_at": now + timedelta(days=45),
+                "location": "Москва, Сокольники",
+                "max_volunteers": 50,
+                "duration_hours": 5,
+                "status": "active",
+                "seats_taken": 0,
+            },
+        ],
+    }
+
+
+def seed_database(conn) -> int:
+    """
+    Начальные данные одной пачкой INSERT OR IGNORE / INSERT IGNORE на таблицу.
+
+    Строки с уже занятыми id пропускаются, поэтому повторный запуск
+    (или параллельный старт нескольких воркеров) ничего не дублирует.
+    Возвращает число вставленных строк.
+    """
+    from app.models import EventModel
+
+    inserted = 0
+    for model, rows in _seed_rows().items():
+        result = conn.execute(
+            insert(model.__table__)
+            .prefix_with("OR IGNORE", dialect="sqlite")
+            .prefix_with("IGNORE", dialect="mysql"),
+            rows,
+        )
+        inserted += result.rowcount
+        if model is EventModel and result.rowcount:
+            from app.core.event_search import rebuild_search_index
+            rebuild_search_index(conn)
+    return inserted
+
+
+def init_database(bind=None, seed: bool = True) -> None:
+    """
+    Подготовка БД при старте приложения.
+
+    Если ревизия в alembic_version совпадает с SCHEMA_REVISION, схема
+    актуальна и старт обходится одним запросом — без create_all, который
+    проверяет каждую таблицу отдельно. В пустой базе (новая, in-memory
+    SQLite) create_all строит все таблицы с нуля, поэтому ревизия
+    проставляется. Таблицы без ревизии (например, база из init_db.sql)
+    могут не совпадать с моделями — тогда старт прерывается до
+    alembic upgrade head. Начальные данные — идемпотентной вставкой,
+    только в новую базу; seed=False (DB_SEED_ON_STARTUP=false, --no-seed)
+    отключает их совсем.
+    """
+    bind = bind or engine
+    revision = _schema_revision(bind)
+    if revision == SCHEMA_REVISION:
+        return
+
+    if revision is not None:
+        print(
+            f"⚠️ Схема БД на ревизии {revision}, код ожидает {SCHEMA_REVISION}: "
+            "выполните alembic upgrade head"
+        )
+        # Недостающие таблицы всё же создаём, ревизию не трогаем
+        Base.metadata.create_all(bind=bind)
+        return
+
+    existing = set(inspect(bind).get_table_names()) & set(Base.metadata.tables)
+    if existing:
+        raise RuntimeError(
+            f"В БД есть таблицы без ревизии Alembic ({', '.join(sorted(existing))}): "
+            "схема неизвестна, выполните alembic upgrade head"
+        )
+
     try:
-        # Создаем роли, если их нет
-        if db.query(RoleModel).count() == 0:
-            roles = [
-                RoleModel(name="admin"),
-                RoleModel(name="coordinator"),
-                RoleModel(name="volunteer"),
-            ]
-            db.add_all(roles)
-            db.commit()
-            print("✓ Созданы роли: admin, coordinator, volunteer")
-        
-        # Создаем примеры НКО
-        if db.query(NGOModel).count() == 0:
-            ngos = [
-                NGOModel(name="НКО «Город добрых дел»", description="Организация занимается проведением благотворительных мероприятий."),
-                NGOModel(name="НКО «Поддержка рядом»", description="Онлайн поддержка и консультации."),
-                NGOModel(name="НКО «Чистый город»", description="Экологические инициативы и субботники."),
-            ]
-            db.add_all(ngos)
-            db.commit()
-            print("✓ Созданы примеры НКО")
-        
-        # Создаем примеры мероприятий
-        from datetime import datetime, timedelta
-        if db.query(EventModel).count() == 0:
-            events = [
-                EventModel(
-                    title="Помощь в проведении благотворительного марафона",
-                    description="Регистрация участников, навигация по площадке, помощь организаторам.",
-                    ngo_id=1,
-                    scheduled_at=datetime.now() + timedelta(days=30),
-                    location="Москва, ВДНХ",
-                    max_volunteers=30,
-                    duration_hours=8,
-                    status="active"
-                ),
-                EventModel(
-                    title="Онлайн‑поддержка горячей линии НКО",
-                    description="Консультации по стандартным вопросам, помощь в навигации.",
-                    ngo_id=2,
-                    scheduled_at=datetime.now() + timedelta(days=15),
-                    location="Онлайн",
-                    max_volunteers=20,
-                    duration_hours=4,
-                    status="active"
-                ),
-                EventModel(
-                    title="Экологический субботник в парке",
-                    description="Уборка территории, посадка деревьев, организация экологических квестов.",
-                    ngo_id=3,
-                    scheduled_at=datetime.now() + timedelta(days=45),
-                    location="Москва, Сокольники",
-                    max_volunteers=50,
-                    duration_hours=5,
-                    status="active"
-                ),
-            ]
-            db.add_all(events)
-            db.commit()
-            print("✓ Созданы примеры мероприятий")
-            
-    except Exception as e:
-        print(f"⚠️ Ошибка при инициализации: {e}")
-        db.rollback()
-    finally:
-        db.close()
+        with bind.begin() as conn:
+            Base.metadata.create_all(bind=conn)
+            alembic_version.create(conn, checkfirst=True)
+            conn.execute(insert(alembic_version).values(version_num=SCHEMA_REVISION))
+            if seed:
+                print(f"✓ Начальные данные: добавлено строк — {seed_database(conn)}")
+    except IntegrityError:
+        # Другой воркер успел создать схему и проставить ревизию первым
+        pass
+
 
+if __name__ == "__main__":
+    import argparse
 
+    # В отличие от старта приложения, добавляет начальные данные и в уже
+    # существующую базу (например, созданную alembic upgrade head)
+    parser = argparse.ArgumentParser(description="Создание схемы и начальных данных")
+    parser.add_argument("--no-seed", action="store_true", help="не добавлять начальные данные")
+    args = parser.parse_args()
+    init_database(seed=False)
+    if not args.no_seed:
+        with engine.begin() as conn:
+            print(f"✓ Начальные данные: добавлено строк — {seed_database(conn)}")
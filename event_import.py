@@ -0,0 +1,140 @@
+import csv
+import io
+import json
+
+from pydantic import ValidationError
+from sqlalchemy import func, insert, select
+from sqlalchemy.exc import DBAPIError
+
+from app.core.catalogue_cache import bump_catalogue_version
+from app.core.event_search import index_events
+from app.models import EventModel, NGOModel
+from app.schemes.events import SEventAddRequest
+from app.services.base import BaseService
+
+# Строк в одном многострочном INSERT; 500 × 8 колонок укладываются
+# в лимит параметров и SQLite, и MySQL
+IMPORT_CHUNK_SIZE = 500
+IMPORT_MAX_ROWS = 10_000
+
+
+class EventImportError(ValueError):
+    """Тело запроса не удалось разобрать как JSON-массив или CSV"""
+
+
+class EventImportService(BaseService):
+    @staticmethod
+    def parse_json(body: bytes) -> list[dict]:
+        try:
+            records = json.loads(body)
+        except ValueError as ex:
+            raise EventImportError("Некорректный JSON") from ex
+        if not isinstance(records, list):
+            raise EventImportError("Ожидается JSON-массив мероприятий")
+        return records
+
+    @staticmethod
+    def parse_csv(body: bytes) -> list[dict]:
+        try:
+            text = body.decode("utf-8-sig")
+        except UnicodeDecodeError as ex:
+            raise EventImportError("CSV должен быть в кодировке UTF-8") from ex
+        # Пустая ячейка — отсутствующее поле (значение по умолчанию схемы)
+        return [
+            {key: value for key, value in row.items() if value not in ("", None)}
+            for row in csv.DictReader(io.StringIO(text))
+        ]
+
+    async def validate(
+        self, records: list
+    ) -> tuple[list[tuple[int, SEventAddRequest]], list[dict]]:
+        """
+        Проверка всех строк сразу: схема SEventAddRequest по каждой строке
+        и существование НКО одним запросом на весь файл.
+        Номера строк — с единицы, в порядке файла.
+        """
+        valid: list[tuple[int, SEventAddRequest]] = []
+        errors: list[dict] = []
+        for number, record in enumerate(records, start=1):
+            try:
+                valid.append((number, SEventAddRequest.model_validate(record)))
+            except ValidationError as ex:
+                errors.append({
+                    "row": number,
+                    "errors": [
+                        f"{'.'.join(str(part) for part in err['loc']) or 'row'}: {err['msg']}"
+                        for err in ex.errors()
+                    ],
+                })
+
+        ngo_ids = {event.ngo_id for _, event in valid}
+        if ngo_ids:
+            known = set(
+                (await self.db.execute(select(NGOModel.id).where(NGOModel.id.in_(ngo_ids))))
+                .scalars()
+            )
+            missing = [(number, event) for number, event in valid if event.ngo_id not in known]
+            for number, event in missing:
+                errors.append({"row": number, "errors": [f"ngo_id: НКО {event.ngo_id} не найдено"]})
+            valid = [(number, event) for number, event in valid if event.ngo_id in known]
+
+        errors.sort(key=lambda e: e["row"])
+        return valid, errors
+
+    async def insert_chunk(self, events: list[SEventAddRequest]) -> None:
+        """
+        Один многострочный INSERT ... VALUES (...), (...), индексация для
+        поиска и COMMIT. id вставленных строк MySQL не возвращает, поэтому
+        индексируется всё, что выше прежнего максимума: чужие строки
+        попадут туда же, но повторная индексация безвредна.
+        """
+        last_id = (
+            await self.db.execute(select(func.coalesce(func.max(EventModel.id), 0)))
+        ).scalar_one()
+        await self.db.execute(
+            insert(EventModel).values([
+                {
+                    "title": event.title,
+                    "description": event.description,
+                    "ngo_id": event.ngo_id,
+                    "scheduled_at": event.scheduled_at,
+                    "location": event.location,
+                    "max_volunteers": event.max_volunteers,
+                    "duration_hours": event.duration_hours,
+                    "status": "active",
+                    "seats_taken": 0,
+                }
+                for event in events
+            ])
+        )
+        inserted = await self.db.execute(
+            select(EventModel.id, EventModel.title, EventModel.description)
+            .where(EventModel.id > last_id)
+        )
+        await index_events(self.db, inserted.all())
+        await bump_catalogue_version(self.db)
+        await self.db.commit()
+
+    async def import_events(self, records: list) -> dict:
+        if len(records) > IMPORT_MAX_ROWS:
+            raise EventImportError(f"Не больше {IMPORT_MAX_ROWS} мероприятий за один импорт")
+
+        valid, errors = await self.validate(records)
+        created = 0
+        for start in range(0, len(valid), IMPORT_CHUNK_SIZE):
+            chunk = valid[start:start + IMPORT_CHUNK_SIZE]
+            try:
+                await self.insert_chunk([event for _, event in chunk])
+            except DBAPIError as ex:
+                # Каждая порция — своя транзакция: откатывается только она
+                await self.db.rollback()
+                reason = str(ex.orig) if ex.orig is not None else str(ex)
+                errors.extend(
+                    {"row": number, "errors": [f"Ошибка записи порции: {reason}"]}
+                    for number, _ in chunk
+                )
+                continue
+            created += len(chunk)
+
+        errors.sort(key=lambda e: e["row"])
+        return {"total": len(records), "created": created, "failed": len(errors), "errors": errors}
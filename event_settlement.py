@@ -0,0 +1,71 @@
+from sqlalchemy import func, select, update
+
+from app.core.jobs import after_commit, job_handler
+from app.core.leaderboard import refresh_members
+from app.models import EventModel, RegistrationModel, UserModel
+from app.services.base import BaseService
+from app.services.certificate_rules import CertificateRulesService
+
+
+class EventSettlementService(BaseService):
+    async def settle(self, event_id: int) -> dict:
+        """
+        Начисление часов по завершённому мероприятию.
+
+        Три множественных UPDATE вместо запроса на каждого волонтёра и один
+        INSERT ... SELECT для сертификатов по правилам. Начисляются только
+        записи в статусе registered, поэтому повторный запуск ничего
+        не начислит дважды. Коммит — за вызывающим кодом; рейтинг в памяти
+        обновляется только после него.
+        """
+        duration = (
+            select(EventModel.duration_hours)
+            .where(EventModel.id == event_id)
+            .scalar_subquery()
+        )
+        volunteer_ids = (
+            select(RegistrationModel.volunteer_id)
+            .where(
+                RegistrationModel.event_id == event_id,
+                RegistrationModel.status == "registered",
+            )
+        )
+
+        # Рейтинг ставится раньше часов: MySQL вычисляет SET слева направо,
+        # и обе колонки должны считаться от старого значения total_hours.
+        credited = await self.db.execute(
+            update(UserModel)
+            .where(UserModel.id.in_(volunteer_ids))
+            .ordered_values(
+                (UserModel.rating, func.coalesce(UserModel.total_hours, 0) + duration),
+                (UserModel.total_hours, func.coalesce(UserModel.total_hours, 0) + duration),
+            )
+            .execution_options(synchronize_session=False)
+        )
+        await self.db.execute(
+            update(RegistrationModel)
+            .where(
+                RegistrationModel.event_id == event_id,
+                RegistrationModel.status == "registered",
+            )
+            .values(hours_earned=duration, status="completed")
+            .execution_options(synchronize_session=False)
+        )
+        credited_ids = select(RegistrationModel.volunteer_id).where(
+            RegistrationModel.event_id == event_id,
+            RegistrationModel.status == "completed",
+        )
+        certificates_issued = await CertificateRulesService(self.db).issue_for_volunteers(
+            credited_ids
+        )
+        after_commit(self.db, lambda: refresh_members(self.db, credited_ids))
+        return {
+            "event_id": event_id,
+            "volunteers_credited": credited.rowcount,
+            "certificates_issued": certificates_issued,
+        }
+
+
+@job_handler("settle_event")
+async def settle_event_job(db, payload: dict) -> dict:
+    return await EventSettlementService(db).settle(payload["event_id"])
@@ -41,6 +41,9 @@ CREATE TABLE IF NOT EXISTS events (
     scheduled_at DATETIME NOT NULL,
     location VARCHAR(200) DEFAULT NULL,
     max_volunteers INT DEFAULT NULL,
+    -- Счётчик занятых мест: меняется только условным UPDATE при записи
+    seats_taken INT NOT NULL DEFAULT 0,
+    duration_hours INT DEFAULT 2,
     status ENUM('active', 'completed', 'cancelled') DEFAULT 'active',
     created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
     FOREIGN KEY (ngo_id) REFERENCES ngos(id)
@@ -56,7 +59,19 @@ CREATE TABLE IF NOT EXISTS registrations (
     status ENUM('registered', 'completed', 'cancelled') DEFAULT 'registered',
     FOREIGN KEY (event_id) REFERENCES events(id),
     FOREIGN KEY (volunteer_id) REFERENCES users(id),
-    UNIQUE KEY unique_registration (event_id, volunteer_id)
+    UNIQUE KEY unique_registration (event_id, volunteer_id),
+    KEY ix_registrations_volunteer_id (volunteer_id),
+    KEY ix_registrations_event_id_status (event_id, status)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+-- Правила автоматической выдачи сертификатов
+CREATE TABLE IF NOT EXISTS certificate_rules (
+    id INT AUTO_INCREMENT PRIMARY KEY,
+    title VARCHAR(200) NOT NULL,
+    hours_required INT NOT NULL,
+    ngo_id INT DEFAULT NULL,
+    is_active BOOLEAN NOT NULL DEFAULT TRUE,
+    FOREIGN KEY (ngo_id) REFERENCES ngos(id)
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
 
 -- Таблица сертификатов
@@ -65,9 +80,69 @@ CREATE TABLE IF NOT EXISTS certificates (
     volunteer_id INT NOT NULL,
     title VARCHAR(200) NOT NULL,
     description TEXT,
+    text TEXT NOT NULL,
     issued_at DATETIME DEFAULT CURRENT_TIMESTAMP,
     hours_required INT DEFAULT 0,
-    FOREIGN KEY (volunteer_id) REFERENCES users(id)
+    rule_id INT DEFAULT NULL,
+    FOREIGN KEY (volunteer_id) REFERENCES users(id),
+    FOREIGN KEY (rule_id) REFERENCES certificate_rules(id),
+    KEY ix_certificates_volunteer_id (volunteer_id),
+    UNIQUE KEY uq_certificates_volunteer_rule (volunteer_id, rule_id)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+-- Очередь фоновых задач
+CREATE TABLE IF NOT EXISTS jobs (
+    id INT AUTO_INCREMENT PRIMARY KEY,
+    kind VARCHAR(50) NOT NULL,
+    payload TEXT NOT NULL,
+    status VARCHAR(20) NOT NULL DEFAULT 'queued',
+    attempts INT NOT NULL DEFAULT 0,
+    max_attempts INT NOT NULL DEFAULT 5,
+    run_after DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    locked_by VARCHAR(64) DEFAULT NULL,
+    locked_at DATETIME DEFAULT NULL,
+    last_error TEXT,
+    result TEXT,
+    created_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    finished_at DATETIME DEFAULT NULL,
+    KEY ix_jobs_status_run_after_id (status, run_after, id)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+-- Рекомендации: готовый top-K мероприятий на волонтёра (пересчитывается задачей)
+CREATE TABLE IF NOT EXISTS recommendations (
+    user_id INT NOT NULL,
+    `rank` INT NOT NULL,
+    event_id INT NOT NULL,
+    score FLOAT NOT NULL,
+    PRIMARY KEY (user_id, `rank`),
+    FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE,
+    FOREIGN KEY (event_id) REFERENCES events(id) ON DELETE CASCADE
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+CREATE TABLE IF NOT EXISTS recommendation_runs (
+    id INT AUTO_INCREMENT PRIMARY KEY,
+    last_registration_id INT NOT NULL,
+    users_updated INT NOT NULL,
+    `full` BOOLEAN NOT NULL DEFAULT FALSE,
+    finished_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+-- Версия каталога: общий счётчик для ETag (app.core.catalogue_cache), одна строка
+CREATE TABLE IF NOT EXISTS catalogue_version (
+    id INT PRIMARY KEY,
+    version INT NOT NULL DEFAULT 0
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+INSERT IGNORE INTO catalogue_version (id, version) VALUES (1, 0);
+
+-- Полнотекстовый индекс мероприятий: основы слов названия и описания.
+-- Заполняется приложением (alembic upgrade head перестраивает его целиком)
+CREATE TABLE IF NOT EXISTS events_search (
+    event_id INT PRIMARY KEY,
+    title TEXT NOT NULL,
+    description TEXT NOT NULL,
+    FULLTEXT KEY ft_events_search_title (title),
+    FULLTEXT KEY ft_events_search (title, description)
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
 
 -- Вставка начальных данных: роли
@@ -1,12 +1,21 @@
+import asyncio
+
 from fastapi import FastAPI
 from fastapi.staticfiles import StaticFiles
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import FileResponse
 
+from app.core.config import get_settings
 from app.core.database import Base, engine
 from app.api.auth import router as auth_router
 from app.api.roles import router as roles_router
 from app.api.events import router as events_router
+from app.api.metrics import router as metrics_router
+from app.api.leaderboard import router as leaderboard_router
+from app.api.exports import router as exports_router
+from app.api.certificates import router as certificates_router
+from app.api.jobs import router as jobs_router
+from app.api.recommendations import router as recommendations_router
 
 
 app = FastAPI(
@@ -22,6 +31,8 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # Курсор следующей страницы каталога читает SPA, открытое с другого origin
+    expose_headers=["X-Next-Cursor", "ETag"],
 )
 
 
@@ -30,10 +41,63 @@ async def on_startup() -> None:
     """
     Инициализация базы данных и создание начальных данных.
     """
+    settings = get_settings()
     from app.core.database import init_database
-    init_database()
+    init_database(seed=settings.DB_SEED_ON_STARTUP)
     print("✅ База данных инициализирована и готова к работе!")
 
+    from app.core.database import AsyncSessionLocal
+    from app.core.leaderboard import rebuild_leaderboard, run_reconciliation
+    await rebuild_leaderboard(AsyncSessionLocal)
+    app.state.leaderboard_task = asyncio.create_task(
+        run_reconciliation(AsyncSessionLocal, settings.LEADERBOARD_RECONCILE_SECONDS)
+    )
+
+    from app.core.database import replicas
+    if len(replicas):
+        await replicas.check()
+        app.state.replica_health_task = asyncio.create_task(
+            replicas.run_health_checks(settings.DB_REPLICA_HEALTH_INTERVAL)
+        )
+
+    from app.core.jobs import start_workers
+    app.state.job_tasks = start_workers(AsyncSessionLocal)
+
+    from app.core.seat_updates import seat_broadcaster
+    app.state.seat_updates_task = asyncio.create_task(
+        seat_broadcaster.run(AsyncSessionLocal, settings.SEAT_UPDATES_PER_SECOND)
+    )
+
+    from app.core.jobs import schedule_periodic
+    app.state.job_tasks += [
+        asyncio.create_task(schedule_periodic(
+            AsyncSessionLocal, "recompute_recommendations",
+            settings.RECOMMENDATIONS_INTERVAL_SECONDS, {"full": False},
+        )),
+        asyncio.create_task(schedule_periodic(
+            AsyncSessionLocal, "recompute_recommendations",
+            settings.RECOMMENDATIONS_FULL_INTERVAL_SECONDS, {"full": True},
+        )),
+    ]
+
+
+@app.on_event("shutdown")
+async def on_shutdown() -> None:
+    from app.core.hashing import get_password_hasher
+    get_password_hasher().shutdown()
+    from app.core.certificate_render import get_certificate_renderer
+    get_certificate_renderer().shutdown()
+
+    for name in ("replica_health_task", "leaderboard_task", "seat_updates_task"):
+        task = getattr(app.state, name, None)
+        if task is not None:
+            task.cancel()
+    for task in getattr(app.state, "job_tasks", []):
+        task.cancel()
+    from app.core.database import async_engine, replicas
+    await replicas.dispose()
+    await async_engine.dispose()
+
 
 # Статические файлы
 app.mount("/static", StaticFiles(directory="app/static"), name="static")
@@ -56,6 +120,12 @@ async def api_info():
 
 
 # API роутеры
-app.include_router(auth_router, tags=["Аутентификация"])
+app.include_router(auth_router, prefix="/auth", tags=["Аутентификация"])
 app.include_router(roles_router, prefix="/api/roles", tags=["Роли"])
 app.include_router(events_router, prefix="/api/events", tags=["Мероприятия"])
+app.include_router(metrics_router, prefix="/api/metrics", tags=["Метрики"])
+app.include_router(leaderboard_router, prefix="/api/leaderboard", tags=["Рейтинг"])
+app.include_router(exports_router, prefix="/api/exports", tags=["Выгрузки"])
+app.include_router(certificates_router, prefix="/api/certificates", tags=["Сертификаты"])
+app.include_router(jobs_router, prefix="/api/jobs", tags=["Фоновые задачи"])
+app.include_router(recommendations_router, prefix="/api/recommendations", tags=["Рекомендации"])
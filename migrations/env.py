@@ -1,7 +1,10 @@
+import asyncio
 from logging.config import fileConfig
 
 from sqlalchemy import engine_from_config
 from sqlalchemy import pool
+from sqlalchemy.engine import Connection, make_url
+from sqlalchemy.ext.asyncio import async_engine_from_config
 
 from alembic import context
 
@@ -51,6 +54,13 @@ def run_migrations_offline() -> None:
         context.run_migrations()
 
 
+def do_run_migrations(connection: Connection) -> None:
+    context.configure(connection=connection, target_metadata=target_metadata)
+
+    with context.begin_transaction():
+        context.run_migrations()
+
+
 def run_migrations_online() -> None:
     """Run migrations in 'online' mode.
 
@@ -65,16 +75,39 @@ def run_migrations_online() -> None:
     )
 
     with connectable.connect() as connection:
-        context.configure(
-            connection=connection, target_metadata=target_metadata
-        )
+        do_run_migrations(connection)
+
+
+async def run_async_migrations() -> None:
+    """Run migrations through an async DBAPI (aiomysql, aiosqlite).
+
+    The sync migration functions are run on the async connection
+    via run_sync().
+
+    """
+    connectable = async_engine_from_config(
+        config.get_section(config.config_ini_section, {}),
+        prefix="sqlalchemy.",
+        poolclass=pool.NullPool,
+    )
+
+    async with connectable.connect() as connection:
+        await connection.run_sync(do_run_migrations)
 
-        with context.begin_transaction():
-            context.run_migrations()
+    await connectable.dispose()
+
+
+def run_migrations_online_async() -> None:
+    asyncio.run(run_async_migrations())
+
+
+def _is_async_url(url: str | None) -> bool:
+    return bool(url) and make_url(url).get_dialect().is_async
 
 
 if context.is_offline_mode():
     run_migrations_offline()
+elif _is_async_url(config.get_main_option("sqlalchemy.url")):
+    run_migrations_online_async()
 else:
     run_migrations_online()
-
@@ -0,0 +1,58 @@
+"""event catalogue keyset indexes
+
+Revision ID: 3f1c2a9d8b47
+Revises: 
+Create Date: 2026-10-18 10:00:00.000000
+
+Базовая ревизия: до неё схема создавалась create_all или init_db.sql,
+поэтому таблицы уже должны существовать. Колонки, которых нет в схеме
+create_all тех версий моделей (в init_db.sql они есть), добавляются здесь.
+Пустую базу создаёт приложение при старте (init_database), а не Alembic.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f1c2a9d8b47'
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Колонки, появившиеся в моделях вместе с этой ревизией
+COLUMNS = [
+    ('events', sa.Column('location', sa.String(length=200), nullable=True)),
+    ('events', sa.Column('max_volunteers', sa.Integer(), nullable=True)),
+    ('events', sa.Column('status', sa.String(length=20), nullable=False, server_default='active')),
+    ('registrations', sa.Column('status', sa.String(length=20), nullable=False, server_default='registered')),
+    ('users', sa.Column('city', sa.String(length=100), nullable=True)),
+]
+
+INDEXES = [
+    ('ix_events_scheduled_at_id', 'events', ['scheduled_at', 'id']),
+    ('ix_events_status_scheduled_at_id', 'events', ['status', 'scheduled_at', 'id']),
+    ('ix_events_ngo_id_scheduled_at_id', 'events', ['ngo_id', 'scheduled_at', 'id']),
+    ('ix_events_location_scheduled_at_id', 'events', ['location', 'scheduled_at', 'id']),
+]
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    for table, column in COLUMNS:
+        if column.name not in {c['name'] for c in inspector.get_columns(table)}:
+            with op.batch_alter_table(table) as batch_op:
+                batch_op.add_column(column)
+
+    # В базах, созданных из init_db.sql, эти индексы уже есть
+    for name, table, columns in INDEXES:
+        existing = {ix['name'] for ix in inspector.get_indexes(table)}
+        if name not in existing:
+            op.create_index(name, table, columns)
+
+
+def downgrade() -> None:
+    for name, table, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table)
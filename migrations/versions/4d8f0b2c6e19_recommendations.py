@@ -0,0 +1,47 @@
+"""event recommendations
+
+Revision ID: 4d8f0b2c6e19
+Revises: 9c1e3a5b7d42
+Create Date: 2026-10-18 21:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4d8f0b2c6e19'
+down_revision: Union[str, None] = '9c1e3a5b7d42'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    tables = inspector.get_table_names()
+    if 'recommendations' not in tables:
+        op.create_table(
+            'recommendations',
+            sa.Column('user_id', sa.Integer(), sa.ForeignKey('users.id'), primary_key=True, autoincrement=False),
+            sa.Column('rank', sa.Integer(), primary_key=True, autoincrement=False),
+            sa.Column('event_id', sa.Integer(), sa.ForeignKey('events.id'), nullable=False),
+            sa.Column('score', sa.Float(), nullable=False),
+        )
+    if 'recommendation_runs' not in tables:
+        op.create_table(
+            'recommendation_runs',
+            sa.Column('id', sa.Integer(), primary_key=True),
+            sa.Column('last_registration_id', sa.Integer(), nullable=False),
+            sa.Column('users_updated', sa.Integer(), nullable=False),
+            sa.Column('full', sa.Boolean(), nullable=False),
+            sa.Column('finished_at', sa.DateTime(), nullable=False),
+        )
+        op.create_index('ix_recommendation_runs_id', 'recommendation_runs', ['id'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_recommendation_runs_id', table_name='recommendation_runs')
+    op.drop_table('recommendation_runs')
+    op.drop_table('recommendations')
@@ -0,0 +1,50 @@
+"""event seats counter and unique registration key
+
+Revision ID: 8a4e6c1d2f95
+Revises: 3f1c2a9d8b47
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8a4e6c1d2f95'
+down_revision: Union[str, None] = '3f1c2a9d8b47'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # В базах, созданных из init_db.sql, колонка seats_taken уже есть
+    inspector = sa.inspect(op.get_bind())
+    if 'seats_taken' not in {c['name'] for c in inspector.get_columns('events')}:
+        with op.batch_alter_table('events') as batch_op:
+            batch_op.add_column(
+                sa.Column('seats_taken', sa.Integer(), nullable=False, server_default='0')
+            )
+    op.execute(
+        "UPDATE events SET seats_taken = ("
+        "SELECT COUNT(*) FROM registrations WHERE registrations.event_id = events.id"
+        ")"
+    )
+
+    # В базах, созданных из init_db.sql, ключ unique_registration уже есть
+    existing = {
+        uc['name'] for uc in inspector.get_unique_constraints('registrations')
+    } | {
+        ix['name'] for ix in inspector.get_indexes('registrations') if ix.get('unique')
+    }
+    if 'unique_registration' not in existing:
+        with op.batch_alter_table('registrations') as batch_op:
+            batch_op.create_unique_constraint(
+                'unique_registration', ['event_id', 'volunteer_id']
+            )
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('events') as batch_op:
+        batch_op.drop_column('seats_taken')
@@ -0,0 +1,35 @@
+"""full-text search index for events
+
+Revision ID: 9c1e3a5b7d42
+Revises: 7b9d1f3a5c28
+Create Date: 2026-10-18 19:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.core.event_search import rebuild_search_index
+from app.models import EVENTS_SEARCH_DDL
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9c1e3a5b7d42'
+down_revision: Union[str, None] = '7b9d1f3a5c28'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    # В базах из init_db.sql таблица уже есть, но пуста: заполняется всё равно
+    if 'events_search' not in sa.inspect(bind).get_table_names():
+        op.execute(EVENTS_SEARCH_DDL[bind.dialect.name])
+    # Основы слов считаются в Python, поэтому индекс заполняется отсюда;
+    # rebuild_search_index сначала очищает таблицу, повторный запуск безопасен
+    rebuild_search_index(bind)
+
+
+def downgrade() -> None:
+    op.execute('DROP TABLE IF EXISTS events_search')
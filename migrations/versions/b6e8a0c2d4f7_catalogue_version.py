@@ -0,0 +1,39 @@
+"""catalogue version counter
+
+Revision ID: b6e8a0c2d4f7
+Revises: 4d8f0b2c6e19
+Create Date: 2026-10-18 23:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b6e8a0c2d4f7'
+down_revision: Union[str, None] = '4d8f0b2c6e19'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # В базах, созданных из init_db.sql, таблица уже есть
+    if 'catalogue_version' not in sa.inspect(op.get_bind()).get_table_names():
+        op.create_table(
+            'catalogue_version',
+            sa.Column('id', sa.Integer(), primary_key=True, autoincrement=False),
+            sa.Column('version', sa.Integer(), nullable=False, server_default='0'),
+        )
+    catalogue_version = sa.table('catalogue_version', sa.column('id'), sa.column('version'))
+    op.execute(
+        sa.insert(catalogue_version)
+        .values(id=1, version=0)
+        .prefix_with('OR IGNORE', dialect='sqlite')
+        .prefix_with('IGNORE', dialect='mysql')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('catalogue_version')
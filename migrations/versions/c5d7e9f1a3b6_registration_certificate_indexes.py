@@ -0,0 +1,39 @@
+"""registration and certificate lookup indexes
+
+Revision ID: c5d7e9f1a3b6
+Revises: 8a4e6c1d2f95
+Create Date: 2026-10-18 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c5d7e9f1a3b6'
+down_revision: Union[str, None] = '8a4e6c1d2f95'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+INDEXES = [
+    ('ix_registrations_volunteer_id', 'registrations', ['volunteer_id']),
+    ('ix_registrations_event_id_status', 'registrations', ['event_id', 'status']),
+    ('ix_certificates_volunteer_id', 'certificates', ['volunteer_id']),
+]
+
+
+def upgrade() -> None:
+    # В базах, созданных из init_db.sql, эти индексы уже есть
+    inspector = sa.inspect(op.get_bind())
+    for name, table, columns in INDEXES:
+        existing = {ix['name'] for ix in inspector.get_indexes(table)}
+        if name not in existing:
+            op.create_index(name, table, columns)
+
+
+def downgrade() -> None:
+    for name, table, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table)
@@ -0,0 +1,59 @@
+"""certificate rules and rule-issued certificates
+
+Revision ID: e2b4d6f8a0c1
+Revises: c5d7e9f1a3b6
+Create Date: 2026-10-18 16:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e2b4d6f8a0c1'
+down_revision: Union[str, None] = 'c5d7e9f1a3b6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    if 'certificate_rules' not in inspector.get_table_names():
+        op.create_table(
+            'certificate_rules',
+            sa.Column('id', sa.Integer(), primary_key=True),
+            sa.Column('title', sa.String(length=200), nullable=False),
+            sa.Column('hours_required', sa.Integer(), nullable=False),
+            sa.Column('ngo_id', sa.Integer(), sa.ForeignKey('ngos.id'), nullable=True),
+            sa.Column('is_active', sa.Boolean(), nullable=False, server_default=sa.true()),
+        )
+        op.create_index('ix_certificate_rules_id', 'certificate_rules', ['id'])
+
+    # Схемы из моделей и из init_db.sql расходятся: добавляем недостающее
+    columns = {c['name'] for c in inspector.get_columns('certificates')}
+    with op.batch_alter_table('certificates') as batch_op:
+        if 'title' not in columns:
+            batch_op.add_column(sa.Column('title', sa.String(length=200), nullable=True))
+        if 'hours_required' not in columns:
+            batch_op.add_column(sa.Column('hours_required', sa.Integer(), nullable=True))
+        if 'text' not in columns:
+            batch_op.add_column(sa.Column('text', sa.Text(), nullable=False, server_default=''))
+        if 'rule_id' not in columns:
+            batch_op.add_column(sa.Column('rule_id', sa.Integer(), nullable=True))
+            batch_op.create_foreign_key(
+                'fk_certificates_rule_id', 'certificate_rules', ['rule_id'], ['id']
+            )
+            batch_op.create_unique_constraint(
+                'uq_certificates_volunteer_rule', ['volunteer_id', 'rule_id']
+            )
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('certificates') as batch_op:
+        batch_op.drop_constraint('uq_certificates_volunteer_rule', type_='unique')
+        batch_op.drop_constraint('fk_certificates_rule_id', type_='foreignkey')
+        batch_op.drop_column('rule_id')
+    op.drop_index('ix_certificate_rules_id', table_name='certificate_rules')
+    op.drop_table('certificate_rules')
@@ -0,0 +1,246 @@
+from datetime import datetime
+
+import numpy as np
+from sqlalchemy import delete, func, insert, literal, select
+
+from app.core.config import get_settings
+from app.core.jobs import job_handler
+from app.models import (
+    EventModel,
+    RecommendationModel,
+    RecommendationRunModel,
+    RegistrationModel,
+)
+from app.services.base import BaseService
+
+# Волонтёров в одной порции: плотная матрица порции × мероприятия-кандидаты
+# (float32) при 10 тыс. кандидатов занимает ~20 МБ
+USER_BATCH_SIZE = 512
+# Строк матрицы волонтёр × НКО за один проход при подсчёте совместной встречаемости
+COOCCURRENCE_CHUNK_SIZE = 10_000
+# Популярность только разбивает ничьи между мероприятиями одного НКО
+POPULARITY_WEIGHT = 0.01
+
+
+class RecommendationService(BaseService):
+    """
+    «Рекомендовано для вас» по совместной встречаемости НКО в записях.
+
+    Если волонтёры, записывавшиеся к НКО A, часто записываются и к НКО B,
+    мероприятия B рекомендуются тем, кто ходит к A. Сходство НКО — косинус
+    по бинарной матрице волонтёр × НКО; интерес волонтёра к НКО —
+    взвешенная сумма сходств с его НКО. Всё считается пакетами NumPy,
+    а в БД ложится готовый top-K на волонтёра: онлайн-запрос — один
+    поиск по первичному ключу.
+
+    Пересчёт инкрементальный: заново считаются только волонтёры
+    с записями новее водяного знака (последний RecommendationRunModel).
+    Результаты пишутся порциями по USER_BATCH_SIZE волонтёров, каждая
+    порция — своя транзакция; водяной знак сдвигается последней из них.
+    Пересчёт без новых записей ничего не пишет.
+    """
+
+    async def _watermark(self) -> int:
+        return (
+            await self.db.execute(
+                select(RecommendationRunModel.last_registration_id)
+                .order_by(RecommendationRunModel.id.desc())
+                .limit(1)
+            )
+        ).scalar_one_or_none() or 0
+
+    async def _user_ngo_pairs(self) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Число записей каждого волонтёра к каждому НКО: (users, ngos, counts)"""
+        rows = (
+            await self.db.execute(
+                select(RegistrationModel.volunteer_id, EventModel.ngo_id, func.count())
+                .join(EventModel, EventModel.id == RegistrationModel.event_id)
+                .group_by(RegistrationModel.volunteer_id, EventModel.ngo_id)
+                .order_by(RegistrationModel.volunteer_id)
+            )
+        ).all()
+        if not rows:
+            empty = np.empty(0, dtype=np.int64)
+            return empty, empty, empty.astype(np.float32)
+        users, ngos, counts = (np.asarray(column) for column in zip(*rows))
+        return users.astype(np.int64), ngos.astype(np.int64), counts.astype(np.float32)
+
+    @staticmethod
+    def _ngo_similarity(user_pos: np.ndarray, ngo_pos: np.ndarray, n_users: int, n_ngos: int) -> np.ndarray:
+        """Косинусное сходство НКО по бинарной матрице волонтёр × НКО"""
+        cooccurrence = np.zeros((n_ngos, n_ngos), dtype=np.float32)
+        for start in range(0, n_users, COOCCURRENCE_CHUNK_SIZE):
+            stop = min(start + COOCCURRENCE_CHUNK_SIZE, n_users)
+            mask = (user_pos >= start) & (user_pos < stop)
+            chunk = np.zeros((stop - start, n_ngos), dtype=np.float32)
+            chunk[user_pos[mask] - start, ngo_pos[mask]] = 1.0
+            cooccurrence += chunk.T @ chunk
+        norms = np.sqrt(np.diag(cooccurrence))
+        norms[norms == 0] = 1.0
+        return cooccurrence / norms[:, None] / norms[None, :]
+
+    async def _candidates(self, ngo_index: dict[int, int], n_ngos: int):
+        """Активные будущие мероприятия со свободными местами"""
+        rows = (
+            await self.db.execute(
+                select(EventModel.id, EventModel.ngo_id, EventModel.seats_taken)
+                .where(
+                    EventModel.status == "active",
+                    EventModel.scheduled_at > datetime.now(),
+                    (EventModel.max_volunteers.is_(None))
+                    | (EventModel.seats_taken < EventModel.max_volunteers),
+                )
+            )
+        ).all()
+        event_ids = np.fromiter((r.id for r in rows), dtype=np.int64, count=len(rows))
+        # НКО без записей — отдельный нулевой столбец с индексом n_ngos
+        event_ngo = np.fromiter(
+            (ngo_index.get(r.ngo_id, n_ngos) for r in rows), dtype=np.int64, count=len(rows)
+        )
+        seats = np.fromiter((r.seats_taken for r in rows), dtype=np.float32, count=len(rows))
+        popularity = np.log1p(seats)
+        if len(rows) and popularity.max() > 0:
+            popularity /= popularity.max()
+        return event_ids, event_ngo, POPULARITY_WEIGHT * popularity
+
+    async def _registered(self, user_ids: list[int]) -> list[tuple[int, int]]:
+        return (
+            await self.db.execute(
+                select(RegistrationModel.volunteer_id, RegistrationModel.event_id)
+                .where(RegistrationModel.volunteer_id.in_(user_ids))
+            )
+        ).all()
+
+    @staticmethod
+    def top_k(scores: np.ndarray, k: int) -> tuple[np.ndarray, np.ndarray]:
+        """Индексы и значения k лучших по строкам, по убыванию"""
+        k = min(k, scores.shape[1])
+        part = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        part_scores = np.take_along_axis(scores, part, axis=1)
+        order = np.argsort(-part_scores, axis=1, kind="stable")
+        return np.take_along_axis(part, order, axis=1), np.take_along_axis(part_scores, order, axis=1)
+
+    async def recompute(self, full: bool = False) -> dict:
+        settings = get_settings()
+        top_k = settings.RECOMMENDATIONS_TOP_K
+        # Граница фиксируется до расчёта: записи, пришедшие во время
+        # пересчёта, попадут в следующий
+        last_registration_id = (
+            await self.db.execute(select(func.coalesce(func.max(RegistrationModel.id), 0)))
+        ).scalar_one()
+        watermark = 0 if full else await self._watermark()
+        changed = (
+            await self.db.execute(
+                select(RegistrationModel.volunteer_id)
+                .where(
+                    RegistrationModel.id > watermark,
+                    RegistrationModel.id <= last_registration_id,
+                )
+                .distinct()
+            )
+        ).scalars().all()
+        if not changed and not full:
+            return {"users_updated": 0, "last_registration_id": last_registration_id}
+
+        updated = 0
+        if changed:
+            users, ngos, counts = await self._user_ngo_pairs()
+            user_ids, user_pos = np.unique(users, return_inverse=True)
+            ngo_ids, ngo_pos = np.unique(ngos, return_inverse=True)
+            n_ngos = len(ngo_ids)
+            similarity = self._ngo_similarity(user_pos, ngo_pos, len(user_ids), n_ngos)
+            ngo_index = {int(ngo_id): i for i, ngo_id in enumerate(ngo_ids)}
+            event_ids, event_ngo, popularity = await self._candidates(ngo_index, n_ngos)
+            event_pos = {int(event_id): i for i, event_id in enumerate(event_ids)}
+            weights = np.log1p(counts)
+
+            changed_ids = np.asarray(sorted(changed), dtype=np.int64)
+            for start in range(0, len(changed_ids), USER_BATCH_SIZE):
+                batch = changed_ids[start:start + USER_BATCH_SIZE]
+                await self.db.execute(
+                    delete(RecommendationModel).where(RecommendationModel.user_id.in_(batch.tolist()))
+                )
+                if len(event_ids) == 0:
+                    await self.db.commit()
+                    continue
+
+                # Интерес к НКО: строки волонтёров порции × сходство НКО
+                rows = np.searchsorted(user_ids, batch)
+                profile = np.zeros((len(batch), n_ngos), dtype=np.float32)
+                in_batch = np.isin(user_pos, rows)
+                profile[np.searchsorted(rows, user_pos[in_batch]), ngo_pos[in_batch]] = weights[in_batch]
+                affinity = np.hstack([profile @ similarity, np.zeros((len(batch), 1), np.float32)])
+
+                scores = affinity[:, event_ngo] + popularity
+                batch_pos = {int(user_id): i for i, user_id in enumerate(batch)}
+                for user_id, event_id in await self._registered(batch.tolist()):
+                    if event_id in event_pos:
+                        scores[batch_pos[user_id], event_pos[event_id]] = -np.inf
+
+                best, best_scores = self.top_k(scores, top_k)
+                # Уже записанные (-inf) в таблицу не попадают
+                row, col = np.nonzero(np.isfinite(best_scores))
+                values = [
+                    {"user_id": user_id, "rank": rank, "event_id": event_id, "score": score}
+                    for user_id, rank, event_id, score in zip(
+                        batch[row].tolist(),
+                        (col + 1).tolist(),
+                        event_ids[best[row, col]].tolist(),
+                        best_scores[row, col].tolist(),
+                    )
+                ]
+                if values:
+                    # Insert по таблице, а не по модели: без ORM bulk-пути,
+                    # который на сотнях тысяч строк дороже самого расчёта
+                    await self.db.execute(insert(RecommendationModel.__table__), values)
+                updated += len(batch)
+                # Порция готова: блокировки и журнал транзакции не растут с числом волонтёров
+                await self.db.commit()
+
+        if full:
+            # Волонтёры без записей: их прежние рекомендации устарели
+            await self.db.execute(
+                delete(RecommendationModel).where(
+                    RecommendationModel.user_id.not_in(
+                        select(RegistrationModel.volunteer_id)
+                        .where(RegistrationModel.id <= last_registration_id)
+                    )
+                )
+            )
+        self.db.add(RecommendationRunModel(
+            last_registration_id=last_registration_id,
+            users_updated=updated,
+            full=full,
+        ))
+        return {"users_updated": updated, "last_registration_id": last_registration_id}
+
+    async def for_user(self, user_id: int, limit: int) -> list:
+        """Рекомендации волонтёра; без них — самые востребованные мероприятия"""
+        upcoming = (
+            EventModel.status == "active",
+            EventModel.scheduled_at > datetime.now(),
+        )
+        rows = (
+            await self.db.execute(
+                select(EventModel, RecommendationModel.score)
+                .join(EventModel, EventModel.id == RecommendationModel.event_id)
+                .where(RecommendationModel.user_id == user_id, *upcoming)
+                .order_by(RecommendationModel.rank)
+                .limit(limit)
+            )
+        ).all()
+        if rows:
+            return rows
+        return (
+            await self.db.execute(
+                select(EventModel, literal(0.0))
+                .where(*upcoming)
+                .order_by(EventModel.seats_taken.desc(), EventModel.id)
+                .limit(limit)
+            )
+        ).all()
+
+
+@job_handler("recompute_recommendations")
+async def recompute_recommendations_job(db, payload: dict) -> dict:
+    return await RecommendationService(db).recompute(full=payload.get("full", False))
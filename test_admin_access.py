@@ -0,0 +1,80 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from app.models import RoleModel, UserModel
+from main import app
+
+
+@pytest.fixture(scope="function")
+def setup_database(setup_database, database):
+    """Волонтёр id=2 без прав администратора"""
+    db = database.session()
+    try:
+        role = RoleModel(name="volunteer")
+        db.add(role)
+        db.flush()
+        db.add(UserModel(
+            id=2,
+            name="Волонтёр",
+            email="volunteer@example.com",
+            hashed_password="x",
+            role_id=role.id,
+        ))
+        db.commit()
+    finally:
+        db.close()
+
+
+client = TestClient(app)
+
+
+ADMIN_ROUTES = [
+    ("GET", "/api/roles/"),
+    ("GET", "/api/metrics/tokens"),
+    ("GET", "/api/metrics/pool"),
+    ("GET", "/api/metrics/replicas"),
+    ("GET", "/api/jobs/"),
+    ("GET", "/api/jobs/1"),
+    ("POST", "/api/jobs/1/retry"),
+    ("GET", "/api/exports/registrations"),
+    ("GET", "/api/certificates/rules"),
+    ("POST", "/api/certificates/rules"),
+    ("POST", "/api/certificates/backfill"),
+    ("POST", "/api/recommendations/recompute"),
+    ("POST", "/api/events/"),
+    ("POST", "/api/events/import"),
+    ("POST", "/api/events/1/complete"),
+    ("POST", "/api/events/certificates/2"),
+]
+
+
+@pytest.mark.parametrize("method,path", ADMIN_ROUTES)
+def test_admin_route_forbidden_for_volunteer(setup_database, token_headers, method, path):
+    """Тест: волонтёр получает 403 на всех admin-эндпоинтах"""
+    response = client.request(method, path, headers=token_headers(2))
+    assert response.status_code == 403
+
+
+def test_admin_role_is_checked_in_database(setup_database, database, token_headers):
+    """Тест: роль admin в токене не даёт прав, если в БД её нет"""
+    headers = token_headers(2, "admin")
+    assert client.get("/api/metrics/tokens", headers=headers).status_code == 403
+
+    # Повышение роли сбрасывает кэш после коммита
+    db = database.session()
+    try:
+        admin = RoleModel(name="admin")
+        db.add(admin)
+        db.flush()
+        db.get(UserModel, 2).role_id = admin.id
+        db.commit()
+    finally:
+        db.close()
+    assert client.get("/api/metrics/tokens", headers=headers).status_code == 200
+
+
+@pytest.mark.parametrize("method,path", ADMIN_ROUTES[:2])
+def test_admin_route_requires_token(setup_database, method, path):
+    """Тест: без токена admin-эндпоинты отвечают 401"""
+    response = client.request(method, path)
+    assert response.status_code == 401
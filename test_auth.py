@@ -1,36 +1,21 @@
 import pytest
 from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
 
-from app.core.database import Base, get_db
+from app.models import CertificateModel, EventModel, NGOModel, RegistrationModel, RoleModel, UserModel
 from main import app
 
-# Тестовая база данных
-SQLALCHEMY_DATABASE_URL = "sqlite:///./test.db"
-engine = create_engine(SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False})
-TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
-
-def override_get_db():
+@pytest.fixture(scope="function")
+def setup_database(setup_database, database):
+    """Роль volunteer, которую получает каждый зарегистрированный"""
+    db = database.session()
     try:
-        db = TestingSessionLocal()
-        yield db
+        db.add(RoleModel(name="volunteer"))
+        db.commit()
     finally:
         db.close()
 
 
-app.dependency_overrides[get_db] = override_get_db
-
-
-@pytest.fixture(scope="function")
-def setup_database():
-    """Создание и удаление тестовой БД для каждого теста"""
-    Base.metadata.create_all(bind=engine)
-    yield
-    Base.metadata.drop_all(bind=engine)
-
-
 client = TestClient(app)
 
 
@@ -136,6 +121,154 @@ def test_login_invalid_credentials(setup_database):
     assert response.status_code == 401
 
 
+def test_register_stores_bcrypt_hash(setup_database, database):
+    """Тест: пароль сохраняется хешем, а не открытым текстом"""
+    client.post(
+        "/auth/register",
+        json={
+            "name": "Хеш Тест",
+            "email": "hash@example.com",
+            "password": "testpass123",
+            "role_id": 999
+        }
+    )
+    db = database.session()
+    try:
+        user = db.query(UserModel).filter_by(email="hash@example.com").one()
+        assert user.hashed_password.startswith("$2b$")
+        assert user.role.name == "volunteer"
+    finally:
+        db.close()
+
+
+def test_login_rehashes_outdated_hash(setup_database, database):
+    """Тест: хеш с устаревшим cost-фактором перехешируется при входе"""
+    from passlib.context import CryptContext
+    from app.core.config import get_settings
+    from app.core.hashing import bcrypt_rounds
+
+    old_hash = CryptContext(schemes=["bcrypt"], bcrypt__rounds=4).hash("testpass123")
+    db = database.session()
+    try:
+        role = db.query(RoleModel).filter_by(name="volunteer").one()
+        db.add(UserModel(
+            name="Старый Хеш",
+            email="old@example.com",
+            hashed_password=old_hash,
+            role_id=role.id,
+        ))
+        db.commit()
+    finally:
+        db.close()
+
+    response = client.post(
+        "/auth/login",
+        json={"email": "old@example.com", "password": "testpass123"}
+    )
+    assert response.status_code == 200
+
+    db = database.session()
+    try:
+        user = db.query(UserModel).filter_by(email="old@example.com").one()
+        assert bcrypt_rounds(user.hashed_password) == get_settings().BCRYPT_ROUNDS
+    finally:
+        db.close()
+
+
+def test_login_succeeds_when_rehash_is_rejected(setup_database, database, monkeypatch):
+    """Тест: занятый пул bcrypt не мешает входу — хеш просто остаётся старым"""
+    from passlib.context import CryptContext
+    from app.core.hashing import bcrypt_rounds
+    from app.exceptions import PasswordHasherBusyHTTPError
+    from app.services.auth import AuthService
+
+    old_hash = CryptContext(schemes=["bcrypt"], bcrypt__rounds=4).hash("testpass123")
+    db = database.session()
+    try:
+        role = db.query(RoleModel).filter_by(name="volunteer").one()
+        db.add(UserModel(
+            name="Старый Хеш",
+            email="busy@example.com",
+            hashed_password=old_hash,
+            role_id=role.id,
+        ))
+        db.commit()
+    finally:
+        db.close()
+
+    async def busy(cls, plain_password):
+        raise PasswordHasherBusyHTTPError
+
+    monkeypatch.setattr(AuthService, "hash_password_async", busy)
+    response = client.post(
+        "/auth/login",
+        json={"email": "busy@example.com", "password": "testpass123"}
+    )
+    assert response.status_code == 200
+    assert "access_token" in response.json()
+
+    db = database.session()
+    try:
+        user = db.query(UserModel).filter_by(email="busy@example.com").one()
+        assert bcrypt_rounds(user.hashed_password) == 4
+    finally:
+        db.close()
+
+
+def test_password_hasher_slot_held_until_job_finishes():
+    """Тест: отмена ожидающего запроса не освобождает слот, пока задача идёт в пуле"""
+    import asyncio
+    import threading
+    from app.core.hashing import PasswordHasher
+    from app.exceptions import PasswordHasherBusyHTTPError
+
+    hasher = PasswordHasher(workers=1, queue_size=0)
+    started, release = threading.Event(), threading.Event()
+
+    def slow_job():
+        started.set()
+        release.wait(5)
+        return "done"
+
+    async def scenario():
+        waiter = asyncio.create_task(hasher._run(slow_job))
+        await asyncio.to_thread(started.wait, 5)
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+
+        # Задача всё ещё занимает поток — новая получает 503
+        with pytest.raises(PasswordHasherBusyHTTPError):
+            await hasher._run(slow_job)
+
+        release.set()
+        await asyncio.sleep(0.1)
+        return await hasher._run(lambda: "next")
+
+    try:
+        assert asyncio.run(scenario()) == "next"
+    finally:
+        release.set()
+        hasher.shutdown()
+
+
+def test_login_wrong_password(setup_database):
+    """Тест: неверный пароль существующего пользователя — 401"""
+    client.post(
+        "/auth/register",
+        json={
+            "name": "Тестовый Пользователь",
+            "email": "wrong@example.com",
+            "password": "testpass123"
+        }
+    )
+    response = client.post(
+        "/auth/login",
+        json={"email": "wrong@example.com", "password": "otherpass"}
+    )
+    assert response.status_code == 401
+
+
 def test_get_me_without_token(setup_database):
     """Тест получения профиля без токена"""
     response = client.get("/auth/me")
@@ -172,3 +305,87 @@ def test_get_me_with_token(setup_database):
     assert response.status_code == 200
     assert response.json()["email"] == "profile@example.com"
 
+
+def test_get_me_with_registrations_and_certificates(setup_database, database, token_headers):
+    """Тест: профиль возвращает записи с мероприятиями и сертификаты"""
+    from datetime import datetime
+
+    client.post(
+        "/auth/register",
+        json={
+            "name": "Профиль Тест",
+            "email": "full@example.com",
+            "password": "testpass123"
+        }
+    )
+    db = database.session()
+    try:
+        user = db.query(UserModel).filter_by(email="full@example.com").one()
+        ngo = NGOModel(name="НКО")
+        db.add(ngo)
+        db.flush()
+        for i in range(3):
+            event = EventModel(
+                title=f"Мероприятие {i}",
+                ngo_id=ngo.id,
+                scheduled_at=datetime(2030, 1, i + 1),
+                location="Москва",
+            )
+            db.add(event)
+            db.flush()
+            db.add(RegistrationModel(event_id=event.id, volunteer_id=user.id))
+        db.add(CertificateModel(volunteer_id=user.id, text="Спасибо"))
+        db.commit()
+        user_id = user.id
+    finally:
+        db.close()
+
+    response = client.get("/auth/me", headers=token_headers(user_id))
+    assert response.status_code == 200
+    data = response.json()
+    assert data["role"]["name"] == "volunteer"
+    assert [r["event_title"] for r in data["registrations"]] == [
+        "Мероприятие 0", "Мероприятие 1", "Мероприятие 2"
+    ]
+    assert data["registrations"][0]["location"] == "Москва"
+    assert len(data["certificates"]) == 1
+
+
+def test_get_me_deleted_user(setup_database, token_headers):
+    """Тест: токен пользователя, которого нет в БД — 404"""
+    response = client.get("/auth/me", headers=token_headers(424242))
+    assert response.status_code == 404
+
+
+def test_verified_token_cache_hit():
+    """Тест: повторная проверка того же токена берётся из кэша"""
+    from app.core.token_cache import token_cache
+    from app.services.auth import AuthService
+
+    token = AuthService.create_access_token({"user_id": 42, "role": "volunteer"})
+    before = token_cache.stats()
+
+    assert AuthService.decode_token(token)["user_id"] == 42
+    assert AuthService.decode_token(token)["user_id"] == 42
+
+    after = token_cache.stats()
+    assert after["misses"] == before["misses"] + 1
+    assert after["hits"] == before["hits"] + 1
+
+
+def test_verified_token_cache_respects_exp():
+    """Тест: запись с истёкшим exp не отдаётся из кэша"""
+    import time
+    from app.core.token_cache import VerifiedTokenCache
+
+    cache = VerifiedTokenCache(maxsize=2)
+    cache.put("expired", {"user_id": 1, "exp": time.time() - 1})
+    assert cache.get("expired") is None
+    assert cache.stats()["size"] == 0
+
+    cache.put("a", {"user_id": 2, "exp": time.time() + 60})
+    cache.put("b", {"user_id": 3, "exp": time.time() + 60})
+    cache.put("c", {"user_id": 4, "exp": time.time() + 60})
+    assert cache.get("a") is None  # вытеснен как самый старый
+    assert cache.get("c")["user_id"] == 4
+
@@ -0,0 +1,149 @@
+import asyncio
+import os
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core.config import get_settings
+from app.core.jobs import drain
+from app.models import (
+    CertificateModel,
+    CertificateRuleModel,
+    EventModel,
+    NGOModel,
+    RegistrationModel,
+    RoleModel,
+    UserModel,
+)
+from app.services.certificate_rules import CertificateRulesService
+from main import app
+
+client = TestClient(app)
+
+
+def seed(database, volunteers: int, total_hours: int = 0) -> tuple[int, list[int]]:
+    """НКО, мероприятие на 8 часов и волонтёры, записанные на него"""
+    db = database.session()
+    try:
+        role = RoleModel(name="volunteer")
+        ngo = NGOModel(name="НКО «Тест»")
+        db.add_all([role, ngo])
+        db.flush()
+        users = [
+            UserModel(
+                name=f"Волонтёр {i}", email=f"v{i}@example.com", hashed_password="x",
+                role_id=role.id, total_hours=total_hours, rating=float(total_hours),
+            )
+            for i in range(volunteers)
+        ]
+        event = EventModel(
+            title="Марафон", ngo_id=ngo.id, duration_hours=8,
+            scheduled_at=datetime.now() + timedelta(days=1),
+        )
+        db.add_all([*users, event])
+        db.flush()
+        db.add_all(RegistrationModel(event_id=event.id, volunteer_id=u.id) for u in users)
+        db.add_all([
+            CertificateRuleModel(title="10 часов добрых дел", hours_required=10),
+            CertificateRuleModel(title="Друг НКО", hours_required=8, ngo_id=ngo.id),
+            CertificateRuleModel(title="Ветеран", hours_required=100),
+        ])
+        db.commit()
+        return event.id, [u.id for u in users]
+    finally:
+        db.close()
+
+
+def certificate_pairs(database) -> list[tuple[int, str]]:
+    db = database.session()
+    try:
+        return sorted(
+            (c.volunteer_id, c.title)
+            for c in db.query(CertificateModel).filter(CertificateModel.rule_id.isnot(None))
+        )
+    finally:
+        db.close()
+
+
+def test_complete_event_issues_certificates_once(setup_database, database, admin_headers):
+    """Тест: при начислении часов сертификаты за пересечённые пороги выдаются один раз"""
+    event_id, (first, second) = seed(database, volunteers=2, total_hours=5)
+
+    response = client.post(f"/api/events/{event_id}/complete", headers=admin_headers())
+    assert response.status_code == 202
+    asyncio.run(drain(database.async_session))
+
+    assert certificate_pairs(database) == [
+        (first, "10 часов добрых дел"),
+        (first, "Друг НКО"),
+        (second, "10 часов добрых дел"),
+        (second, "Друг НКО"),
+    ]
+
+    async def reevaluate():
+        async with database.async_session() as db:
+            issued = await CertificateRulesService(db).issue_for_volunteers([first, second])
+            await db.commit()
+            return issued
+
+    assert asyncio.run(reevaluate()) == 0
+
+
+def test_backfill_processes_all_users_in_chunks(setup_database, database):
+    """Тест: обход всей таблицы порциями выдаёт сертификаты всем и идемпотентен"""
+    seed(database, volunteers=25, total_hours=12)
+
+    async def backfill():
+        async with database.async_session() as db:
+            return await CertificateRulesService(db).backfill(chunk_size=10)
+
+    assert asyncio.run(backfill()) == {"issued": 25, "chunks": 3}
+    assert asyncio.run(backfill()) == {"issued": 0, "chunks": 3}
+
+
+def test_certificate_pdf_checks_admin_role_in_database(setup_database, database, token_headers):
+    """Тест: claim role=admin в токене не открывает чужой сертификат"""
+    _, (owner, other) = seed(database, volunteers=2)
+    db = database.session()
+    try:
+        cert = CertificateModel(volunteer_id=owner, text="Спасибо")
+        db.add(cert)
+        db.commit()
+        cert_id = cert.id
+    finally:
+        db.close()
+
+    # Роль администратора сняли, а токен ещё действует
+    response = client.get(
+        f"/api/certificates/{cert_id}/pdf", headers=token_headers(other, "admin")
+    )
+    assert response.status_code == 403
+
+
+@pytest.mark.skipif(
+    not os.path.exists(get_settings().CERTIFICATE_FONT_PATH),
+    reason="нет шрифта для рендеринга сертификатов",
+)
+def test_certificate_pdf_is_rendered_once(setup_database, database, admin_headers, token_headers):
+    """Тест: PDF рендерится один раз, повторная выгрузка отдаёт тот же файл"""
+    event_id, (first, second) = seed(database, volunteers=2, total_hours=5)
+    client.post(f"/api/events/{event_id}/complete", headers=admin_headers())
+    asyncio.run(drain(database.async_session))
+    db = database.session()
+    try:
+        cert_id = db.query(CertificateModel.id).filter_by(volunteer_id=first).first()[0]
+    finally:
+        db.close()
+
+    response = client.get(f"/api/certificates/{cert_id}/pdf", headers=token_headers(first))
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/pdf"
+    assert response.content.startswith(b"%PDF")
+
+    again = client.get(f"/api/certificates/{cert_id}/pdf", headers=token_headers(first))
+    assert again.content == response.content
+    assert again.headers["etag"] == response.headers["etag"]
+
+    other = client.get(f"/api/certificates/{cert_id}/pdf", headers=token_headers(second))
+    assert other.status_code == 403
@@ -0,0 +1,102 @@
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core.catalogue_cache import catalogue_cache
+from app.core.event_search import rebuild_search_index
+from app.core.stemmer import normalize, stem
+from app.models import NGOModel
+from main import app
+
+
+@pytest.fixture(scope="function")
+def setup_database(setup_database, database):
+    """НКО, к которому привязываются мероприятия"""
+    db = database.session()
+    try:
+        db.add(NGOModel(name="НКО «Поиск»"))
+        db.commit()
+    finally:
+        db.close()
+
+
+client = TestClient(app)
+
+
+def create_event(admin_headers, title: str, description: str = "") -> int:
+    response = client.post(
+        "/api/events/",
+        json={
+            "title": title,
+            "description": description,
+            "ngo_id": 1,
+            "scheduled_at": (datetime.now() + timedelta(days=3)).isoformat(),
+        },
+        headers=admin_headers(),
+    )
+    assert response.status_code == 200
+    return response.json()["id"]
+
+
+def search(q: str) -> list[str]:
+    response = client.get("/api/events/search", params={"q": q})
+    assert response.status_code == 200
+    return [e["title"] for e in response.json()]
+
+
+@pytest.mark.parametrize("words", [
+    ("субботник", "субботники", "субботника", "субботником"),
+    ("волонтёры", "волонтеров", "волонтер"),
+    ("благотворительный", "благотворительного", "благотворительных"),
+])
+def test_word_forms_share_stem(words):
+    """Тест: словоформы сводятся к одной основе, ё — к е"""
+    assert len({stem(word) for word in words}) == 1
+
+
+def test_normalize_drops_stop_words():
+    """Тест: служебные слова не попадают в индекс и запрос"""
+    assert normalize("Уборка в парке и на набережной") == "уборк парк набережн"
+
+
+def test_search_matches_word_forms(setup_database, admin_headers):
+    """Тест: запрос в другой словоформе находит мероприятие"""
+    create_event(admin_headers, "Экологический субботник в парке", "Уборка территории и посадка деревьев")
+    create_event(admin_headers, "Помощь приюту для животных", "Выгул собак")
+
+    assert search("субботники в парках") == ["Экологический субботник в парке"]
+    assert search("посадки деревьев") == ["Экологический субботник в парке"]
+    # Последнее слово можно не дописывать
+    assert search("приют жив") == ["Помощь приюту для животных"]
+    assert search("марафон") == []
+
+
+def test_search_ranks_title_matches_first(setup_database, admin_headers):
+    """Тест: совпадение в названии важнее совпадения в описании"""
+    create_event(admin_headers, "Сбор вещей", "После сбора — концерт во дворе")
+    create_event(admin_headers, "Концерт для пожилых людей", "Песни военных лет")
+
+    assert search("концерт") == ["Концерт для пожилых людей", "Сбор вещей"]
+
+
+def test_search_index_follows_import_and_rebuild(setup_database, database, admin_headers):
+    """Тест: импорт индексирует мероприятия, перестройка индекса идемпотентна"""
+    scheduled_at = (datetime.now() + timedelta(days=7)).isoformat()
+    records = [
+        {"title": f"Донорская акция {i}", "ngo_id": 1, "scheduled_at": scheduled_at}
+        for i in range(3)
+    ]
+    assert client.post("/api/events/import", json=records, headers=admin_headers()).json()["created"] == 3
+    assert len(search("донорские акции")) == 3
+
+    with database.engine.begin() as conn:
+        assert rebuild_search_index(conn) == 3
+    catalogue_cache.invalidate()
+    assert len(search("донорские акции")) == 3
+
+
+def test_search_without_meaningful_words(setup_database):
+    """Тест: запрос из одних служебных слов отклоняется"""
+    response = client.get("/api/events/search", params={"q": "в на"})
+    assert response.status_code == 400
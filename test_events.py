@@ -0,0 +1,396 @@
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+from app.core.catalogue_cache import bump_catalogue_version, catalogue_cache
+from app.core.jobs import drain
+from app.core.role_cache import role_cache
+from app.models import (
+    EventModel,
+    JobModel,
+    NGOModel,
+    RegistrationModel,
+    RoleModel,
+    UserModel,
+)
+from main import app
+
+client = TestClient(app)
+
+
+class QueryCounter:
+    """Считает SQL-запросы, отправленные через engine"""
+
+    def __init__(self, bind):
+        self.bind = bind
+        self.count = 0
+
+    def _on_execute(self, conn, cursor, statement, parameters, context, executemany):
+        self.count += 1
+
+    def __enter__(self):
+        event.listen(self.bind, "before_cursor_execute", self._on_execute)
+        return self
+
+    def __exit__(self, *exc):
+        event.remove(self.bind, "before_cursor_execute", self._on_execute)
+
+
+def seed_events(database, events_count: int, volunteers_per_event: int) -> None:
+    """Создание мероприятий с заданным числом записей волонтёров"""
+    db = database.session()
+    try:
+        role = RoleModel(name="volunteer")
+        ngo = NGOModel(name="НКО «Тест»")
+        db.add_all([role, ngo])
+        db.flush()
+
+        volunteers = [
+            UserModel(
+                name=f"Волонтёр {i}",
+                email=f"volunteer{i}@example.com",
+                hashed_password="x",
+                role_id=role.id,
+            )
+            for i in range(volunteers_per_event)
+        ]
+        db.add_all(volunteers)
+        db.flush()
+
+        for i in range(events_count):
+            ev = EventModel(
+                title=f"Мероприятие {i}",
+                ngo_id=ngo.id,
+                scheduled_at=datetime.now() + timedelta(days=i),
+            )
+            db.add(ev)
+            db.flush()
+            db.add_all(
+                RegistrationModel(event_id=ev.id, volunteer_id=v.id)
+                for v in volunteers
+            )
+        db.commit()
+    finally:
+        db.close()
+
+
+def test_event_routes_are_mounted(setup_database):
+    """Тест: роутер мероприятий подключён в main.app целиком"""
+    paths = app.openapi()["paths"]
+    for path in (
+        "/api/events/",
+        "/api/events/search",
+        "/api/events/live",
+        "/api/events/import",
+        "/api/events/{event_id}",
+        "/api/events/{event_id}/signup",
+        "/api/events/{event_id}/complete",
+    ):
+        assert path in paths
+
+    response = client.get("/api/events")
+    assert response.status_code == 200
+    assert response.json() == []
+
+
+@pytest.mark.parametrize("max_volunteers", [0, -5])
+def test_create_event_rejects_non_positive_capacity(setup_database, max_volunteers, admin_headers):
+    """Тест: max_volunteers меньше 1 отклоняется валидацией (422), мероприятие не создаётся"""
+    payload = {
+        "title": "Субботник",
+        "ngo_id": 1,
+        "scheduled_at": (datetime.now() + timedelta(days=1)).isoformat(),
+        "max_volunteers": max_volunteers,
+    }
+    response = client.post("/api/events/", json=payload, headers=admin_headers())
+
+    assert response.status_code == 422
+    assert response.json()["detail"][0]["loc"] == ["body", "max_volunteers"]
+    assert client.get("/api/events").json() == []
+
+
+def test_list_events_volunteers_count(setup_database, database):
+    """Тест подсчёта записавшихся волонтёров в списке мероприятий"""
+    seed_events(database, events_count=3, volunteers_per_event=4)
+
+    response = client.get("/api/events")
+    assert response.status_code == 200
+    events = response.json()
+    assert len(events) == 3
+    assert all(e["volunteers_count"] == 4 for e in events)
+
+
+@pytest.mark.parametrize("events_count", [1, 10, 50])
+def test_list_events_query_count_is_constant(setup_database, events_count, database):
+    """Тест: число SQL-запросов не зависит от числа мероприятий"""
+    seed_events(database, events_count=events_count, volunteers_per_event=3)
+
+    with QueryCounter(database.async_engine.sync_engine) as counter:
+        response = client.get("/api/events", params={"per_page": 100})
+
+    assert response.status_code == 200
+    assert len(response.json()) == events_count
+    # Версия каталога и сама страница
+    assert counter.count == 2
+
+
+def test_list_events_keyset_pagination(setup_database, database):
+    """Тест обхода каталога по курсору без пропусков и повторов"""
+    seed_events(database, events_count=25, volunteers_per_event=1)
+
+    seen = []
+    params = {"per_page": 10}
+    while True:
+        response = client.get("/api/events", params=params)
+        assert response.status_code == 200
+        page = response.json()
+        assert len(page) <= 10
+        seen.extend(e["id"] for e in page)
+        cursor = response.headers.get("X-Next-Cursor")
+        if cursor is None:
+            break
+        params = {"per_page": 10, "cursor": cursor}
+
+    assert len(seen) == 25
+    assert len(set(seen)) == 25
+
+
+@pytest.mark.parametrize("pages_to_skip", [0, 4])
+def test_list_events_deep_page_query_count(setup_database, pages_to_skip, database):
+    """Тест: глубокая страница стоит столько же запросов, сколько первая"""
+    seed_events(database, events_count=50, volunteers_per_event=1)
+
+    params = {"per_page": 5}
+    for _ in range(pages_to_skip):
+        params["cursor"] = client.get("/api/events", params=params).headers["X-Next-Cursor"]
+
+    # Версия каталога перечитывается в обоих случаях
+    catalogue_cache.invalidate()
+    with QueryCounter(database.async_engine.sync_engine) as counter:
+        response = client.get("/api/events", params=params)
+
+    assert len(response.json()) == 5
+    assert counter.count == 2
+
+
+def test_list_events_filters(setup_database, database):
+    """Тест фильтрации каталога по НКО и диапазону дат"""
+    seed_events(database, events_count=5, volunteers_per_event=1)
+
+    response = client.get("/api/events", params={"ngo_id": 999})
+    assert response.json() == []
+
+    date_to = (datetime.now() + timedelta(days=1, hours=12)).isoformat()
+    response = client.get("/api/events", params={"date_to": date_to})
+    assert len(response.json()) == 2
+
+
+def test_list_events_rejects_page_param(setup_database):
+    """Тест: номер страницы не игнорируется молча — каталог листается курсором"""
+    response = client.get("/api/events", params={"page": 2})
+    assert response.status_code == 400
+    assert "cursor" in response.json()["detail"]
+
+
+def test_list_events_invalid_cursor(setup_database):
+    """Тест некорректного курсора"""
+    response = client.get("/api/events", params={"cursor": "not-a-cursor"})
+    assert response.status_code == 400
+
+
+def test_complete_event_credits_hours_once(setup_database, database, admin_headers):
+    """Тест: повторное завершение мероприятия не начисляет часы дважды"""
+    seed_events(database, events_count=1, volunteers_per_event=5)
+    event_id = client.get("/api/events").json()[0]["id"]
+
+    response = client.post(f"/api/events/{event_id}/complete", headers=admin_headers())
+    assert response.status_code == 202
+    job_id = response.json()["job_id"]
+
+    response = client.post(f"/api/events/{event_id}/complete", headers=admin_headers())
+    assert response.status_code == 409
+
+    assert asyncio.run(drain(database.async_session)) == 1
+
+    db = database.session()
+    try:
+        hours = [
+            u.total_hours
+            for u in db.query(UserModel).join(RoleModel).filter(RoleModel.name == "volunteer")
+        ]
+        assert hours == [2] * 5
+        assert all(r.status == "completed" for r in db.query(RegistrationModel).all())
+        job = db.get(JobModel, job_id)
+        assert job.status == "done"
+        assert '"volunteers_credited": 5' in job.result
+    finally:
+        db.close()
+
+
+def test_complete_event_query_count_is_constant(setup_database, database, admin_headers):
+    """Тест: число запросов при завершении не зависит от числа волонтёров"""
+    seed_events(database, events_count=1, volunteers_per_event=100)
+    event_id = client.get("/api/events").json()[0]["id"]
+    headers = admin_headers()
+    role_cache.clear()
+
+    with QueryCounter(database.async_engine.sync_engine) as counter:
+        response = client.post(f"/api/events/{event_id}/complete", headers=headers)
+
+    assert response.status_code == 202
+    # Роль администратора (промах кэша), смена статуса, постановка задачи
+    # и новая версия каталога
+    assert counter.count <= 4
+
+    with QueryCounter(database.async_engine.sync_engine) as counter:
+        asyncio.run(drain(database.async_session))
+
+    # Захват задачи и её чтение, часы, записи, сертификаты, отметка done,
+    # SELECT для рейтинга и пустой опрос очереди
+    assert counter.count <= 9
+
+
+def test_complete_event_not_found(setup_database, admin_headers):
+    """Тест завершения несуществующего мероприятия"""
+    response = client.post("/api/events/999/complete", headers=admin_headers())
+    assert response.status_code == 404
+
+
+def test_list_events_not_modified_without_db(setup_database, database):
+    """Тест: If-None-Match с актуальным ETag даёт 304 без запросов к БД"""
+    seed_events(database, events_count=3, volunteers_per_event=1)
+    etag = client.get("/api/events").headers["ETag"]
+
+    with QueryCounter(database.async_engine.sync_engine) as counter:
+        response = client.get("/api/events", headers={"If-None-Match": etag})
+
+    assert response.status_code == 304
+    assert response.headers["ETag"] == etag
+    assert counter.count == 0
+
+
+def test_list_events_served_from_cache(setup_database, database):
+    """Тест: повторный запрос каталога в пределах TTL не идёт в БД"""
+    seed_events(database, events_count=12, volunteers_per_event=1)
+    first = client.get("/api/events", params={"per_page": 5})
+
+    with QueryCounter(database.async_engine.sync_engine) as counter:
+        second = client.get("/api/events", params={"per_page": 5})
+
+    assert counter.count == 0
+    assert second.json() == first.json()
+    assert second.headers["X-Next-Cursor"] == first.headers["X-Next-Cursor"]
+
+
+def test_catalogue_etag_is_shared_between_processes(setup_database, database):
+    """Тест: ETag зависит только от версии каталога в БД — не от процесса и не от времени"""
+    seed_events(database, events_count=1, volunteers_per_event=1)
+    etag = client.get("/api/events").headers["ETag"]
+
+    # Другой воркер или перезапуск: о версии процесс ещё ничего не знает
+    catalogue_cache.invalidate()
+    with QueryCounter(database.async_engine.sync_engine) as counter:
+        response = client.get("/api/events", headers={"If-None-Match": etag})
+
+    assert response.status_code == 304
+    assert response.headers["ETag"] == etag
+    assert counter.count == 1
+
+
+def test_catalogue_version_rechecked_after_ttl(setup_database, monkeypatch, database):
+    """Тест: запись другого процесса видна не позже чем через TTL"""
+    seed_events(database, events_count=1, volunteers_per_event=1)
+    etag = client.get("/api/events").headers["ETag"]
+
+    async def write_in_other_process():
+        async with database.async_session() as db:
+            await bump_catalogue_version(db)
+            await db.commit()
+
+    asyncio.run(write_in_other_process())
+    # В пределах TTL процесс отвечает по известной ему версии
+    assert client.get("/api/events", headers={"If-None-Match": etag}).status_code == 304
+
+    # TTL истёк: версия перечитывается из БД, старый ETag недействителен
+    monkeypatch.setattr(catalogue_cache, "ttl_seconds", 0)
+    response = client.get("/api/events", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+
+
+def test_catalogue_etag_changes_after_write(setup_database, database, admin_headers):
+    """Тест: завершение мероприятия сбрасывает ETag и кэш каталога"""
+    seed_events(database, events_count=1, volunteers_per_event=2)
+    response = client.get("/api/events")
+    etag = response.headers["ETag"]
+    event_id = response.json()[0]["id"]
+
+    client.post(f"/api/events/{event_id}/complete", headers=admin_headers())
+    asyncio.run(drain(database.async_session))
+
+    response = client.get("/api/events", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+    assert response.json()[0]["status"] == "completed"
+
+
+def test_get_event_detail(setup_database, database):
+    """Тест карточки мероприятия и её ETag"""
+    seed_events(database, events_count=1, volunteers_per_event=3)
+    event_id = client.get("/api/events").json()[0]["id"]
+
+    response = client.get(f"/api/events/{event_id}")
+    assert response.status_code == 200
+    assert response.json()["volunteers_count"] == 3
+
+    response = client.get(
+        f"/api/events/{event_id}", headers={"If-None-Match": response.headers["ETag"]}
+    )
+    assert response.status_code == 304
+
+    assert client.get("/api/events/999").status_code == 404
+
+
+def test_import_events_json_reports_row_errors(setup_database, database, admin_headers):
+    """Тест импорта JSON: корректные строки вставлены, ошибки — по номерам строк"""
+    seed_events(database, events_count=0, volunteers_per_event=0)
+    scheduled_at = (datetime.now() + timedelta(days=7)).isoformat()
+    records = [
+        {"title": f"Субботник {i}", "ngo_id": 1, "scheduled_at": scheduled_at}
+        for i in range(3)
+    ]
+    records.insert(1, {"title": "ab", "ngo_id": 1, "scheduled_at": scheduled_at})
+    records.append({"title": "Чужое НКО", "ngo_id": 999, "scheduled_at": scheduled_at})
+
+    response = client.post("/api/events/import", json=records, headers=admin_headers())
+
+    assert response.status_code == 200
+    result = response.json()
+    assert result["created"] == 3
+    assert [e["row"] for e in result["errors"]] == [2, 5]
+    assert len(client.get("/api/events").json()) == 3
+
+
+def test_import_events_csv(setup_database, database, admin_headers):
+    """Тест импорта CSV с пустыми необязательными колонками"""
+    seed_events(database, events_count=0, volunteers_per_event=0)
+    body = (
+        "title,description,ngo_id,scheduled_at,location,max_volunteers,duration_hours\r\n"
+        "Сбор вещей,,1,2030-05-01T10:00:00,Москва,20,3\r\n"
+        "Уборка парка,Весенняя,1,2030-05-08T10:00:00,,,\r\n"
+    ).encode("utf-8")
+
+    response = client.post(
+        "/api/events/import",
+        content=body,
+        headers={**admin_headers(), "Content-Type": "text/csv"},
+    )
+
+    assert response.status_code == 200
+    assert response.json()["created"] == 2
+    events = client.get("/api/events").json()
+    assert [e["max_volunteers"] for e in events] == [20, None]
+    assert [e["duration_hours"] for e in events] == [3, 2]
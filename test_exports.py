@@ -0,0 +1,78 @@
+import csv
+import io
+import json
+from datetime import datetime, timedelta
+
+from fastapi.testclient import TestClient
+
+from app.models import EventModel, NGOModel, RegistrationModel, RoleModel, UserModel
+from main import app
+
+client = TestClient(app)
+
+
+def seed(database) -> None:
+    """Два НКО, по мероприятию в день, 10 волонтёров на каждом"""
+    db = database.session()
+    try:
+        role = RoleModel(name="volunteer")
+        ngos = [NGOModel(name="НКО «Первое»"), NGOModel(name="НКО «Второе»")]
+        db.add_all([role, *ngos])
+        db.flush()
+        volunteers = [
+            UserModel(name=f"Волонтёр {i}", email=f"v{i}@example.com", hashed_password="x", role_id=role.id)
+            for i in range(10)
+        ]
+        events = [
+            EventModel(
+                title=f"Мероприятие {i}",
+                ngo_id=ngos[i % 2].id,
+                scheduled_at=datetime(2026, 3, 1) + timedelta(days=i),
+            )
+            for i in range(6)
+        ]
+        db.add_all(volunteers + events)
+        db.flush()
+        db.add_all(
+            RegistrationModel(event_id=e.id, volunteer_id=v.id, hours_earned=3, status="completed")
+            for e in events
+            for v in volunteers
+        )
+        db.commit()
+    finally:
+        db.close()
+
+
+def test_export_csv(setup_database, database, admin_headers):
+    """Тест полной выгрузки в CSV"""
+    seed(database)
+    response = client.get("/api/exports/registrations", headers=admin_headers())
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/csv")
+    rows = list(csv.DictReader(io.StringIO(response.content.decode("utf-8-sig"))))
+    assert len(rows) == 60
+    assert rows[0]["ngo_name"] == "НКО «Первое»"
+    assert rows[0]["hours_earned"] == "3"
+
+
+def test_export_ndjson_with_filters(setup_database, database, admin_headers):
+    """Тест выгрузки NDJSON с фильтром по НКО и диапазону дат"""
+    seed(database)
+    response = client.get(
+        "/api/exports/registrations",
+        params={
+            "format": "ndjson",
+            "ngo_id": 1,
+            "date_from": "2026-03-01T00:00:00",
+            "date_to": "2026-03-04T00:00:00",
+        },
+        headers=admin_headers(),
+    )
+
+    assert response.status_code == 200
+    records = [json.loads(line) for line in response.text.splitlines()]
+    # Мероприятия НКО №1 в диапазоне: 1 и 3 марта
+    assert len(records) == 20
+    assert {r["ngo_id"] for r in records} == {1}
+    assert all(r["scheduled_at"] < "2026-03-04" for r in records)
@@ -0,0 +1,138 @@
+import asyncio
+from datetime import datetime
+
+from fastapi.testclient import TestClient
+
+from app.core.jobs import backoff_delay, drain, enqueue, job_handler, requeue_stale
+from app.models import JobModel
+from main import app
+
+client = TestClient(app)
+
+calls: list[dict] = []
+
+
+@job_handler("test_flaky")
+async def flaky_job(db, payload: dict) -> dict:
+    """Падает, пока не исчерпает payload["failures"] попыток"""
+    calls.append(payload)
+    if len(calls) <= payload["failures"]:
+        raise RuntimeError("временная ошибка")
+    return {"calls": len(calls)}
+
+
+def schedule(database, failures: int, max_attempts: int) -> int:
+    calls.clear()
+
+    async def add():
+        async with database.async_session() as db:
+            job = await enqueue(
+                db, "test_flaky", {"failures": failures}, max_attempts=max_attempts
+            )
+            await db.commit()
+            return job.id
+
+    return asyncio.run(add())
+
+
+def load_job(database, job_id: int) -> JobModel:
+    db = database.session()
+    try:
+        return db.get(JobModel, job_id)
+    finally:
+        db.close()
+
+
+def make_due(database, job_id: int) -> None:
+    """Пропустить задержку перед повтором"""
+    db = database.session()
+    try:
+        db.get(JobModel, job_id).run_after = datetime.utcnow()
+        db.commit()
+    finally:
+        db.close()
+
+
+def test_backoff_delay_grows_and_is_capped():
+    """Тест экспоненциальной задержки между попытками"""
+    assert [backoff_delay(n) for n in (1, 2, 3)] == [2, 4, 8]
+    assert backoff_delay(50) == 300
+
+
+def test_failed_attempt_is_retried_after_backoff(setup_database, database):
+    """Тест: ошибка возвращает задачу в очередь с задержкой, повтор доводит её до done"""
+    job_id = schedule(database, failures=1, max_attempts=3)
+
+    assert asyncio.run(drain(database.async_session)) == 1
+    job = load_job(database, job_id)
+    assert job.status == "queued"
+    assert job.attempts == 1
+    assert "временная ошибка" in job.last_error
+    assert job.run_after > datetime.utcnow()
+
+    # Задержка ещё не истекла — выполнять нечего
+    assert asyncio.run(drain(database.async_session)) == 0
+
+    make_due(database, job_id)
+    assert asyncio.run(drain(database.async_session)) == 1
+    job = load_job(database, job_id)
+    assert job.status == "done"
+    assert job.attempts == 2
+    assert job.result == '{"calls": 2}'
+
+
+def test_job_fails_after_max_attempts_and_can_be_retried(setup_database, database, admin_headers):
+    """Тест: после max_attempts задача failed, повтор через API возвращает её в очередь"""
+    job_id = schedule(database, failures=2, max_attempts=2)
+
+    asyncio.run(drain(database.async_session))
+    make_due(database, job_id)
+    asyncio.run(drain(database.async_session))
+    assert load_job(database, job_id).status == "failed"
+
+    failed = client.get("/api/jobs/", params={"status": "failed"}, headers=admin_headers())
+    assert [j["id"] for j in failed.json()] == [job_id]
+
+    response = client.post(f"/api/jobs/{job_id}/retry", headers=admin_headers())
+    assert response.status_code == 200
+    assert response.json()["status"] == "queued"
+    assert response.json()["attempts"] == 0
+
+    assert asyncio.run(drain(database.async_session)) == 1
+    assert client.get(f"/api/jobs/{job_id}", headers=admin_headers()).json()["status"] == "done"
+    assert client.post(f"/api/jobs/{job_id}/retry", headers=admin_headers()).status_code == 409
+
+
+def test_stale_running_job_is_requeued(setup_database, database):
+    """Тест: задача упавшего воркера возвращается в очередь"""
+    job_id = schedule(database, failures=0, max_attempts=3)
+    db = database.session()
+    try:
+        job = db.get(JobModel, job_id)
+        job.status, job.locked_by, job.locked_at = "running", "dead:1", datetime(2000, 1, 1)
+        db.commit()
+    finally:
+        db.close()
+
+    assert asyncio.run(requeue_stale(database.async_session, timeout=60)) == 1
+    assert asyncio.run(drain(database.async_session)) == 1
+    assert load_job(database, job_id).status == "done"
+
+
+def test_stale_job_fails_after_max_attempts(setup_database, database):
+    """Тест: задача, раз за разом роняющая воркер, не возвращается в очередь вечно"""
+    job_id = schedule(database, failures=0, max_attempts=2)
+    db = database.session()
+    try:
+        job = db.get(JobModel, job_id)
+        job.status, job.locked_by, job.locked_at = "running", "dead:1", datetime(2000, 1, 1)
+        job.attempts = 2
+        db.commit()
+    finally:
+        db.close()
+
+    assert asyncio.run(requeue_stale(database.async_session, timeout=60)) == 0
+    job = load_job(database, job_id)
+    assert job.status == "failed"
+    assert job.finished_at is not None
+    assert asyncio.run(drain(database.async_session)) == 0
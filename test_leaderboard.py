@@ -0,0 +1,95 @@
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core.jobs import drain
+from app.core.leaderboard import Leaderboard, LeaderboardMember, leaderboard, rebuild_leaderboard
+from app.models import EventModel, NGOModel, RegistrationModel, RoleModel, UserModel
+from main import app
+
+client = TestClient(app)
+
+
+@pytest.fixture(scope="function")
+def setup_database(setup_database):
+    """Рейтинг в памяти процесса пуст к началу теста"""
+    leaderboard.replace([])
+
+
+def test_ranks_with_ties_and_cities():
+    """Тест: места с учётом равных рейтингов, общий и городской зачёт"""
+    board = Leaderboard()
+    board.replace([
+        LeaderboardMember(1, "Анна", "Москва", 10.0),
+        LeaderboardMember(2, "Борис", "Казань", 30.0),
+        LeaderboardMember(3, "Вера", "Москва", 10.0),
+        LeaderboardMember(4, "Глеб", None, 0.0),
+    ])
+
+    assert [m.user_id for _, m in board.top(10)] == [2, 1, 3]
+    assert [rank for rank, _ in board.top(10)] == [1, 2, 2]
+    assert board.rank(3) == 2
+    assert board.rank(3, "Москва") == 1
+    assert board.rank(4) is None
+
+    board.update(LeaderboardMember(3, "Вера", "Москва", 40.0))
+    assert board.rank(3) == 1
+    assert board.rank(1, "Москва") == 2
+    assert board.size() == 3
+    assert board.size("Казань") == 1
+
+
+def test_updates_during_rebuild_are_not_lost():
+    """Тест: обновление во время перестройки применяется поверх снимка БД"""
+    board = Leaderboard()
+    board.begin_rebuild()
+    board.update(LeaderboardMember(1, "Анна", None, 5.0))
+    board.replace([LeaderboardMember(2, "Борис", None, 3.0)])
+
+    assert [m.user_id for _, m in board.top(10)] == [1, 2]
+
+
+def test_complete_event_updates_leaderboard(setup_database, database, admin_headers, token_headers):
+    """Тест: задача начисления меняет рейтинг без перестройки"""
+    db = database.session()
+    try:
+        role = RoleModel(name="volunteer")
+        ngo = NGOModel(name="НКО «Тест»")
+        db.add_all([role, ngo])
+        db.flush()
+        veteran = UserModel(
+            name="Ветеран", email="veteran@example.com", hashed_password="x",
+            role_id=role.id, city="Москва", total_hours=5, rating=5.0,
+        )
+        newcomer = UserModel(
+            name="Новичок", email="newcomer@example.com", hashed_password="x",
+            role_id=role.id, city="Москва",
+        )
+        event = EventModel(
+            title="Субботник", ngo_id=ngo.id, duration_hours=8,
+            scheduled_at=datetime.now() + timedelta(days=1),
+        )
+        db.add_all([veteran, newcomer, event])
+        db.flush()
+        db.add(RegistrationModel(event_id=event.id, volunteer_id=newcomer.id))
+        db.commit()
+        veteran_id, newcomer_id, event_id = veteran.id, newcomer.id, event.id
+    finally:
+        db.close()
+
+    asyncio.run(rebuild_leaderboard(database.async_session))
+    assert client.get("/api/leaderboard/me", headers=token_headers(newcomer_id)).status_code == 404
+
+    response = client.post(f"/api/events/{event_id}/complete", headers=admin_headers())
+    assert response.status_code == 202
+    asyncio.run(drain(database.async_session))
+
+    top = client.get("/api/leaderboard", params={"city": "Москва"}).json()
+    assert [entry["user_id"] for entry in top] == [newcomer_id, veteran_id]
+
+    me = client.get("/api/leaderboard/me", headers=token_headers(newcomer_id)).json()
+    assert me["rank"] == 1
+    assert me["city_rank"] == 1
+    assert me["total"] == 2
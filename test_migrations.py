@@ -0,0 +1,91 @@
+import asyncio
+import os
+import re
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import create_engine, text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.core.database import SCHEMA_REVISION, Base, alembic_version
+from app.models import EventModel, NGOModel
+
+# Вариант на init_db.sql запускается, только если задан TEST_MYSQL_URL, например
+# mysql+aiomysql://root:@localhost:3306/rukapomoshchi_test
+MYSQL_URL = os.getenv("TEST_MYSQL_URL")
+INIT_DB_SQL = Path(__file__).with_name("init_db.sql")
+
+
+def upgrade_head(url: str) -> None:
+    config = Config("alembic.ini")
+    config.set_main_option("sqlalchemy.url", url)
+    command.upgrade(config, "head")
+
+
+def test_upgrade_fills_existing_empty_search_index(tmp_path):
+    """Тест: таблица events_search уже есть, но пуста — миграция её заполняет"""
+    url = f"sqlite:///{tmp_path / 'migrate.db'}"
+    engine = create_engine(url)
+    # Как после init_db.sql: вся схема и пустой индекс, ревизии нет
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        conn.execute(NGOModel.__table__.insert().values(id=1, name="НКО"))
+        conn.execute(EventModel.__table__.insert(), [
+            {"id": 1, "title": "Субботник в парке", "description": "Уборка листьев",
+             "ngo_id": 1, "scheduled_at": datetime(2030, 1, 1)},
+            {"id": 2, "title": "Помощь приюту", "description": "Выгул собак",
+             "ngo_id": 1, "scheduled_at": datetime(2030, 1, 2)},
+        ])
+        assert conn.execute(text("SELECT count(*) FROM events_search")).scalar() == 0
+
+    upgrade_head(url)
+
+    with engine.connect() as conn:
+        assert conn.execute(alembic_version.select()).scalar() == SCHEMA_REVISION
+        assert conn.execute(text("SELECT version FROM catalogue_version")).scalar() == 0
+        rows = conn.execute(text("SELECT rowid FROM events_search ORDER BY rowid")).scalars()
+        assert list(rows) == [1, 2]
+    engine.dispose()
+
+
+@pytest.mark.skipif(not MYSQL_URL, reason="TEST_MYSQL_URL не задан")
+def test_upgrade_from_init_db_sql_indexes_seed_events():
+    """Тест: БД из init_db.sql после upgrade head находит начальные мероприятия поиском"""
+    # Без комментариев и CREATE DATABASE/USE — схема создаётся в тестовой базе
+    script = re.sub(
+        r"^\s*(--|CREATE DATABASE|USE ).*$", "", INIT_DB_SQL.read_text(encoding="utf-8"), flags=re.M
+    )
+    statements = [s.strip() for s in script.split(";") if s.strip()]
+
+    async def run(sql: list[str]):
+        engine = create_async_engine(MYSQL_URL)
+        try:
+            async with engine.begin() as conn:
+                results = [await conn.execute(text(s)) for s in sql]
+                return [r.scalar() if r.returns_rows else None for r in results]
+        finally:
+            await engine.dispose()
+
+    async def drop_all():
+        engine = create_async_engine(MYSQL_URL)
+        try:
+            async with engine.begin() as conn:
+                await conn.run_sync(Base.metadata.drop_all)
+                await conn.execute(text("DROP TABLE IF EXISTS alembic_version"))
+        finally:
+            await engine.dispose()
+
+    asyncio.run(run(statements))
+    try:
+        upgrade_head(MYSQL_URL)
+        events, indexed = asyncio.run(run([
+            "SELECT count(*) FROM events",
+            "SELECT count(*) FROM events_search",
+        ]))
+        assert events > 0
+        assert indexed == events
+    finally:
+        asyncio.run(drop_all())
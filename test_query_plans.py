@@ -0,0 +1,181 @@
+import asyncio
+import re
+from datetime import datetime, timedelta
+
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+from app.core.database import Base
+from app.core.jobs import drain
+from app.models import (
+    CertificateModel,
+    EventModel,
+    NGOModel,
+    RegistrationModel,
+    RoleModel,
+    UserModel,
+)
+from app.services.auth import AuthService
+from main import app
+
+client = TestClient(app)
+
+# Обход таблицы целиком допустим только по индексу сортировки и с LIMIT
+# (страница каталога без селективного фильтра)
+LIMIT = re.compile(r"\bLIMIT\b", re.IGNORECASE)
+
+
+def seed(database) -> dict:
+    """Небольшой набор данных: мероприятия, волонтёры, записи, сертификат"""
+    db = database.session()
+    try:
+        role = RoleModel(name="volunteer")
+        ngo = NGOModel(name="НКО «Тест»")
+        db.add_all([role, ngo])
+        db.flush()
+        volunteers = [
+            UserModel(
+                name=f"Волонтёр {i}",
+                email=f"volunteer{i}@example.com",
+                hashed_password="x",
+                role_id=role.id,
+                city="Москва",
+            )
+            for i in range(5)
+        ]
+        events = [
+            EventModel(
+                title=f"Мероприятие {i}",
+                ngo_id=ngo.id,
+                scheduled_at=datetime.now() + timedelta(days=i),
+                location="Москва, ВДНХ",
+                max_volunteers=10,
+            )
+            for i in range(5)
+        ]
+        db.add_all(volunteers + events)
+        db.flush()
+        db.add_all(
+            RegistrationModel(event_id=e.id, volunteer_id=v.id)
+            for e in events[:3]
+            for v in volunteers[:3]
+        )
+        db.add(CertificateModel(volunteer_id=volunteers[0].id, text="Сертификат"))
+        db.commit()
+        return {
+            "event_ids": [e.id for e in events],
+            "volunteer_ids": [v.id for v in volunteers],
+        }
+    finally:
+        db.close()
+
+
+class StatementRecorder:
+    """Собирает SQL и параметры, отправленные приложением в БД"""
+
+    def __init__(self, bind):
+        self.bind = bind
+        self.statements: list[tuple[str, tuple]] = []
+
+    def _on_execute(self, conn, cursor, statement, parameters, context, executemany):
+        if not executemany:
+            self.statements.append((statement, tuple(parameters)))
+
+    def __enter__(self):
+        event.listen(self.bind, "before_cursor_execute", self._on_execute)
+        return self
+
+    def __exit__(self, *exc):
+        event.remove(self.bind, "before_cursor_execute", self._on_execute)
+
+
+def run_hot_paths(database, token_headers, ids: dict) -> None:
+    """Горячие запросы API: каталог, карточка, запись, завершение, профиль"""
+    event_id, other_event_id = ids["event_ids"][0], ids["event_ids"][3]
+    volunteer_id, new_volunteer_id = ids["volunteer_ids"][0], ids["volunteer_ids"][4]
+    admin = token_headers(volunteer_id, "admin")
+
+    page = client.get("/api/events", params={"per_page": 2})
+    client.get("/api/events", params={"per_page": 2, "cursor": page.headers["X-Next-Cursor"]})
+    client.get("/api/events", params={"status": "active"})
+    client.get("/api/events", params={"ngo_id": 1})
+    client.get("/api/events", params={"location": "Москва"})
+    client.get("/api/events", params={
+        "date_from": datetime.now().isoformat(),
+        "date_to": (datetime.now() + timedelta(days=2)).isoformat(),
+    })
+    client.get(f"/api/events/{event_id}")
+    client.get("/api/events/search", params={"q": "мероприятия в Москве"})
+
+    volunteer = token_headers(new_volunteer_id, "volunteer")
+    client.post(f"/api/events/{other_event_id}/signup", headers=volunteer)
+    # Повтор — путь ошибки с выяснением причины
+    client.post(f"/api/events/{other_event_id}/signup", headers=volunteer)
+
+    client.post(f"/api/events/{event_id}/complete", headers=admin)
+    # Начисление часов и опрос очереди — тоже горячий путь
+    asyncio.run(drain(database.async_session))
+    client.post(f"/api/events/certificates/{volunteer_id}", headers=admin)
+
+    async def load_profile():
+        async with database.async_session() as db:
+            await AuthService(db).get_me(volunteer_id)
+
+    asyncio.run(load_profile())
+
+
+def explain(database, statement: str, parameters: tuple) -> list[str]:
+    with database.engine.connect() as conn:
+        rows = conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters).all()
+    return [row[-1] for row in rows]
+
+
+def is_full_scan(step: str, statement: str) -> bool:
+    if not step.startswith("SCAN"):
+        return False
+    if "VIRTUAL TABLE INDEX" in step:
+        # FTS5: ":M" — поиск по MATCH, без него — перебор всего индекса
+        return ":M" not in step
+    if step.split()[1] not in Base.metadata.tables:
+        # Результат подзапроса; его собственные шаги проверяются отдельно
+        return False
+    return "USING" not in step or not LIMIT.search(statement)
+
+
+def test_hot_queries_use_indexes(setup_database, database, token_headers):
+    """Тест: ни один горячий запрос API не читает таблицу целиком"""
+    ids = seed(database)
+
+    with StatementRecorder(database.async_engine.sync_engine) as recorder:
+        run_hot_paths(database, token_headers, ids)
+
+    assert recorder.statements
+    offenders = []
+    for statement, parameters in recorder.statements:
+        plan = explain(database, statement, parameters)
+        if any(is_full_scan(step, statement) for step in plan):
+            offenders.append((statement, plan))
+
+    assert not offenders, "\n\n".join(
+        f"{statement}\n  " + "\n  ".join(plan) for statement, plan in offenders
+    )
+
+
+def test_catalogue_plans(setup_database, database, token_headers):
+    """Тест: каталог сортируется по индексу, а страница по курсору ищется диапазоном"""
+    ids = seed(database)
+
+    with StatementRecorder(database.async_engine.sync_engine) as recorder:
+        run_hot_paths(database, token_headers, ids)
+
+    catalogue = [
+        (statement, parameters)
+        for statement, parameters in recorder.statements
+        if statement.lstrip().upper().startswith("SELECT") and "ORDER BY events.scheduled_at" in statement
+    ]
+    assert catalogue
+    for statement, parameters in catalogue:
+        plan = explain(database, statement, parameters)
+        assert not any("TEMP B-TREE" in step for step in plan), "\n".join([statement, *plan])
+        if "events.scheduled_at >=" in statement:
+            assert plan[0].startswith("SEARCH events"), "\n".join([statement, *plan])
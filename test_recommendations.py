@@ -0,0 +1,179 @@
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core.jobs import drain
+from app.models import (
+    EventModel,
+    NGOModel,
+    RecommendationModel,
+    RecommendationRunModel,
+    RegistrationModel,
+    RoleModel,
+    UserModel,
+)
+from app.services.auth import AuthService
+from app.services.recommendations import RecommendationService
+from main import app
+
+client = TestClient(app)
+
+
+def seed_catalogue(database) -> dict:
+    """
+    Три НКО: волонтёры 1–4 ходят и к «Парку», и к «Приюту»,
+    волонтёр 5 — только к «Парку». «Музей» ни с кем не пересекается.
+    """
+    db = database.session()
+    try:
+        role = RoleModel(name="volunteer")
+        park, shelter, museum = (NGOModel(name=n) for n in ("Парк", "Приют", "Музей"))
+        db.add_all([role, park, shelter, museum])
+        db.flush()
+        users = [
+            UserModel(name=f"Волонтёр {i}", email=f"v{i}@example.com", hashed_password="x", role_id=role.id)
+            for i in range(1, 7)
+        ]
+        db.add_all(users)
+        db.flush()
+
+        def event(ngo, days, **kwargs):
+            ev = EventModel(
+                title=f"{ngo.name} {days}", ngo_id=ngo.id,
+                scheduled_at=datetime.now() + timedelta(days=days), **kwargs,
+            )
+            db.add(ev)
+            return ev
+
+        past_park = event(park, -10, status="completed")
+        past_shelter = event(shelter, -5, status="completed")
+        next_park = event(park, 3)
+        next_shelter = event(shelter, 5)
+        next_museum = event(museum, 7)
+        full_shelter = event(shelter, 9, max_volunteers=1, seats_taken=1)
+        db.flush()
+
+        for user in users[:4]:
+            db.add(RegistrationModel(event_id=past_park.id, volunteer_id=user.id))
+            db.add(RegistrationModel(event_id=past_shelter.id, volunteer_id=user.id))
+        db.add(RegistrationModel(event_id=past_park.id, volunteer_id=users[4].id))
+        db.add(RegistrationModel(event_id=next_park.id, volunteer_id=users[4].id))
+        db.commit()
+        return {
+            "users": [u.id for u in users],
+            "next_park": next_park.id,
+            "next_shelter": next_shelter.id,
+            "next_museum": next_museum.id,
+            "full_shelter": full_shelter.id,
+        }
+    finally:
+        db.close()
+
+
+async def recompute(database, full: bool = False) -> dict:
+    async with database.async_session() as db:
+        result = await RecommendationService(db).recompute(full=full)
+        await db.commit()
+        return result
+
+
+def recommended(database, user_id: int) -> list[int]:
+    db = database.session()
+    try:
+        return [
+            r.event_id for r in
+            db.query(RecommendationModel)
+            .filter(RecommendationModel.user_id == user_id)
+            .order_by(RecommendationModel.rank)
+        ]
+    finally:
+        db.close()
+
+
+def test_top_k_sorted_descending():
+    """Тест выбора k лучших по строкам"""
+    import numpy as np
+
+    scores = np.array([[0.1, 0.9, 0.5, 0.7], [3.0, 1.0, 2.0, 0.0]], dtype=np.float32)
+    best, values = RecommendationService.top_k(scores, 2)
+    assert best.tolist() == [[1, 3], [0, 2]]
+    assert values[0].tolist() == pytest.approx([0.9, 0.7])
+
+
+def test_cooccurring_ngo_ranked_first(setup_database, database):
+    """Тест: мероприятие НКО, с которым пересекаются волонтёры, выше прочих"""
+    data = seed_catalogue(database)
+    asyncio.run(recompute(database))
+
+    fifth = recommended(database, data["users"][4])
+    # Записанное мероприятие и мероприятие без мест не рекомендуются
+    assert data["next_park"] not in fifth
+    assert data["full_shelter"] not in fifth
+    assert fifth == [data["next_shelter"], data["next_museum"]]
+
+
+def test_incremental_recompute_touches_only_changed_users(setup_database, database):
+    """Тест: повторный пересчёт считает только волонтёров с новыми записями"""
+    data = seed_catalogue(database)
+    assert asyncio.run(recompute(database))["users_updated"] == 5
+    assert asyncio.run(recompute(database))["users_updated"] == 0
+
+    db = database.session()
+    try:
+        db.add(RegistrationModel(event_id=data["next_shelter"], volunteer_id=data["users"][5]))
+        db.commit()
+    finally:
+        db.close()
+
+    assert asyncio.run(recompute(database))["users_updated"] == 1
+    assert recommended(database, data["users"][5])[0] == data["next_park"]
+    assert asyncio.run(recompute(database, full=True))["users_updated"] == 6
+
+
+def test_recompute_commits_each_batch_and_skips_idle_runs(setup_database, database, monkeypatch):
+    """Тест: каждая порция волонтёров — своя транзакция; пересчёт без новых записей ничего не пишет"""
+    from sqlalchemy import event
+    from app.services import recommendations
+
+    seed_catalogue(database)
+    monkeypatch.setattr(recommendations, "USER_BATCH_SIZE", 2)
+    commits = []
+
+    async def run() -> dict:
+        async with database.async_session() as db:
+            event.listen(db.sync_session, "after_commit", lambda session: commits.append(session))
+            result = await RecommendationService(db).recompute()
+            await db.commit()
+            return result
+
+    assert asyncio.run(run())["users_updated"] == 5
+    # Три порции и итоговый коммит с водяным знаком
+    assert len(commits) == 4
+
+    assert asyncio.run(recompute(database))["users_updated"] == 0
+    db = database.session()
+    try:
+        assert db.query(RecommendationRunModel).count() == 1
+    finally:
+        db.close()
+
+
+def test_recommendations_endpoint(setup_database, database, admin_headers):
+    """Тест выдачи рекомендаций и запасного списка для новичка"""
+    data = seed_catalogue(database)
+    response = client.post("/api/recommendations/recompute", headers=admin_headers())
+    assert response.status_code == 202
+    assert asyncio.run(drain(database.async_session)) == 1
+
+    token = AuthService.create_access_token({"user_id": data["users"][4], "role": "volunteer"})
+    response = client.get("/api/recommendations/", headers={"Authorization": f"Bearer {token}"})
+    assert response.status_code == 200
+    assert [e["id"] for e in response.json()] == [data["next_shelter"], data["next_museum"]]
+
+    # У волонтёра без записей — востребованные будущие мероприятия
+    token = AuthService.create_access_token({"user_id": data["users"][5], "role": "volunteer"})
+    response = client.get("/api/recommendations/", headers={"Authorization": f"Bearer {token}"})
+    assert response.status_code == 200
+    assert len(response.json()) == 4
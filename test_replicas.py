@@ -0,0 +1,94 @@
+import asyncio
+
+import pytest
+from sqlalchemy import create_engine, select
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.core.database import Base
+from app.core.replicas import ReplicaSet
+from app.models import RoleModel
+
+# Две SQLite-базы вместо primary и реплики: данные в них специально разные,
+# чтобы по ответу было видно, куда ушёл запрос; обе во временном каталоге теста
+
+
+def _async_url(url: str) -> str:
+    return url.replace("sqlite://", "sqlite+aiosqlite://", 1)
+
+
+@pytest.fixture(scope="function")
+def databases(tmp_path):
+    """Создание primary и реплики с разными ролями; возвращает их URL"""
+    urls, engines = {}, {}
+    for name in ("primary", "replica"):
+        urls[name] = f"sqlite:///{tmp_path / name}.db"
+        engine = create_engine(urls[name])
+        Base.metadata.create_all(bind=engine)
+        with engine.begin() as conn:
+            conn.execute(RoleModel.__table__.insert().values(name=name))
+        engines[name] = engine
+    yield urls
+    for engine in engines.values():
+        Base.metadata.drop_all(bind=engine)
+        engine.dispose()
+
+
+async def _role_names(db) -> list[str]:
+    return list((await db.execute(select(RoleModel.name).order_by(RoleModel.id))).scalars())
+
+
+def test_reads_go_to_replica(databases):
+    """Тест: чтение без записи обслуживает реплика"""
+
+    async def scenario():
+        primary = create_async_engine(_async_url(databases["primary"]))
+        replicas = ReplicaSet([create_async_engine(_async_url(databases["replica"]))])
+        async with replicas.session(primary) as db:
+            names = await _role_names(db)
+        await replicas.dispose()
+        await primary.dispose()
+        return names
+
+    assert asyncio.run(scenario()) == ["replica"]
+
+
+def test_read_after_write_stays_on_primary(databases):
+    """Тест: после записи в той же сессии чтение идёт на primary"""
+
+    async def scenario():
+        primary = create_async_engine(_async_url(databases["primary"]))
+        replicas = ReplicaSet([create_async_engine(_async_url(databases["replica"]))])
+        async with replicas.session(primary) as db:
+            db.add(RoleModel(name="volunteer"))
+            await db.flush()
+            names = await _role_names(db)
+            await db.commit()
+        await replicas.dispose()
+        await primary.dispose()
+        return names
+
+    assert asyncio.run(scenario()) == ["primary", "volunteer"]
+
+
+def test_round_robin_and_health_check(databases):
+    """Тест: недоступная реплика выводится из ротации, без реплик — primary"""
+
+    async def scenario():
+        primary = create_async_engine(_async_url(databases["primary"]))
+        healthy = create_async_engine(_async_url(databases["replica"]))
+        broken = create_async_engine("sqlite+aiosqlite:////nonexistent/dir/replica.db")
+        replicas = ReplicaSet([healthy, broken])
+
+        picked_before = {replicas.pick() for _ in range(4)}
+        assert await replicas.check() == [True, False]
+        picked_after = {replicas.pick() for _ in range(4)}
+
+        replicas.mark_unhealthy(healthy)
+        async with replicas.session(primary) as db:
+            names = await _role_names(db)
+
+        await replicas.dispose()
+        await primary.dispose()
+        return picked_before == {healthy, broken}, picked_after == {healthy}, names
+
+    assert asyncio.run(scenario()) == (True, True, ["primary"])
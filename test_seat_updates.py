@@ -0,0 +1,190 @@
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi import HTTPException
+from fastapi.testclient import TestClient
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from starlette.requests import Request
+
+from app.api.events import complete_event, live_seats, signup_for_event
+from app.core.database import Base
+from app.core.seat_updates import SeatBroadcaster, seat_broadcaster
+from app.models import EventModel, NGOModel, RoleModel, UserModel
+from main import app
+
+
+def run_scenario(tmp_path, scenario, **engine_kwargs):
+    """Движок создаётся внутри цикла событий теста"""
+
+    async def main():
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'seats.db'}", **engine_kwargs)
+        try:
+            async with engine.begin() as conn:
+                await conn.run_sync(Base.metadata.create_all)
+            session_factory = async_sessionmaker(
+                bind=engine, autoflush=False, expire_on_commit=False
+            )
+            return await scenario(session_factory)
+        finally:
+            await engine.dispose()
+
+    return asyncio.run(main())
+
+
+async def seed(session_factory, volunteers: int, max_volunteers: int):
+    async with session_factory() as db:
+        role = RoleModel(name="volunteer")
+        ngo = NGOModel(name="НКО «Места»")
+        db.add_all([role, ngo])
+        await db.flush()
+        event = EventModel(
+            title="Популярное мероприятие",
+            ngo_id=ngo.id,
+            scheduled_at=datetime.now() + timedelta(days=1),
+            max_volunteers=max_volunteers,
+        )
+        users = [
+            UserModel(
+                name=f"Волонтёр {i}",
+                email=f"seat{i}@example.com",
+                hashed_password="x",
+                role_id=role.id,
+            )
+            for i in range(volunteers)
+        ]
+        db.add(event)
+        db.add_all(users)
+        await db.commit()
+        return event.id, [u.id for u in users]
+
+
+async def signup(session_factory, event_id, user_id):
+    async with session_factory() as db:
+        try:
+            await signup_for_event(event_id, user_id, db)
+        except HTTPException:
+            pass
+
+
+def test_signups_are_coalesced_into_one_update(tmp_path):
+    """Тест: всплеск записей даёт подписчику одно обновление с последним состоянием"""
+
+    async def scenario(session_factory):
+        event_id, user_ids = await seed(session_factory, volunteers=5, max_volunteers=3)
+        subscription = seat_broadcaster.subscribe([event_id])
+        try:
+            for user_id in user_ids:
+                await signup(session_factory, event_id, user_id)
+            flushed = await seat_broadcaster.flush(session_factory)
+            first = await subscription.next_batch(timeout=1)
+
+            async with session_factory() as db:
+                await complete_event(event_id, db, True)
+            await seat_broadcaster.flush(session_factory)
+            second = await subscription.next_batch(timeout=1)
+        finally:
+            seat_broadcaster.unsubscribe(subscription)
+        return flushed, first, second
+
+    flushed, first, second = run_scenario(tmp_path, scenario)
+
+    assert flushed == 1
+    assert first == [{
+        "id": first[0]["id"],
+        "status": "active",
+        "max_volunteers": 3,
+        "seats_taken": 3,
+        "seats_left": 0,
+    }]
+    assert second[0]["status"] == "completed"
+
+
+def test_publish_without_subscribers_is_ignored():
+    """Тест: изменения мероприятий без подписчиков не порождают запросов"""
+    broadcaster = SeatBroadcaster()
+    broadcaster.publish(1)
+
+    async def flush():
+        # Фабрика не должна вызываться — читать нечего
+        return await broadcaster.flush(session_factory=None)
+
+    assert asyncio.run(flush()) == 0
+
+
+def test_updates_are_rate_limited_per_window(tmp_path):
+    """Тест: частые изменения рассылаются не чаще max_rate раз в секунду"""
+
+    async def scenario(session_factory):
+        event_id, _ = await seed(session_factory, volunteers=0, max_volunteers=10)
+        broadcaster = SeatBroadcaster()
+        flushes = []
+        original_flush = broadcaster.flush
+
+        async def counting_flush(factory):
+            flushes.append(await original_flush(factory))
+            return flushes[-1]
+
+        broadcaster.flush = counting_flush
+        subscription = broadcaster.subscribe([event_id])
+        task = asyncio.create_task(broadcaster.run(session_factory, max_rate=4))
+        try:
+            for _ in range(20):
+                broadcaster.publish(event_id)
+                await asyncio.sleep(0.02)
+            await asyncio.sleep(0.3)
+        finally:
+            task.cancel()
+        return flushes, await subscription.next_batch(timeout=1)
+
+    flushes, batch = run_scenario(tmp_path, scenario)
+
+    # 20 изменений за ~0.4 с при окне 0.25 с — два-три обновления
+    assert 1 < len(flushes) <= 3
+    assert [state["seats_left"] for state in batch] == [10]
+
+
+def test_signup_while_seat_stream_is_open(tmp_path):
+    """Тест: открытый SSE-поток не занимает единственное соединение пула записи"""
+
+    async def scenario(session_factory):
+        event_id, user_ids = await seed(session_factory, volunteers=1, max_volunteers=3)
+        request = Request({
+            "type": "http",
+            "method": "GET",
+            "path": "/api/events/live",
+            "headers": [],
+            "query_string": b"",
+        })
+        response = await live_seats(request, lambda: session_factory(), ids=str(event_id))
+        stream = response.body_iterator
+        try:
+            # retry и снимок — поток открыт
+            chunks = [await stream.__anext__(), await stream.__anext__()]
+            async with session_factory() as db:
+                await signup_for_event(event_id, user_ids[0], db)
+        finally:
+            await stream.aclose()
+        return chunks
+
+    # Как SQLite-пул записи: одно соединение, без переполнения
+    chunks = run_scenario(
+        tmp_path,
+        scenario,
+        poolclass=AsyncAdaptedQueuePool,
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=2,
+    )
+
+    assert chunks[1].startswith("event: seats")
+    assert '"seats_taken": 0' in chunks[1]
+
+
+@pytest.mark.parametrize("ids", ["", "1,abc"])
+def test_live_seats_rejects_bad_ids(ids):
+    """Тест проверки списка мероприятий для потока"""
+    response = TestClient(app).get("/api/events/live", params={"ids": ids})
+    assert response.status_code == 400
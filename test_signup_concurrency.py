@@ -0,0 +1,160 @@
+import asyncio
+import os
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.api.events import signup_for_event
+from app.core.database import Base
+from app.core.sqlite_mode import BASE_PRAGMAS, install_pragmas
+from app.models import EventModel, NGOModel, RegistrationModel, RoleModel, UserModel
+
+# Нагрузочный тест записи на одно мероприятие.
+# MySQL-вариант запускается, только если задан TEST_MYSQL_URL, например
+# mysql+aiomysql://root:@localhost:3306/rukapomoshchi_test
+MYSQL_URL = os.getenv("TEST_MYSQL_URL")
+
+VOLUNTEERS = 200
+CAPACITY = 30
+CONNECTIONS = 32
+
+
+@pytest.fixture(params=["sqlite", "mysql"])
+def engine_factory(request, tmp_path):
+    """Движок создаётся внутри цикла событий теста, поэтому отдаём фабрику"""
+    if request.param == "sqlite":
+        url = f"sqlite+aiosqlite:///{tmp_path / 'signup.db'}"
+
+        def sqlite_engine():
+            # Как в приложении: внешние ключи SQLite проверяет только с PRAGMA
+            engine = create_async_engine(url, connect_args={"timeout": 30})
+            install_pragmas(engine.sync_engine, BASE_PRAGMAS)
+            return engine
+
+        return sqlite_engine
+    if not MYSQL_URL:
+        pytest.skip("TEST_MYSQL_URL не задан")
+    return lambda: create_async_engine(MYSQL_URL, pool_size=CONNECTIONS, max_overflow=0)
+
+
+async def run_scenario(engine_factory, scenario):
+    engine = engine_factory()
+    try:
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        session_factory = async_sessionmaker(
+            bind=engine, autoflush=False, expire_on_commit=False
+        )
+        return await scenario(session_factory)
+    finally:
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.drop_all)
+        await engine.dispose()
+
+
+async def seed(session_factory, max_volunteers):
+    async with session_factory() as db:
+        role = RoleModel(name="volunteer")
+        ngo = NGOModel(name="НКО «Нагрузка»")
+        db.add_all([role, ngo])
+        await db.flush()
+        event = EventModel(
+            title="Популярное мероприятие",
+            ngo_id=ngo.id,
+            scheduled_at=datetime.now() + timedelta(days=1),
+            max_volunteers=max_volunteers,
+        )
+        users = [
+            UserModel(
+                name=f"Волонтёр {i}",
+                email=f"rush{i}@example.com",
+                hashed_password="x",
+                role_id=role.id,
+            )
+            for i in range(VOLUNTEERS)
+        ]
+        db.add(event)
+        db.add_all(users)
+        await db.commit()
+        return event.id, [u.id for u in users]
+
+
+async def signup(session_factory, event_id, user_id):
+    async with session_factory() as db:
+        try:
+            await signup_for_event(event_id=event_id, user_id=user_id, db=db)
+            return 200
+        except HTTPException as ex:
+            return ex.status_code
+
+
+async def rush(session_factory, event_id, user_ids):
+    return await asyncio.gather(
+        *(signup(session_factory, event_id, uid) for uid in user_ids)
+    )
+
+
+async def seats_and_registrations(session_factory, event_id):
+    async with session_factory() as db:
+        registrations = await db.scalar(
+            select(func.count(RegistrationModel.id)).where(
+                RegistrationModel.event_id == event_id
+            )
+        )
+        seats_taken = await db.scalar(
+            select(EventModel.seats_taken).where(EventModel.id == event_id)
+        )
+    return seats_taken, registrations
+
+
+def test_signup_rush_never_overbooks(engine_factory):
+    """Тест: при массовой записи занято ровно max_volunteers мест"""
+
+    async def scenario(session_factory):
+        event_id, user_ids = await seed(session_factory, max_volunteers=CAPACITY)
+        statuses = await rush(session_factory, event_id, user_ids)
+        return statuses, await seats_and_registrations(session_factory, event_id)
+
+    statuses, (seats_taken, registrations) = asyncio.run(
+        run_scenario(engine_factory, scenario)
+    )
+
+    assert statuses.count(200) == CAPACITY
+    assert statuses.count(409) == VOLUNTEERS - CAPACITY
+    assert registrations == seats_taken == CAPACITY
+
+
+def test_signup_rush_same_volunteer_once(engine_factory):
+    """Тест: параллельные повторные записи одного волонтёра создают одну запись"""
+
+    async def scenario(session_factory):
+        event_id, user_ids = await seed(session_factory, max_volunteers=None)
+        statuses = await rush(session_factory, event_id, [user_ids[0]] * 50)
+        return statuses, await seats_and_registrations(session_factory, event_id)
+
+    statuses, (seats_taken, registrations) = asyncio.run(
+        run_scenario(engine_factory, scenario)
+    )
+
+    assert statuses.count(200) == 1
+    assert statuses.count(400) == 49
+    assert registrations == seats_taken == 1
+
+
+def test_signup_unknown_volunteer(engine_factory):
+    """Тест: запись несуществующего пользователя — 404 без осиротевшей записи"""
+
+    async def scenario(session_factory):
+        event_id, _ = await seed(session_factory, max_volunteers=None)
+        status = await signup(session_factory, event_id, 424242)
+        return status, await seats_and_registrations(session_factory, event_id)
+
+    status, (seats_taken, registrations) = asyncio.run(
+        run_scenario(engine_factory, scenario)
+    )
+
+    assert status == 404
+    assert registrations == seats_taken == 0
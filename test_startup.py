@@ -0,0 +1,118 @@
+import time
+
+import pytest
+from alembic.config import Config
+from alembic.script import ScriptDirectory
+from sqlalchemy import event, func, select
+
+from app.core.database import SCHEMA_REVISION, Base, alembic_version, init_database
+from app.models import EventModel, NGOModel, RoleModel
+
+# Бюджет «тёплого» старта: схема актуальна, данные уже есть
+WARM_START_BUDGET_SECONDS = 0.05
+
+
+@pytest.fixture(scope="function")
+def engine(database):
+    """Пустая тестовая БД без таблицы версий; всё созданное удаляется после теста"""
+    engine = database.engine
+    yield engine
+    Base.metadata.drop_all(bind=engine)
+    alembic_version.drop(bind=engine, checkfirst=True)
+
+
+class QueryCounter:
+    """Считает SQL-запросы, отправленные через engine"""
+
+    def __init__(self, bind):
+        self.bind = bind
+        self.count = 0
+
+    def _on_execute(self, conn, cursor, statement, parameters, context, executemany):
+        self.count += 1
+
+    def __enter__(self):
+        event.listen(self.bind, "before_cursor_execute", self._on_execute)
+        return self
+
+    def __exit__(self, *exc):
+        event.remove(self.bind, "before_cursor_execute", self._on_execute)
+
+
+def table_counts(engine) -> tuple[int, int, int]:
+    with engine.connect() as conn:
+        return tuple(
+            conn.execute(select(func.count()).select_from(model)).scalar_one()
+            for model in (RoleModel, NGOModel, EventModel)
+        )
+
+
+def test_schema_revision_is_alembic_head():
+    """Тест: SCHEMA_REVISION обновлён вместе с последней миграцией"""
+    script = ScriptDirectory.from_config(Config("alembic.ini"))
+    assert script.get_current_head() == SCHEMA_REVISION
+
+
+def test_first_start_creates_schema_and_seeds(engine):
+    """Тест: новая база получает схему, ревизию и начальные данные"""
+    init_database(engine)
+
+    assert table_counts(engine) == (3, 3, 3)
+    with engine.connect() as conn:
+        assert conn.execute(select(alembic_version.c.version_num)).scalar() == SCHEMA_REVISION
+
+
+def test_seed_is_idempotent(engine):
+    """Тест: повторный старт (и повторная вставка) не дублирует данные"""
+    init_database(engine)
+    init_database(engine)
+
+    from app.core.database import seed_database
+    with engine.begin() as conn:
+        assert seed_database(conn) == 0
+    assert table_counts(engine) == (3, 3, 3)
+
+
+def test_no_seed(engine):
+    """Тест: seed=False создаёт схему без начальных данных"""
+    init_database(engine, seed=False)
+
+    assert table_counts(engine) == (0, 0, 0)
+
+
+def test_warm_start_budget(engine):
+    """Тест: при актуальной схеме старт — один запрос и укладывается в бюджет"""
+    init_database(engine)
+
+    with QueryCounter(engine) as counter:
+        started = time.perf_counter()
+        init_database(engine)
+        elapsed = time.perf_counter() - started
+
+    assert counter.count == 1
+    assert elapsed < WARM_START_BUDGET_SECONDS
+
+
+def test_unversioned_schema_is_refused(engine):
+    """Тест: таблицы без ревизии (например, из init_db.sql) не помечаются актуальными"""
+    RoleModel.__table__.create(bind=engine)
+
+    with pytest.raises(RuntimeError, match="alembic upgrade head"):
+        init_database(engine)
+
+    with engine.connect() as conn:
+        assert not engine.dialect.has_table(conn, "alembic_version")
+        assert not engine.dialect.has_table(conn, "events")
+
+
+def test_outdated_revision_is_not_restamped(engine):
+    """Тест: устаревшая ревизия не перезаписывается, данные не добавляются"""
+    init_database(engine, seed=False)
+    with engine.begin() as conn:
+        conn.execute(alembic_version.update().values(version_num="9c1e3a5b7d42"))
+
+    init_database(engine)
+
+    with engine.connect() as conn:
+        assert conn.execute(select(alembic_version.c.version_num)).scalar() == "9c1e3a5b7d42"
+    assert table_counts(engine) == (0, 0, 0)
@@ -1,15 +1,15 @@
-from datetime import datetime, timedelta
-from typing import Annotated
-
-from fastapi import APIRouter, Depends, HTTPException, status
-from fastapi.security import OAuth2PasswordRequestForm
-from jose import jwt
+from fastapi import APIRouter, HTTPException, status
 from pydantic import BaseModel
-from sqlalchemy.orm import Session
 
-from app.api.dependencies import DBDep
-from app.core.config import get_settings
-from app.models import UserCreate, UserPublic, UserModel, RoleModel
+from app.api.dependencies import DBDep, ReadDBDep, UserIdDep
+from app.exceptions.auth import (
+    InvalidPasswordError,
+    UserAlreadyExistsError,
+    UserNotFoundError,
+)
+from app.schemes.relations_users_roles import SUserGetWithRels
+from app.schemes.users import SUserAddRequest, SUserAuth
+from app.services.auth import AuthService
 
 
 router = APIRouter()
@@ -20,8 +20,8 @@ class Token(BaseModel):
     token_type: str = "bearer"
 
 
-@router.post("/register", summary="Регистрация волонтёра", response_model=UserPublic)
-async def register_user(data: UserCreate, db: DBDep):
+@router.post("/register", summary="Регистрация волонтёра")
+async def register_user(data: SUserAddRequest, db: DBDep):
     """
     Пример использования JSON body как в присланных фрагментах JS:
 
@@ -32,96 +32,44 @@ async def register_user(data: UserCreate, db: DBDep):
         body: JSON.stringify({ name, email, password })
       });
     }
-    """
-    existing = db.query(UserModel).filter(UserModel.email == data.email).first()
-    if existing:
-        raise HTTPException(status_code=400, detail="Пользователь с таким email уже существует")
-
-    # В учебных целях пароль не хэшируем, но поле называется hashed_password
-    volunteer_role = db.query(RoleModel).filter(RoleModel.name == "volunteer").first()
-    if not volunteer_role:
-        raise HTTPException(status_code=500, detail="Роль volunteer не найдена в базе")
 
-    user = UserModel(
-        name=data.name,
-        email=data.email,
-        hashed_password=data.password,
-        role_id=volunteer_role.id,
-    )
-    db.add(user)
-    db.commit()
-    db.refresh(user)
-
-    return UserPublic.from_orm(user)
+    Пароль хешируется в пуле bcrypt; роль всегда volunteer.
+    """
+    # Роль при самостоятельной регистрации не выбирается
+    data = data.model_copy(update={"role_id": None})
+    try:
+        await AuthService(db).register_user(data)
+    except UserAlreadyExistsError:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Пользователь с таким email уже существует",
+        )
+    except ValueError as ex:
+        raise HTTPException(status_code=500, detail=str(ex))
+    await db.commit()
+    return {"status": "OK"}
 
 
 @router.post("/login", summary="Логин и получение JWT-токена", response_model=Token)
-async def login(form_data: Annotated[OAuth2PasswordRequestForm, Depends()], db: DBDep):
+async def login(data: SUserAuth, db: DBDep):
     """
-    Стандартный endpoint tokenUrl для OAuth2PasswordBearer.
+    Проверка пароля идёт в пуле bcrypt (при переполнении — 503),
+    устаревший хеш перехешируется с текущим cost-фактором.
     """
-    user = db.query(UserModel).filter(UserModel.email == form_data.username).first()
-    if not user or user.hashed_password != form_data.password:
-        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Неверный логин или пароль")
-
-    settings = get_settings()
-    expire = datetime.utcnow() + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
-    payload = {"sub": str(user.id), "exp": expire}
-    token = jwt.encode(payload, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
+    try:
+        token = await AuthService(db).login_user(data)
+    except (UserNotFoundError, InvalidPasswordError):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Неверный логин или пароль",
+        )
     return Token(access_token=token)
 
-from fastapi import APIRouter
-from pydantic import BaseModel, EmailStr
-
-
-router = APIRouter(tags=["Авторизация"])
-
-
-class RegisterRequest(BaseModel):
-    name: str
-    email: EmailStr
-    password: str
-
-
-class RegisterResponse(BaseModel):
-    id: int
-    name: str
-    email: EmailStr
-
-
-fake_users: list[RegisterResponse] = []
-
-
-@router.post(
-    "/register",
-    response_model=RegisterResponse,
-    summary="Регистрация волонтёра (пример из fetch)",
-)
-async def register_user(data: RegisterRequest):
-    """
-    Реализация под пример:
-
-    try {
-      const response = await fetch(AUTH_ENDPOINTS.REGISTER, {
-        method: 'POST',
-        headers: {
-          'accept': 'application/json',
-          'Content-Type': 'application/json'
-        },
-        body: JSON.stringify({
-          name: name,
-          email: email,
-          password: password
-        })
-      });
-      const data = await response.json();
-      console.log(data)
-    }
-    """
-    new_id = len(fake_users) + 1
-    user = RegisterResponse(id=new_id, name=data.name, email=data.email)
-    fake_users.append(user)
-    return user
-
-
 
+@router.get("/me", summary="Профиль текущего пользователя", response_model=SUserGetWithRels)
+async def get_me(db: ReadDBDep, user_id: UserIdDep):
+    """Роль, записи с данными мероприятий и сертификаты — три запроса"""
+    try:
+        return await AuthService(db).get_me(user_id)
+    except UserNotFoundError:
+        raise HTTPException(status_code=404, detail="Пользователь не найден")
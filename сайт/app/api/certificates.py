@@ -0,0 +1,99 @@
+from typing import List
+
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import FileResponse
+from sqlalchemy import select
+
+from app.api.dependencies import DBDep, IsAdminDep, ReadDBDep, UserIdDep, get_user_role
+from app.core.certificate_render import get_certificate_renderer
+from app.models import (
+    CertificateModel,
+    CertificateRule,
+    CertificateRuleCreate,
+    CertificateRuleModel,
+    NGOModel,
+    UserModel,
+)
+from app.services.certificate_rules import CertificateRulesService
+
+
+router = APIRouter()
+
+
+@router.get("/rules", summary="Правила выдачи сертификатов (admin)", response_model=List[CertificateRule])
+async def list_rules(db: ReadDBDep, is_admin: IsAdminDep):
+    rules = (
+        await db.execute(select(CertificateRuleModel).order_by(CertificateRuleModel.id))
+    ).scalars().all()
+    return [CertificateRule.model_validate(r) for r in rules]
+
+
+@router.post("/rules", summary="Добавить правило выдачи сертификатов (admin)", response_model=CertificateRule)
+async def create_rule(data: CertificateRuleCreate, db: DBDep, is_admin: IsAdminDep):
+    """
+    Порог часов: без ngo_id — по всем часам волонтёра,
+    с ngo_id — по часам на мероприятиях этого НКО.
+    Уже набравшие порог получат сертификат при ближайшем начислении
+    или при запуске /backfill.
+    """
+    if data.hours_required < 1:
+        raise HTTPException(status_code=400, detail="Порог часов должен быть положительным")
+    if data.ngo_id is not None:
+        ngo = (await db.execute(select(NGOModel.id).where(NGOModel.id == data.ngo_id))).first()
+        if not ngo:
+            raise HTTPException(status_code=404, detail="НКО не найдено")
+
+    rule = CertificateRuleModel(
+        title=data.title,
+        hours_required=data.hours_required,
+        ngo_id=data.ngo_id,
+    )
+    db.add(rule)
+    await db.commit()
+    return CertificateRule.model_validate(rule)
+
+
+@router.post("/backfill", summary="Выдать сертификаты по правилам всем волонтёрам (admin)")
+async def backfill_certificates(db: DBDep, is_admin: IsAdminDep):
+    """Проход по всей таблице пользователей порциями, по транзакции на порцию"""
+    return await CertificateRulesService(db).backfill()
+
+
+@router.get("/{certificate_id}/pdf", summary="Скачать сертификат в PDF")
+async def download_certificate(
+    certificate_id: int,
+    db: ReadDBDep,
+    user_id: UserIdDep,
+):
+    """
+    PDF рендерится в пуле процессов один раз и кэшируется на диске
+    по хешу содержимого; повторные выгрузки отдаются файлом как есть.
+    Доступно владельцу сертификата и администратору; роль администратора
+    проверяется по БД (через кэш ролей), а не по claim в токене.
+    """
+    row = (
+        await db.execute(
+            select(CertificateModel, UserModel.name)
+            .join(UserModel, UserModel.id == CertificateModel.volunteer_id)
+            .where(CertificateModel.id == certificate_id)
+        )
+    ).first()
+    if not row:
+        raise HTTPException(status_code=404, detail="Сертификат не найден")
+    cert, volunteer_name = row
+    if cert.volunteer_id != user_id and await get_user_role(db, user_id) != "admin":
+        raise HTTPException(status_code=403, detail="Нет доступа к сертификату")
+
+    path = await get_certificate_renderer().render({
+        "certificate_id": cert.id,
+        "volunteer_id": cert.volunteer_id,
+        "volunteer_name": volunteer_name,
+        "title": cert.title or "Сертификат участия",
+        "hours": cert.hours_required or 0,
+        "issued_at": cert.issued_at.isoformat(),
+    })
+    return FileResponse(
+        path,
+        media_type="application/pdf",
+        filename=f"certificate-{cert.id}.pdf",
+    )
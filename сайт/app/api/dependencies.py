@@ -1,151 +1,130 @@
-from typing import Annotated, Generator
+from datetime import datetime
+from typing import Annotated, Callable, Literal
 
-from fastapi import Depends
-from fastapi.security import OAuth2PasswordBearer
-from jose import JWTError, jwt
-from sqlalchemy.orm import Session
+from fastapi import Depends, Request
+from pydantic import BaseModel, Field
 
-from app.core.config import get_settings
-from app.core.database import get_db
-from app.exceptions import InvalidJWTTokenError, IsNotAdminHTTPError, NoAccessTokenHTTPError
-from app.models import UserModel
+from app.core.database import get_db, get_read_db, get_read_session_factory
+from app.core.role_cache import role_cache
+from app.exceptions.auth import (
+    InvalidJWTTokenError,
+    InvalidTokenHTTPError,
+    IsNotAdminHTTPError,
+    NoAccessTokenHTTPError,
+)
+from app.models import RoleModel, UserModel
+from app.services.auth import AuthService
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
 
-oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
+class PaginationParams(BaseModel):
+    per_page: int | None = Field(default=10, ge=1, le=100)
+    # Непрозрачный курсор keyset-пагинации (заголовок X-Next-Cursor)
+    cursor: str | None = Field(default=None, max_length=200)
 
 
-def get_current_user_id(token: Annotated[str, Depends(oauth2_scheme)]) -> int:
-    """
-    Извлекаем user_id из JWT-токена.
-    Аналогично тому, как это делается в учебных примерах с get_current_user_id().
-    """
-    if not token:
-        raise NoAccessTokenHTTPError()
+PaginationDep = Annotated[PaginationParams, Depends()]
 
-    settings = get_settings()
-    try:
-        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
-        user_id: str | None = payload.get("sub")
-        if user_id is None:
-            raise InvalidJWTTokenError()
-        return int(user_id)
-    except JWTError:
-        raise InvalidJWTTokenError()
 
+class EventFiltersParams(BaseModel):
+    status: Literal["active", "completed", "cancelled"] | None = None
+    ngo_id: int | None = Field(default=None, ge=1)
+    location: str | None = Field(default=None, min_length=1, max_length=200)
+    date_from: datetime | None = None
+    date_to: datetime | None = None
 
-UserIdDep = Annotated[int, Depends(get_current_user_id)]
-DBDep = Annotated[Session, Depends(get_db)]
 
+EventFiltersDep = Annotated[EventFiltersParams, Depends()]
 
-async def check_is_admin(db: DBDep, user_id: UserIdDep):
-    """
-    Пример из задания:
-
-    app/api/dependencies.py
-    async def check_is_admin(db: DBDep, user_id:UserIdDep):
-        user = await db.users.get_one_or_none_with_role(id=user_id)
-        if user.role.name == "admin":
-            return True
-        else:
-            raise IsNotAdminHTTPError
-    """
-    user = db.query(UserModel).filter(UserModel.id == user_id).first()
-    if user and user.role and user.role.name == "admin":
-        return True
-    raise IsNotAdminHTTPError()
 
+class ExportParams(BaseModel):
+    format: Literal["csv", "ndjson"] = "csv"
+    ngo_id: int | None = Field(default=None, ge=1)
+    date_from: datetime | None = None
+    date_to: datetime | None = None
 
-IsAdminDep = Annotated[bool, Depends(check_is_admin)]
 
-from typing import Annotated
+ExportParamsDep = Annotated[ExportParams, Depends()]
 
-from fastapi import Depends
 
-from app.exceptions import IsNotAdminHTTPError
+def get_token(request: Request) -> str:
+    """Получение токена из заголовка Authorization или cookies"""
+    # Сначала пробуем получить из заголовка
+    auth_header = request.headers.get("Authorization")
+    if auth_header and auth_header.startswith("Bearer "):
+        return auth_header.split(" ")[1]
+    
+    # Если нет в заголовке, пробуем из cookies
+    token = request.cookies.get("access_token", None)
+    if token is None:
+        raise NoAccessTokenHTTPError
+    return token
 
 
-class Role:
-    def __init__(self, name: str):
-        self.name = name
-
-
-class User:
-    def __init__(self, id: int, name: str, role: Role):
-        self.id = id
-        self.name = name
-        self.role = role
-
-
-class FakeUserRepo:
-    """
-    Упрощённый репозиторий пользователей.
-    Вместо БД используем память, но интерфейс похож на пример.
+def get_token_claims(token: str = Depends(get_token)) -> dict:
     """
+    Проверенные claims токена.
 
-    def __init__(self):
-        admin_role = Role("admin")
-        user_role = Role("user")
-        self._users: dict[int, User] = {
-            1: User(1, "Admin", admin_role),
-            2: User(2, "Volunteer", user_role),
-        }
-
-    async def get_one_or_none_with_role(self, id: int) -> User | None:
-        return self._users.get(id)
-
-
-class FakeDB:
-    def __init__(self):
-        self.users = FakeUserRepo()
-
-
-async def get_db() -> FakeDB:
+    FastAPI кэширует зависимость в пределах запроса, поэтому подпись
+    проверяется один раз, даже если нужны и user_id, и роль.
     """
-    Аналог DBDep из примера.
-    """
-    return FakeDB()
+    try:
+        return AuthService.decode_token(token)
+    except InvalidJWTTokenError:
+        raise InvalidTokenHTTPError
 
 
-DBDep = Annotated[FakeDB, Depends(get_db)]
+TokenClaimsDep = Annotated[dict, Depends(get_token_claims)]
 
 
-async def get_current_user_id() -> int:
-    """
-    Упрощённо считаем, что всегда авторизован админ с id=1.
+def get_current_user_id(claims: TokenClaimsDep) -> int:
+    """Получение ID текущего пользователя из токена"""
+    return claims["user_id"]
 
-    В полноценном проекте здесь должна быть логика разбора JWT-токена:
 
-    SECRET_KEY=...
-    ALGORITHM=HS256
-    ACCESS_TOKEN_EXPIRE_MINUTES=60
-    DB_NAME=test.db
-    """
-
-    return 1
+def get_current_user_role(claims: TokenClaimsDep) -> str:
+    """Получение роли текущего пользователя из токена"""
+    return claims.get("role", "volunteer")
 
 
 UserIdDep = Annotated[int, Depends(get_current_user_id)]
+UserRoleDep = Annotated[str, Depends(get_current_user_role)]
+DBDep = Annotated[AsyncSession, Depends(get_db)]
+# Чтение с реплики; запросы после записи уходят на primary
+ReadDBDep = Annotated[AsyncSession, Depends(get_read_db)]
+# Фабрика сессий для генераторов, которые работают дольше запроса
+ReadSessionFactoryDep = Annotated[
+    Callable[[], AsyncSession], Depends(get_read_session_factory)
+]
 
 
-async def check_is_admin(db: DBDep, user_id: UserIdDep):
+async def get_user_role(db: AsyncSession, user_id: int) -> str | None:
     """
-    Вариант из задания:
-
-    app/api/dependencies.py
-    async def check_is_admin(db: DBDep, user_id:UserIdDep):
-        user = await db.users.get_one_or_none_with_role(id=user_id)
-        if user.role.name == "admin":
-            return True
-        else:
-            raise IsNotAdminHTTPError
+    Текущая роль пользователя по БД; None — пользователя нет.
+
+    Роль берётся из TTL-кэша, в БД идём одним запросом только при промахе,
+    поэтому снятая роль действует сразу, а не после истечения токена.
     """
-    user = await db.users.get_one_or_none_with_role(id=user_id)
-    if user and user.role.name == "admin":
-        return True
-    raise IsNotAdminHTTPError
+    role = role_cache.get(user_id)
+    if role is None:
+        role = (
+            await db.execute(
+                select(RoleModel.name)
+                .join(UserModel, UserModel.role_id == RoleModel.id)
+                .where(UserModel.id == user_id)
+            )
+        ).scalar_one_or_none()
+        if role is not None:
+            role_cache.put(user_id, role)
+    return role
+
+
+async def check_is_admin(db: DBDep, user_id: UserIdDep) -> bool:
+    """Проверка прав администратора по текущей роли в БД; иначе 403"""
+    if await get_user_role(db, user_id) != "admin":
+        raise IsNotAdminHTTPError
+    return True
 
 
 IsAdminDep = Annotated[bool, Depends(check_is_admin)]
-
-
-
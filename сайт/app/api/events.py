@@ -1,8 +1,32 @@
-from typing import List
-
-from fastapi import APIRouter, HTTPException
-
-from app.api.dependencies import IsAdminDep, UserIdDep, DBDep
+import base64
+import json
+from datetime import datetime
+from typing import AsyncIterator, List
+
+from fastapi import APIRouter, HTTPException, Query, Request, Response
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, StreamingResponse
+from sqlalchemy import and_, func, or_, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.dependencies import (
+    DBDep,
+    EventFiltersDep,
+    IsAdminDep,
+    PaginationDep,
+    ReadDBDep,
+    ReadSessionFactoryDep,
+    UserIdDep,
+)
+from app.core.catalogue_cache import bump_catalogue_version, catalogue_cache
+from app.core.config import get_settings
+from app.core.event_search import index_events, search_matches
+from app.core.jobs import enqueue, notify_workers
+from app.core.seat_updates import SeatSubscription, load_seat_states, seat_broadcaster
+from app.services.event_import import EventImportError, EventImportService
+# Регистрирует обработчик задачи settle_event
+from app.services import event_settlement  # noqa: F401
 from app.models import (
     EventCreate,
     EventPublic,
@@ -18,24 +42,268 @@ from app.models import (
 router = APIRouter()
 
 
+def _encode_cursor(scheduled_at: datetime, event_id: int) -> str:
+    raw = json.dumps([scheduled_at.isoformat(), event_id]).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii")
+
+
+def _decode_cursor(cursor: str) -> tuple[datetime, int]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode("ascii"))
+        scheduled_at, event_id = json.loads(raw)
+        return datetime.fromisoformat(scheduled_at), int(event_id)
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Некорректный курсор пагинации")
+
+
+# Браузер хранит ответ, но перед использованием переспрашивает по ETag
+_CACHE_HEADERS = {"Cache-Control": "no-cache"}
+
+
+def _conditional_response(request: Request, key: str, version: int) -> Response | None:
+    """304 или ответ из кэша для текущей версии каталога"""
+    etag = catalogue_cache.etag(key, version)
+    if catalogue_cache.matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers={"ETag": etag, **_CACHE_HEADERS})
+    cached = catalogue_cache.get(key, version)
+    if cached is not None:
+        return Response(
+            cached.body,
+            media_type="application/json",
+            headers={**cached.headers, "ETag": etag, **_CACHE_HEADERS},
+        )
+    return None
+
+
+def _cacheable_response(key: str, version: int, content, headers: dict[str, str]) -> Response:
+    """JSON-ответ с ETag версии, по которой он построен; кладётся в кэш"""
+    response = JSONResponse(
+        jsonable_encoder(content),
+        headers={**headers, "ETag": catalogue_cache.etag(key, version), **_CACHE_HEADERS},
+    )
+    catalogue_cache.put(key, version, response.body, headers)
+    return response
+
+
+def _volunteers_count():
+    # Число записей считаем коррелированным подзапросом только для выбранных
+    # строк, а не через e.registrations (N+1 запросов).
+    return (
+        select(func.count(RegistrationModel.id))
+        .where(RegistrationModel.event_id == EventModel.id)
+        .correlate(EventModel)
+        .scalar_subquery()
+    )
+
+
+def _event_public(e: EventModel, volunteers_count: int) -> EventPublic:
+    return EventPublic(
+        id=e.id,
+        title=e.title,
+        description=e.description,
+        ngo_id=e.ngo_id,
+        scheduled_at=e.scheduled_at,
+        location=e.location,
+        max_volunteers=e.max_volunteers,
+        duration_hours=e.duration_hours,
+        status=e.status,
+        volunteers_count=volunteers_count,
+    )
+
+
 @router.get("/", summary="Список волонтёрских мероприятий", response_model=List[EventPublic])
-async def list_events(db: DBDep):
-    events = db.query(EventModel).all()
-    result: List[EventPublic] = []
-    for e in events:
-        volunteers_count = len(e.registrations)
-        result.append(
-            EventPublic(
-                id=e.id,
-                title=e.title,
-                description=e.description,
-                ngo_id=e.ngo_id,
-                scheduled_at=e.scheduled_at,
-                duration_hours=e.duration_hours,
-                volunteers_count=volunteers_count,
+async def list_events(
+    db: ReadDBDep,
+    request: Request,
+    pagination: PaginationDep,
+    filters: EventFiltersDep,
+):
+    """
+    Каталог мероприятий с keyset-пагинацией по (scheduled_at, id).
+
+    Курсор следующей страницы возвращается в заголовке X-Next-Cursor
+    и передаётся обратно параметром ?cursor=...; глубокие страницы
+    читаются по индексу так же быстро, как первая. Номер страницы
+    (?page=) не поддерживается — 400, а не молча первая страница.
+
+    Ответ помечается ETag версии каталога: If-None-Match с актуальным
+    ETag получает 304, а повторный запрос в пределах TTL — ответ из кэша.
+    """
+    if "page" in request.query_params:
+        raise HTTPException(
+            status_code=400,
+            detail="Параметр page не поддерживается: передайте cursor из заголовка X-Next-Cursor",
+        )
+    key = catalogue_cache.key(request)
+    version = await catalogue_cache.current_version(db)
+    cached = _conditional_response(request, key, version)
+    if cached is not None:
+        return cached
+
+    query = select(EventModel, _volunteers_count())
+
+    if filters.status is not None:
+        query = query.where(EventModel.status == filters.status)
+    if filters.ngo_id is not None:
+        query = query.where(EventModel.ngo_id == filters.ngo_id)
+    if filters.location is not None:
+        query = query.where(EventModel.location.startswith(filters.location, autoescape=True))
+    if filters.date_from is not None:
+        query = query.where(EventModel.scheduled_at >= filters.date_from)
+    if filters.date_to is not None:
+        query = query.where(EventModel.scheduled_at < filters.date_to)
+
+    if pagination.cursor:
+        after_scheduled_at, after_id = _decode_cursor(pagination.cursor)
+        # Избыточное условие >= даёт планировщику диапазон по индексу:
+        # одно OR-условие SQLite обходит с начала индекса
+        query = query.where(
+            EventModel.scheduled_at >= after_scheduled_at,
+            or_(
+                EventModel.scheduled_at > after_scheduled_at,
+                and_(
+                    EventModel.scheduled_at == after_scheduled_at,
+                    EventModel.id > after_id,
+                ),
             )
         )
-    return result
+
+    # Берём на одну строку больше, чтобы узнать, есть ли следующая страница
+    rows = (
+        await db.execute(
+            query.order_by(EventModel.scheduled_at, EventModel.id)
+            .limit(pagination.per_page + 1)
+        )
+    ).all()
+    headers: dict[str, str] = {}
+    if len(rows) > pagination.per_page:
+        rows = rows[: pagination.per_page]
+        last = rows[-1][0]
+        headers["X-Next-Cursor"] = _encode_cursor(last.scheduled_at, last.id)
+
+    result = [_event_public(e, count) for e, count in rows]
+    return _cacheable_response(key, version, result, headers)
+
+
+@router.get("/search", summary="Полнотекстовый поиск мероприятий", response_model=List[EventPublic])
+async def search_events(
+    request: Request,
+    db: ReadDBDep,
+    q: str = Query(..., min_length=2, max_length=200, description="Слова из названия или описания"),
+    limit: int = Query(20, ge=1, le=50),
+):
+    """
+    Поиск по названию и описанию с учётом словоформ: «субботники в парках»
+    находит «Субботник в парке». Все слова запроса обязательны, последнее
+    можно не дописывать. Результаты — по релевантности, совпадения
+    в названии весят больше. Один запрос к полнотекстовому индексу.
+    """
+    key = catalogue_cache.key(request)
+    version = await catalogue_cache.current_version(db)
+    cached = _conditional_response(request, key, version)
+    if cached is not None:
+        return cached
+
+    matches = search_matches(q, db.get_bind().dialect.name, limit)
+    if matches is None:
+        raise HTTPException(status_code=400, detail="В запросе нет слов для поиска")
+    rows = (
+        await db.execute(
+            select(EventModel, _volunteers_count())
+            .join(matches, matches.c.event_id == EventModel.id)
+            .order_by(matches.c.rank)
+        )
+    ).all()
+    result = [_event_public(e, count) for e, count in rows]
+    return _cacheable_response(key, version, result, {})
+
+
+def _sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+async def _seat_stream(
+    request: Request,
+    subscription: SeatSubscription,
+    snapshot: list[dict],
+    heartbeat: float,
+) -> AsyncIterator[str]:
+    try:
+        yield "retry: 3000\n\n"
+        for state in snapshot:
+            yield _sse("seats", state)
+        while True:
+            batch = await subscription.next_batch(heartbeat)
+            if await request.is_disconnected():
+                break
+            if not batch:
+                # Комментарий держит соединение открытым через прокси
+                yield ": ping\n\n"
+            for state in batch:
+                yield _sse("seats", state)
+    finally:
+        seat_broadcaster.unsubscribe(subscription)
+
+
+@router.get("/live", summary="Свободные места в реальном времени (SSE)")
+async def live_seats(
+    request: Request,
+    session_factory: ReadSessionFactoryDep,
+    ids: str = Query(..., description="id мероприятий через запятую"),
+):
+    """
+    Поток Server-Sent Events: сразу текущее состояние мест по каждому
+    мероприятию, затем событие seats при каждом изменении (не чаще
+    SEAT_UPDATES_PER_SECOND раз в секунду на мероприятие).
+    Одно соединение заменяет периодический опрос каталога.
+
+    Снимок читается в короткой сессии, закрытой до начала потока:
+    открытый поток не держит соединение из пула записи.
+    """
+    settings = get_settings()
+    try:
+        event_ids = {int(part) for part in ids.split(",") if part.strip()}
+    except ValueError:
+        raise HTTPException(status_code=400, detail="ids — список чисел через запятую")
+    if not event_ids:
+        raise HTTPException(status_code=400, detail="Не указаны мероприятия")
+    if len(event_ids) > settings.SEAT_STREAM_MAX_EVENTS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Не больше {settings.SEAT_STREAM_MAX_EVENTS} мероприятий в одном потоке",
+        )
+
+    # Подписка раньше снимка: изменение между ними не потеряется
+    subscription = seat_broadcaster.subscribe(event_ids)
+    try:
+        async with session_factory() as db:
+            snapshot = await load_seat_states(db, event_ids)
+    except Exception:
+        seat_broadcaster.unsubscribe(subscription)
+        raise
+    return StreamingResponse(
+        _seat_stream(request, subscription, snapshot, settings.SEAT_STREAM_HEARTBEAT_SECONDS),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.get("/{event_id}", summary="Информация о мероприятии", response_model=EventPublic)
+async def get_event(event_id: int, db: ReadDBDep, request: Request):
+    key = catalogue_cache.key(request)
+    version = await catalogue_cache.current_version(db)
+    cached = _conditional_response(request, key, version)
+    if cached is not None:
+        return cached
+
+    row = (
+        await db.execute(
+            select(EventModel, _volunteers_count()).where(EventModel.id == event_id)
+        )
+    ).first()
+    if not row:
+        raise HTTPException(status_code=404, detail="Мероприятие не найдено")
+    return _cacheable_response(key, version, _event_public(*row), {})
 
 
 @router.post("/", summary="Создать мероприятие (admin)", response_model=EventPublic)
@@ -45,139 +313,178 @@ async def create_event(data: EventCreate, db: DBDep, is_admin: IsAdminDep):
         description=data.description,
         ngo_id=data.ngo_id,
         scheduled_at=data.scheduled_at,
+        location=data.location,
+        max_volunteers=data.max_volunteers,
         duration_hours=data.duration_hours,
     )
     db.add(event)
-    db.commit()
-    db.refresh(event)
+    await db.flush()
+    await index_events(db, [event])
+    await bump_catalogue_version(db)
+    await db.commit()
+    catalogue_cache.invalidate()
 
-    return EventPublic(
-        id=event.id,
-        title=event.title,
-        description=event.description,
-        ngo_id=event.ngo_id,
-        scheduled_at=event.scheduled_at,
-        duration_hours=event.duration_hours,
-        volunteers_count=0,
-    )
+    return _event_public(event, 0)
 
 
-@router.post("/{event_id}/signup", summary="Записаться на мероприятие", response_model=Registration)
-async def signup_for_event(event_id: int, user_id: UserIdDep, db: DBDep):
-    event = db.query(EventModel).filter(EventModel.id == event_id).first()
-    if not event:
-        raise HTTPException(status_code=404, detail="Мероприятие не найдено")
+@router.post("/import", summary="Массовый импорт мероприятий (admin)")
+async def import_events(request: Request, db: DBDep, is_admin: IsAdminDep):
+    """
+    Импорт сезона мероприятий одним запросом.
+
+    Тело — JSON-массив записей SEventAddRequest или CSV с теми же
+    колонками (Content-Type: text/csv). Все строки проверяются до записи;
+    корректные вставляются многострочными INSERT порциями, каждая порция —
+    отдельная транзакция. Ошибки возвращаются по номерам строк.
+    """
+    body = await request.body()
+    service = EventImportService(db)
+    try:
+        if request.headers.get("content-type", "").startswith("text/csv"):
+            records = service.parse_csv(body)
+        else:
+            records = service.parse_json(body)
+        result = await service.import_events(records)
+    except EventImportError as ex:
+        raise HTTPException(status_code=400, detail=str(ex))
+
+    if result["created"]:
+        catalogue_cache.invalidate()
+    return result
 
-    user = db.query(UserModel).filter(UserModel.id == user_id).first()
-    if not user:
-        raise HTTPException(status_code=404, detail="Пользователь не найден")
 
+async def _signup_error(db: AsyncSession, event_id: int, user_id: int) -> HTTPException:
+    """Причина неудачной записи — выясняется только на пути ошибки."""
+    event = (
+        await db.execute(
+            select(EventModel.status, EventModel.max_volunteers, EventModel.seats_taken)
+            .where(EventModel.id == event_id)
+        )
+    ).first()
+    if not event:
+        return HTTPException(status_code=404, detail="Мероприятие не найдено")
     existing = (
-        db.query(RegistrationModel)
-        .filter(
-            RegistrationModel.event_id == event_id,
-            RegistrationModel.volunteer_id == user_id,
+        await db.execute(
+            select(RegistrationModel.id).where(
+                RegistrationModel.event_id == event_id,
+                RegistrationModel.volunteer_id == user_id,
+            )
         )
-        .first()
-    )
+    ).first()
     if existing:
-        raise HTTPException(status_code=400, detail="Вы уже записаны на это мероприятие")
+        return HTTPException(status_code=400, detail="Вы уже записаны на это мероприятие")
+    if event.status != "active":
+        return HTTPException(status_code=409, detail="Запись на мероприятие закрыта")
+    if event.max_volunteers is not None and event.seats_taken >= event.max_volunteers:
+        return HTTPException(status_code=409, detail="Свободных мест нет")
+    return HTTPException(status_code=404, detail="Пользователь не найден")
+
 
+@router.post("/{event_id}/signup", summary="Записаться на мероприятие", response_model=Registration)
+async def signup_for_event(event_id: int, user_id: UserIdDep, db: DBDep):
+    """
+    Запись волонтёра с атомарной проверкой вместимости.
+
+    Транзакция короткая и без предварительных SELECT: сначала INSERT записи
+    (дубликат отсекает уникальный ключ event_id + volunteer_id), затем
+    условный UPDATE счётчика seats_taken. Блокировка строки мероприятия
+    держится только между этим UPDATE и COMMIT, поэтому параллельные
+    записи на популярное мероприятие не выстраиваются в длинную очередь
+    и не могут превысить max_volunteers. Версия каталога увеличивается
+    последней, прямо перед COMMIT.
+    """
     reg = RegistrationModel(event_id=event_id, volunteer_id=user_id)
     db.add(reg)
-    db.commit()
-    db.refresh(reg)
-
-    return Registration.from_orm(reg)
+    try:
+        await db.flush()
+    except IntegrityError:
+        await db.rollback()
+        raise await _signup_error(db, event_id, user_id)
+
+    reserved = await db.execute(
+        update(EventModel)
+        .where(
+            EventModel.id == event_id,
+            EventModel.status == "active",
+            or_(
+                EventModel.max_volunteers.is_(None),
+                EventModel.seats_taken < EventModel.max_volunteers,
+            ),
+        )
+        .values(seats_taken=EventModel.seats_taken + 1)
+        .execution_options(synchronize_session=False)
+    )
+    if reserved.rowcount == 0:
+        await db.rollback()
+        raise await _signup_error(db, event_id, user_id)
+
+    result = Registration.model_validate(reg)
+    await bump_catalogue_version(db)
+    await db.commit()
+    catalogue_cache.invalidate()
+    seat_broadcaster.publish(event_id)
+    return result
 
 
-@router.post("/{event_id}/complete", summary="Отметить мероприятие как завершённое (admin)")
+@router.post(
+    "/{event_id}/complete",
+    summary="Отметить мероприятие как завершённое (admin)",
+    status_code=202,
+)
 async def complete_event(event_id: int, db: DBDep, is_admin: IsAdminDep):
-    event = db.query(EventModel).filter(EventModel.id == event_id).first()
-    if not event:
-        raise HTTPException(status_code=404, detail="Мероприятие не найдено")
-
-    regs = db.query(RegistrationModel).filter(RegistrationModel.event_id == event_id).all()
-    for reg in regs:
-        reg.hours_earned = event.duration_hours
-        user = db.query(UserModel).filter(UserModel.id == reg.volunteer_id).first()
-        if user:
-            user.total_hours += event.duration_hours
-            user.rating = float(user.total_hours)
+    """
+    Завершение мероприятия; начисление часов — фоновой задачей.
 
-    db.commit()
-    return {"msg": "Мероприятие завершено, часы волонтёров начислены"}
+    Переход статуса active → completed выполняется условным UPDATE и служит
+    защитой от повторного начисления: второй (в том числе параллельный)
+    вызов не найдёт активного мероприятия. В той же транзакции ставится
+    задача settle_event (часы, сертификаты, рейтинг), и ответ 202 уходит,
+    не дожидаясь начисления. Ход задачи — в /api/jobs/{job_id}.
+    """
+    transition = await db.execute(
+        update(EventModel)
+        .where(EventModel.id == event_id, EventModel.status == "active")
+        .values(status="completed")
+    )
+    if transition.rowcount == 0:
+        await db.rollback()
+        exists = (
+            await db.execute(select(EventModel.id).where(EventModel.id == event_id))
+        ).first()
+        if not exists:
+            raise HTTPException(status_code=404, detail="Мероприятие не найдено")
+        raise HTTPException(status_code=409, detail="Мероприятие уже завершено или отменено")
+
+    job = await enqueue(db, "settle_event", {"event_id": event_id})
+    job_id = job.id
+    await bump_catalogue_version(db)
+    await db.commit()
+    catalogue_cache.invalidate()
+    seat_broadcaster.publish(event_id)
+    notify_workers()
+
+    return {
+        "msg": "Мероприятие завершено, начисление часов поставлено в очередь",
+        "job_id": job_id,
+    }
 
 
 @router.post("/certificates/{volunteer_id}", summary="Выдать сертификат волонтёру (admin)", response_model=Certificate)
 async def issue_certificate(volunteer_id: int, db: DBDep, is_admin: IsAdminDep):
-    user = db.query(UserModel).filter(UserModel.id == volunteer_id).first()
+    user = (
+        await db.execute(select(UserModel).where(UserModel.id == volunteer_id))
+    ).scalar_one_or_none()
     if not user:
         raise HTTPException(status_code=404, detail="Пользователь не найден")
     text = f"Сертификат участия: {user.name} — {user.total_hours} часов волонтёрской деятельности."
 
     cert = CertificateModel(
         volunteer_id=volunteer_id,
+        title="Сертификат участия",
+        hours_required=user.total_hours or 0,
         text=text,
     )
     db.add(cert)
-    db.commit()
-    db.refresh(cert)
-
-    return Certificate.from_orm(cert)
-
-from datetime import datetime
-from typing import List
-
-from fastapi import APIRouter, HTTPException
-from pydantic import BaseModel
-
-
-router = APIRouter(tags=["Мероприятия"])
-
-
-class EventCreate(BaseModel):
-    title: str
-    description: str | None = None
-    ngo_name: str
-    start_at: datetime | None = None
-    hours: int = 2
-
-
-class Event(BaseModel):
-    id: int
-    title: str
-    description: str | None = None
-    ngo_name: str
-    start_at: datetime | None = None
-    hours: int
-
-
-_events: list[Event] = []
-
-
-@router.get("/events", summary="Список волонтёрских мероприятий", response_model=List[Event])
-async def list_events():
-    return _events
-
-
-@router.post("/ngo/events", summary="Создать мероприятие НКО", response_model=Event)
-async def create_event(data: EventCreate):
-    """
-    НКО публикует волонтёрское мероприятие.
-    """
-    new_id = len(_events) + 1
-    event = Event(id=new_id, **data.model_dict())
-    _events.append(event)
-    return event
-
-
-@router.get("/events/{event_id}", summary="Информация о мероприятии", response_model=Event)
-async def get_event(event_id: int):
-    for e in _events:
-        if e.id == event_id:
-            return e
-    raise HTTPException(status_code=404, detail="Мероприятие не найдено")
-
-
+    await db.commit()
 
+    return Certificate.model_validate(cert)
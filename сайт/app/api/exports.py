@@ -0,0 +1,135 @@
+import csv
+import io
+import json
+from datetime import datetime
+from typing import AsyncIterator
+
+from fastapi import APIRouter
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
+
+from app.api.dependencies import ExportParams, ExportParamsDep, IsAdminDep, ReadSessionFactoryDep
+from app.models import EventModel, NGOModel, RegistrationModel, UserModel
+
+
+router = APIRouter()
+
+# Строк в одной порции курсора и одном куске ответа
+EXPORT_CHUNK_SIZE = 1000
+
+EXPORT_COLUMNS = [
+    "registration_id",
+    "volunteer_id",
+    "volunteer_name",
+    "volunteer_email",
+    "volunteer_city",
+    "event_id",
+    "event_title",
+    "ngo_id",
+    "ngo_name",
+    "scheduled_at",
+    "registered_at",
+    "hours_earned",
+    "status",
+]
+
+
+def _export_query(params: ExportParams):
+    query = (
+        select(
+            RegistrationModel.id.label("registration_id"),
+            UserModel.id.label("volunteer_id"),
+            UserModel.name.label("volunteer_name"),
+            UserModel.email.label("volunteer_email"),
+            UserModel.city.label("volunteer_city"),
+            EventModel.id.label("event_id"),
+            EventModel.title.label("event_title"),
+            NGOModel.id.label("ngo_id"),
+            NGOModel.name.label("ngo_name"),
+            EventModel.scheduled_at,
+            RegistrationModel.registered_at,
+            RegistrationModel.hours_earned,
+            RegistrationModel.status,
+        )
+        .join(UserModel, UserModel.id == RegistrationModel.volunteer_id)
+        .join(EventModel, EventModel.id == RegistrationModel.event_id)
+        .join(NGOModel, NGOModel.id == EventModel.ngo_id)
+    )
+    if params.ngo_id is not None:
+        query = query.where(EventModel.ngo_id == params.ngo_id)
+    if params.date_from is not None:
+        query = query.where(EventModel.scheduled_at >= params.date_from)
+    if params.date_to is not None:
+        query = query.where(EventModel.scheduled_at < params.date_to)
+    # Порядок по первичному ключу не требует сортировки на стороне БД
+    return query.order_by(RegistrationModel.id).execution_options(
+        yield_per=EXPORT_CHUNK_SIZE
+    )
+
+
+def _format_value(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+def _csv_chunk(rows) -> bytes:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerows([_format_value(v) for v in row] for row in rows)
+    return buffer.getvalue().encode("utf-8")
+
+
+def _ndjson_chunk(rows) -> bytes:
+    return "".join(
+        json.dumps(
+            dict(zip(EXPORT_COLUMNS, (_format_value(v) for v in row))),
+            ensure_ascii=False,
+        ) + "\n"
+        for row in rows
+    ).encode("utf-8")
+
+
+async def _stream_rows(session_factory, params: ExportParams) -> AsyncIterator[bytes]:
+    """
+    Строки выгрузки порциями по EXPORT_CHUNK_SIZE.
+
+    db.stream() открывает серверный курсор (для MySQL — SSCursor),
+    так что в памяти одновременно находится не больше одной порции
+    независимо от размера выгрузки.
+    """
+    if params.format == "csv":
+        # BOM — чтобы Excel открыл кириллицу без перекодировки
+        header = io.StringIO()
+        csv.writer(header).writerow(EXPORT_COLUMNS)
+        yield ("\ufeff" + header.getvalue()).encode("utf-8")
+        encode = _csv_chunk
+    else:
+        encode = _ndjson_chunk
+
+    async with session_factory() as db:
+        result = await db.stream(_export_query(params))
+        async for rows in result.partitions():
+            yield encode(rows)
+
+
+@router.get("/registrations", summary="Выгрузка записей и часов волонтёров (admin)")
+async def export_registrations(
+    params: ExportParamsDep,
+    session_factory: ReadSessionFactoryDep,
+    is_admin: IsAdminDep,
+):
+    """
+    Полный отчёт об участии для грантовой отчётности: волонтёр,
+    мероприятие, НКО, начисленные часы, статус и даты.
+
+    Фильтры: ?ngo_id=, ?date_from=, ?date_to= (по дате мероприятия);
+    формат: ?format=csv (по умолчанию) или ?format=ndjson.
+    """
+    media_type = "text/csv; charset=utf-8" if params.format == "csv" else "application/x-ndjson"
+    filename = f"registrations.{params.format}"
+    return StreamingResponse(
+        _stream_rows(session_factory, params),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
@@ -0,0 +1,52 @@
+from datetime import datetime
+from typing import List, Optional
+
+from fastapi import APIRouter, HTTPException, Query
+from sqlalchemy import select, update
+
+from app.api.dependencies import DBDep, IsAdminDep, ReadDBDep
+from app.core.jobs import notify_workers
+from app.models import Job, JobModel
+
+
+router = APIRouter()
+
+
+@router.get("/", summary="Фоновые задачи (admin)", response_model=List[Job])
+async def list_jobs(
+    db: ReadDBDep,
+    is_admin: IsAdminDep,
+    status: Optional[str] = Query(None, description="queued, running, done или failed"),
+    limit: int = Query(50, ge=1, le=500),
+):
+    query = select(JobModel).order_by(JobModel.id.desc()).limit(limit)
+    if status is not None:
+        query = query.where(JobModel.status == status)
+    jobs = (await db.execute(query)).scalars().all()
+    return [Job.model_validate(j) for j in jobs]
+
+
+@router.get("/{job_id}", summary="Состояние фоновой задачи (admin)", response_model=Job)
+async def get_job(job_id: int, db: ReadDBDep, is_admin: IsAdminDep):
+    job = await db.get(JobModel, job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Задача не найдена")
+    return Job.model_validate(job)
+
+
+@router.post("/{job_id}/retry", summary="Повторить проваленную задачу (admin)", response_model=Job)
+async def retry_job(job_id: int, db: DBDep, is_admin: IsAdminDep):
+    """Задача в статусе failed возвращается в очередь с новым запасом попыток"""
+    retried = await db.execute(
+        update(JobModel)
+        .where(JobModel.id == job_id, JobModel.status == "failed")
+        .values(status="queued", attempts=0, run_after=datetime.utcnow(), finished_at=None)
+    )
+    if retried.rowcount == 0:
+        await db.rollback()
+        if not await db.get(JobModel, job_id):
+            raise HTTPException(status_code=404, detail="Задача не найдена")
+        raise HTTPException(status_code=409, detail="Повторить можно только проваленную задачу")
+    await db.commit()
+    notify_workers()
+    return Job.model_validate(await db.get(JobModel, job_id, populate_existing=True))
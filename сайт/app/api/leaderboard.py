@@ -0,0 +1,47 @@
+from typing import List
+
+from fastapi import APIRouter, HTTPException, Query
+
+from app.api.dependencies import UserIdDep
+from app.core.leaderboard import leaderboard
+from app.models import LeaderboardEntry, LeaderboardRank
+
+
+router = APIRouter()
+
+
+@router.get("/", summary="Рейтинг волонтёров", response_model=List[LeaderboardEntry])
+async def get_leaderboard(
+    limit: int = Query(default=10, ge=1, le=100),
+    city: str | None = Query(default=None, max_length=100),
+):
+    """
+    Топ волонтёров по рейтингу — общий или по городу.
+    Отвечает из таблицы в памяти, без ORDER BY по всей таблице users.
+    """
+    return [
+        LeaderboardEntry(
+            rank=rank,
+            user_id=member.user_id,
+            name=member.name,
+            city=member.city,
+            rating=member.rating,
+        )
+        for rank, member in leaderboard.top(limit, city)
+    ]
+
+
+@router.get("/me", summary="Моё место в рейтинге", response_model=LeaderboardRank)
+async def get_my_rank(user_id: UserIdDep):
+    member = leaderboard.member(user_id)
+    if member is None:
+        raise HTTPException(status_code=404, detail="Вы пока не участвуете в рейтинге")
+    return LeaderboardRank(
+        user_id=user_id,
+        rating=member.rating,
+        rank=leaderboard.rank(user_id),
+        total=leaderboard.size(),
+        city=member.city,
+        city_rank=leaderboard.rank(user_id, member.city) if member.city else None,
+        city_total=leaderboard.size(member.city) if member.city else None,
+    )
@@ -0,0 +1,28 @@
+from fastapi import APIRouter
+
+from app.api.dependencies import IsAdminDep
+from app.core.database import replicas
+from app.core.db_pool import pool_snapshot
+from app.core.token_cache import token_cache
+
+
+router = APIRouter()
+
+
+@router.get("/tokens", summary="Статистика кэша проверенных JWT (admin)")
+async def token_cache_metrics(is_admin: IsAdminDep) -> dict:
+    return token_cache.stats()
+
+
+@router.get("/pool", summary="Состояние пулов соединений с БД (admin)")
+async def pool_metrics(is_admin: IsAdminDep) -> dict:
+    """
+    Занятые/свободные соединения, overflow, таймауты, pre-ping
+    и гистограмма времени ожидания соединения по каждому движку.
+    """
+    return pool_snapshot()
+
+
+@router.get("/replicas", summary="Состояние read-реплик (admin)")
+async def replica_metrics(is_admin: IsAdminDep) -> list[dict]:
+    return replicas.status()
@@ -0,0 +1,53 @@
+from typing import List
+
+from fastapi import APIRouter, Query
+
+from app.api.dependencies import DBDep, IsAdminDep, ReadDBDep, UserIdDep
+from app.core.jobs import enqueue, notify_workers
+from app.models import RecommendedEvent
+from app.services.recommendations import RecommendationService
+
+
+router = APIRouter()
+
+
+@router.get("/", summary="Рекомендованные мероприятия", response_model=List[RecommendedEvent])
+async def my_recommendations(
+    user_id: UserIdDep,
+    db: ReadDBDep,
+    limit: int = Query(10, ge=1, le=50),
+):
+    """
+    Готовый top-K из таблицы recommendations — один запрос по ключу.
+
+    Пока у волонтёра нет записей (или пересчёт до него ещё не дошёл),
+    отдаются самые востребованные будущие мероприятия.
+    """
+    rows = await RecommendationService(db).for_user(user_id, limit)
+    return [
+        RecommendedEvent(
+            id=event.id,
+            title=event.title,
+            description=event.description,
+            ngo_id=event.ngo_id,
+            scheduled_at=event.scheduled_at,
+            location=event.location,
+            max_volunteers=event.max_volunteers,
+            seats_taken=event.seats_taken,
+            score=score,
+        )
+        for event, score in rows
+    ]
+
+
+@router.post("/recompute", summary="Пересчитать рекомендации (admin)", status_code=202)
+async def recompute_recommendations(
+    db: DBDep,
+    is_admin: IsAdminDep,
+    full: bool = Query(False, description="Пересчитать всех волонтёров, а не только изменившихся"),
+):
+    job = await enqueue(db, "recompute_recommendations", {"full": full})
+    job_id = job.id
+    await db.commit()
+    notify_workers()
+    return {"msg": "Пересчёт рекомендаций поставлен в очередь", "job_id": job_id}
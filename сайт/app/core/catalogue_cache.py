@@ -0,0 +1,141 @@
+"""
+Кэш каталога мероприятий: версия каталога, ETag и кэш ответов.
+
+Версия каталога — счётчик в строке catalogue_version, общий для всех
+процессов. Каждая запись, меняющая список (создание и импорт мероприятий,
+запись волонтёра, завершение), увеличивает его в своей транзакции.
+ETag строится только из версии и параметров запроса, поэтому он один
+и тот же во всех воркерах и после перезапуска, а 304 выдаётся кем угодно.
+
+Процесс помнит последнюю прочитанную версию и перечитывает её из БД
+(один запрос по первичному ключу) не чаще раза в TTL, а после собственной
+записи — сразу. Так If-None-Match обычно проверяется без обращения к БД,
+а запись другого процесса становится видна не позже чем через TTL.
+Кэш ответов привязан к версии и сбрасывается при её смене.
+При TTL <= 0 версия читается на каждый запрос, кэш ответов отключён.
+"""
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.requests import Request
+
+from app.core.config import get_settings
+from app.models import CatalogueVersionModel
+
+# Единственная строка таблицы catalogue_version
+VERSION_ROW_ID = 1
+
+
+async def bump_catalogue_version(db: AsyncSession) -> None:
+    """
+    Новая версия каталога в текущей транзакции.
+
+    Строка версии общая для всех записей, поэтому вызывается последней
+    перед COMMIT: её блокировка держится только до конца транзакции.
+    """
+    await db.execute(
+        update(CatalogueVersionModel)
+        .where(CatalogueVersionModel.id == VERSION_ROW_ID)
+        .values(version=CatalogueVersionModel.version + 1)
+    )
+
+
+@dataclass(frozen=True)
+class CachedResponse:
+    version: int
+    body: bytes
+    headers: dict[str, str]
+
+
+class CatalogueCache:
+    def __init__(self, ttl_seconds: float, maxsize: int = 256) -> None:
+        self.ttl_seconds = ttl_seconds
+        self.maxsize = maxsize
+        self._version = 0
+        self._checked_at = float("-inf")
+        self._entries: OrderedDict[str, CachedResponse] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def version(self) -> int:
+        """Последняя прочитанная из БД версия"""
+        return self._version
+
+    @staticmethod
+    def key(request: Request) -> str:
+        """Ключ ответа: путь и отсортированные параметры запроса"""
+        params = "&".join(f"{k}={v}" for k, v in sorted(request.query_params.multi_items()))
+        return f"{request.url.path}?{params}"
+
+    async def current_version(self, db: AsyncSession) -> int:
+        """Версия каталога; из БД перечитывается, если прошло больше TTL"""
+        if time.monotonic() - self._checked_at < self.ttl_seconds:
+            return self._version
+        checked_at = time.monotonic()
+        version = (
+            await db.execute(
+                select(CatalogueVersionModel.version)
+                .where(CatalogueVersionModel.id == VERSION_ROW_ID)
+            )
+        ).scalar() or 0
+        with self._lock:
+            if version != self._version:
+                self._version = version
+                self._entries.clear()
+            self._checked_at = checked_at
+        return version
+
+    @staticmethod
+    def etag(key: str, version: int) -> str:
+        digest = hashlib.sha1(f"{version}:{key}".encode("utf-8"))
+        return f'"{digest.hexdigest()[:20]}"'
+
+    @staticmethod
+    def matches(if_none_match: str | None, etag: str) -> bool:
+        """Совпадает ли If-None-Match (список или *) с ETag"""
+        if not if_none_match:
+            return False
+        if if_none_match.strip() == "*":
+            return True
+        candidates = (tag.strip().removeprefix("W/") for tag in if_none_match.split(","))
+        return etag in candidates
+
+    def get(self, key: str, version: int) -> CachedResponse | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry.version != version:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry
+
+    def put(self, key: str, version: int, body: bytes, headers: dict[str, str]) -> None:
+        if self.ttl_seconds <= 0:
+            return
+        with self._lock:
+            # Версия сменилась, пока читали БД, — ответ уже устарел
+            if version != self._version:
+                return
+            self._entries[key] = CachedResponse(version, body, headers)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def invalidate(self) -> None:
+        """Запись в этом процессе: версия перечитывается при следующем запросе"""
+        with self._lock:
+            self._checked_at = float("-inf")
+            self._entries.clear()
+
+
+catalogue_cache = CatalogueCache(
+    ttl_seconds=get_settings().CATALOGUE_CACHE_TTL_SECONDS,
+    maxsize=get_settings().CATALOGUE_CACHE_SIZE,
+)
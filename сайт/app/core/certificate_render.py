@@ -0,0 +1,141 @@
+"""
+Рендеринг сертификатов в PDF с кэшем на диске по хешу содержимого.
+
+Ключ файла — sha256 от данных сертификата (волонтёр, название, часы,
+дата) и версии шаблона. Повторная выгрузка отдаёт готовый файл через
+FileResponse без повторного рендеринга. Изменение шаблона — это новое
+значение TEMPLATE_VERSION: ключи меняются, и файлы перерисовываются
+лениво, при первом обращении; старые файлы можно удалить в любой момент.
+
+Рендеринг (reportlab) выполняется в пуле процессов вне цикла событий;
+одновременные запросы одного и того же сертификата ждут один рендер.
+"""
+import asyncio
+import hashlib
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from pathlib import Path
+
+from app.core.config import get_settings
+
+# Увеличить при любом изменении вёрстки _render_pdf
+TEMPLATE_VERSION = "1"
+
+
+def certificate_key(payload: dict) -> str:
+    raw = json.dumps(
+        {"template": TEMPLATE_VERSION, **payload},
+        ensure_ascii=False,
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+# Функции уровня модуля, чтобы их можно было передать в ProcessPoolExecutor
+
+
+@lru_cache()
+def _register_font(font_path: str) -> str:
+    from reportlab.pdfbase import pdfmetrics
+    from reportlab.pdfbase.ttfonts import TTFont
+
+    pdfmetrics.registerFont(TTFont("CertificateFont", font_path))
+    return "CertificateFont"
+
+
+def _render_pdf(payload: dict, target: str, font_path: str) -> str:
+    """Рисует сертификат и атомарно кладёт его по пути target"""
+    from reportlab.lib.pagesizes import A4, landscape
+    from reportlab.pdfgen import canvas
+
+    font = _register_font(font_path)
+    width, height = landscape(A4)
+    tmp_path = f"{target}.{os.getpid()}.tmp"
+
+    pdf = canvas.Canvas(tmp_path, pagesize=(width, height))
+    pdf.setTitle(payload["title"])
+    pdf.setLineWidth(3)
+    pdf.rect(30, 30, width - 60, height - 60)
+
+    pdf.setFont(font, 36)
+    pdf.drawCentredString(width / 2, height - 140, "СЕРТИФИКАТ")
+    pdf.setFont(font, 22)
+    pdf.drawCentredString(width / 2, height - 190, payload["title"])
+    pdf.setFont(font, 16)
+    pdf.drawCentredString(width / 2, height - 260, "подтверждает, что")
+    pdf.setFont(font, 28)
+    pdf.drawCentredString(width / 2, height - 310, payload["volunteer_name"])
+    pdf.setFont(font, 16)
+    pdf.drawCentredString(
+        width / 2,
+        height - 360,
+        f"посвятил(а) волонтёрской деятельности не менее {payload['hours']} ч.",
+    )
+    pdf.setFont(font, 12)
+    pdf.drawString(60, 60, f"Дата выдачи: {payload['issued_at'][:10]}")
+    pdf.drawRightString(width - 60, 60, f"№ {payload['certificate_id']} · РукаПомощи")
+    pdf.showPage()
+    pdf.save()
+
+    os.replace(tmp_path, target)
+    return target
+
+
+class CertificateRenderer:
+    def __init__(self, cache_dir: str, workers: int, font_path: str) -> None:
+        self.cache_dir = Path(cache_dir)
+        self.font_path = font_path
+        self._executor = ProcessPoolExecutor(max_workers=workers)
+        self._in_flight: dict[str, asyncio.Future] = {}
+
+    def path_for(self, key: str) -> Path:
+        # Два уровня каталогов, чтобы не держать всё в одной папке
+        return self.cache_dir / key[:2] / f"{key}.pdf"
+
+    async def render(self, payload: dict) -> Path:
+        """Путь к готовому PDF; рендерит только при промахе кэша"""
+        key = certificate_key(payload)
+        path = self.path_for(key)
+        if path.exists():
+            return path
+
+        pending = self._in_flight.get(key)
+        if pending is not None:
+            return await asyncio.shield(pending)
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._in_flight[key] = future
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            await loop.run_in_executor(
+                self._executor, _render_pdf, payload, str(path), self.font_path
+            )
+            future.set_result(path)
+            return path
+        except Exception as ex:
+            future.set_exception(ex)
+            # Исключение уже получит текущий вызов; ожидающие — из future
+            future.exception()
+            raise
+        except BaseException:
+            future.cancel()
+            raise
+        finally:
+            del self._in_flight[key]
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+@lru_cache()
+def get_certificate_renderer() -> CertificateRenderer:
+    settings = get_settings()
+    return CertificateRenderer(
+        cache_dir=settings.CERTIFICATE_CACHE_DIR,
+        workers=settings.CERTIFICATE_RENDER_WORKERS,
+        font_path=settings.CERTIFICATE_FONT_PATH,
+    )
@@ -0,0 +1,160 @@
+"""
+Настройка и инструментирование пулов соединений SQLAlchemy.
+
+- make_pool_class() — подкласс QueuePool/AsyncAdaptedQueuePool, который
+  замеряет время получения соединения (ожидание свободного места в пуле)
+  и считает таймауты;
+- install_pool_events() — счётчики событий пула и стратегия pre-ping
+  "idle": соединение проверяется, только если простаивало дольше порога,
+  а не при каждом checkout, как pool_pre_ping=True.
+
+Снимки метрик отдаёт эндпоинт /api/metrics/pool.
+"""
+import threading
+import time
+from bisect import bisect_left
+
+from sqlalchemy import event, exc
+from sqlalchemy.engine import Engine
+
+# Границы бакетов гистограммы времени ожидания соединения, мс
+WAIT_BUCKETS_MS = (0.5, 1, 5, 10, 25, 50, 100, 250, 500, 1000, 5000)
+
+
+class Histogram:
+    def __init__(self, bounds: tuple[float, ...]) -> None:
+        self.bounds = bounds
+        self._counts = [0] * (len(bounds) + 1)
+        self._lock = threading.Lock()
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float) -> None:
+        with self._lock:
+            self._counts[bisect_left(self.bounds, value)] += 1
+            self.count += 1
+            self.total += value
+            self.max = max(self.max, value)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            buckets = {f"le_{b:g}": n for b, n in zip(self.bounds, self._counts)}
+            buckets["inf"] = self._counts[-1]
+            return {
+                "count": self.count,
+                "avg_ms": self.total / self.count if self.count else 0.0,
+                "max_ms": self.max,
+                "buckets": buckets,
+            }
+
+
+class PoolMetrics:
+    def __init__(self) -> None:
+        self.checkout_wait = Histogram(WAIT_BUCKETS_MS)
+        self.checkouts = 0
+        self.checkout_timeouts = 0
+        self.connects = 0
+        self.invalidations = 0
+        self.pings = 0
+        self.ping_failures = 0
+        # SQL-запросы через движок (для бенчмарков и сравнения с baseline)
+        self.queries = 0
+
+    def snapshot(self, engine: Engine) -> dict:
+        pool = engine.pool
+        gauges = {}
+        for name in ("size", "checkedout", "checkedin", "overflow"):
+            getter = getattr(pool, name, None)
+            if callable(getter):
+                gauges[name] = getter()
+        return {
+            "pool_class": type(pool).__name__,
+            **gauges,
+            "checkouts": self.checkouts,
+            "checkout_timeouts": self.checkout_timeouts,
+            "connects": self.connects,
+            "invalidations": self.invalidations,
+            "pings": self.pings,
+            "ping_failures": self.ping_failures,
+            "queries": self.queries,
+            "checkout_wait_ms": self.checkout_wait.snapshot(),
+        }
+
+
+def make_pool_class(base: type, metrics: PoolMetrics) -> type:
+    """Подкласс пула с замером ожидания соединения; переживает engine.dispose()"""
+
+    class InstrumentedPool(base):
+        def connect(self):
+            started = time.perf_counter()
+            try:
+                return super().connect()
+            except exc.TimeoutError:
+                metrics.checkout_timeouts += 1
+                raise
+            finally:
+                metrics.checkout_wait.observe((time.perf_counter() - started) * 1000)
+
+    InstrumentedPool.__name__ = f"Instrumented{base.__name__}"
+    return InstrumentedPool
+
+
+def _ping(dbapi_connection) -> None:
+    cursor = dbapi_connection.cursor()
+    try:
+        cursor.execute("SELECT 1")
+    finally:
+        cursor.close()
+
+
+def install_pool_events(engine: Engine, metrics: PoolMetrics, idle_ping_seconds: float | None) -> None:
+    """
+    Счётчики событий пула; при idle_ping_seconds — проверка соединения,
+    простоявшего в пуле дольше порога (DisconnectionError заставляет пул
+    выбросить его и взять новое).
+    """
+
+    @event.listens_for(engine, "connect")
+    def _on_connect(dbapi_connection, connection_record):
+        metrics.connects += 1
+        connection_record.info["checked_in_at"] = time.monotonic()
+
+    @event.listens_for(engine, "checkin")
+    def _on_checkin(dbapi_connection, connection_record):
+        connection_record.info["checked_in_at"] = time.monotonic()
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _on_execute(conn, cursor, statement, parameters, context, executemany):
+        metrics.queries += 1
+
+    @event.listens_for(engine, "invalidate")
+    def _on_invalidate(dbapi_connection, connection_record, exception):
+        metrics.invalidations += 1
+
+    @event.listens_for(engine, "checkout")
+    def _on_checkout(dbapi_connection, connection_record, connection_proxy):
+        metrics.checkouts += 1
+        if idle_ping_seconds is None:
+            return
+        checked_in_at = connection_record.info.get("checked_in_at")
+        if checked_in_at is None or time.monotonic() - checked_in_at < idle_ping_seconds:
+            return
+        metrics.pings += 1
+        try:
+            _ping(dbapi_connection)
+        except Exception as ex:
+            metrics.ping_failures += 1
+            raise exc.DisconnectionError() from ex
+
+
+# Зарегистрированные движки для /api/metrics/pool: имя → (engine, метрики)
+pool_registry: dict[str, tuple[Engine, PoolMetrics]] = {}
+
+
+def register_engine(name: str, engine: Engine, metrics: PoolMetrics) -> None:
+    pool_registry[name] = (engine, metrics)
+
+
+def pool_snapshot() -> dict:
+    return {name: metrics.snapshot(engine) for name, (engine, metrics) in pool_registry.items()}
@@ -0,0 +1,150 @@
+"""
+Полнотекстовый поиск мероприятий по названию и описанию.
+
+Индекс — отдельная таблица events_search (DDL в app.models): в SQLite
+виртуальная таблица FTS5 (rowid = id мероприятия), в MySQL — InnoDB
+с индексами FULLTEXT. В индекс пишутся не исходные тексты, а основы
+слов (app.core.stemmer), поэтому «субботники» находит «субботник»,
+а для запроса достаточно префиксного поиска по основам. В MySQL основы
+короче innodb_ft_min_token_size (по умолчанию 3) не индексируются.
+
+Индекс обновляется в той же транзакции, что и само мероприятие
+(index_events), и целиком перестраивается rebuild_search_index —
+из миграции и при начальном заполнении БД.
+"""
+from typing import Iterable
+
+from sqlalchemy import Float, Integer, bindparam, select, text
+from sqlalchemy.engine import Connection
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.stemmer import normalize, tokens
+from app.models import EventModel
+
+# Совпадение в названии весит больше, чем в описании
+TITLE_WEIGHT = 10.0
+# Не больше слов в запросе: каждое — отдельный проход по индексу
+MAX_QUERY_TERMS = 8
+# Ранжируются только столько самых новых совпадений: стоимость запроса
+# растёт с числом совпадений, а на широкий запрос («помощь») их десятки
+# тысяч. Так задержка ограничена и на каталоге в 100 тыс. мероприятий
+SEARCH_CANDIDATES = 1000
+REBUILD_CHUNK_SIZE = 1000
+
+_DELETE = {
+    "sqlite": "DELETE FROM events_search WHERE rowid IN :ids",
+    "mysql": "DELETE FROM events_search WHERE event_id IN :ids",
+}
+_INSERT = {
+    "sqlite": "INSERT INTO events_search (rowid, title, description) "
+              "VALUES (:event_id, :title, :description)",
+    "mysql": "INSERT INTO events_search (event_id, title, description) "
+             "VALUES (:event_id, :title, :description)",
+}
+_MATCHES = {
+    # bm25: чем меньше, тем релевантнее
+    "sqlite": f"""
+        SELECT event_id, rank FROM (
+            SELECT rowid AS event_id, bm25(events_search, {TITLE_WEIGHT}, 1.0) AS rank
+            FROM events_search
+            WHERE events_search MATCH :query
+            ORDER BY rowid DESC
+            LIMIT :candidates
+        ) AS candidates
+        ORDER BY rank
+        LIMIT :limit
+    """,
+    "mysql": f"""
+        SELECT event_id, rank FROM (
+            SELECT event_id,
+                   -({TITLE_WEIGHT} * MATCH (title) AGAINST (:query IN BOOLEAN MODE)
+                     + MATCH (title, description) AGAINST (:query IN BOOLEAN MODE)) AS rank
+            FROM events_search
+            WHERE MATCH (title, description) AGAINST (:query IN BOOLEAN MODE)
+            ORDER BY event_id DESC
+            LIMIT :candidates
+        ) AS candidates
+        ORDER BY rank
+        LIMIT :limit
+    """,
+}
+
+
+def _search_rows(events: Iterable) -> list[dict]:
+    return [
+        {
+            "event_id": event.id,
+            "title": normalize(event.title),
+            "description": normalize(event.description),
+        }
+        for event in events
+    ]
+
+
+def match_query(query: str, dialect: str) -> str | None:
+    """
+    Запрос пользователя → выражение MATCH: все слова обязательны.
+    По префиксу ищется только последнее слово — его могут ещё набирать;
+    остальные совпадают по основе точно, что намного дешевле.
+    """
+    terms = list(dict.fromkeys(tokens(query)))[:MAX_QUERY_TERMS]
+    if not terms:
+        return None
+    if dialect == "mysql":
+        return " ".join(f"+{term}" for term in terms) + "*"
+    return " ".join(f'"{term}"' for term in terms) + "*"
+
+
+def search_matches(query: str, dialect: str, limit: int):
+    """
+    Подзапрос (event_id, rank) с лучшими limit совпадениями;
+    None — в запросе нет ни одного слова.
+    """
+    expression = match_query(query, dialect)
+    if expression is None:
+        return None
+    return (
+        text(_MATCHES[dialect])
+        .bindparams(query=expression, limit=limit, candidates=SEARCH_CANDIDATES)
+        .columns(event_id=Integer, rank=Float)
+        .subquery("matches")
+    )
+
+
+async def index_events(db: AsyncSession, events: Iterable) -> None:
+    """
+    Добавить или обновить мероприятия в индексе (объекты или строки
+    с id, title, description). Коммит — за вызывающим кодом.
+    """
+    rows = _search_rows(events)
+    if not rows:
+        return
+    dialect = db.get_bind().dialect.name
+    delete = text(_DELETE[dialect]).bindparams(bindparam("ids", expanding=True))
+    await db.execute(delete, {"ids": [row["event_id"] for row in rows]})
+    await db.execute(text(_INSERT[dialect]), rows)
+
+
+def rebuild_search_index(conn: Connection) -> int:
+    """Перестроить индекс по всей таблице events; возвращает число мероприятий"""
+    dialect = conn.dialect.name
+    conn.execute(text("DELETE FROM events_search"))
+    indexed, last_id = 0, 0
+    while True:
+        # Порции по первичному ключу, каждая выбирается целиком: вставка
+        # в тот же коннект посреди потокового курсора MySQL невозможна
+        chunk = conn.execute(
+            select(EventModel.id, EventModel.title, EventModel.description)
+            .where(EventModel.id > last_id)
+            .order_by(EventModel.id)
+            .limit(REBUILD_CHUNK_SIZE)
+        ).all()
+        if not chunk:
+            break
+        conn.execute(text(_INSERT[dialect]), _search_rows(chunk))
+        indexed += len(chunk)
+        last_id = chunk[-1].id
+    if dialect == "sqlite":
+        # Слить сегменты FTS5 после массовой вставки — запросы заметно быстрее
+        conn.execute(text("INSERT INTO events_search (events_search) VALUES ('optimize')"))
+    return indexed
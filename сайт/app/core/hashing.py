@@ -0,0 +1,86 @@
+"""
+Пул для хеширования и проверки паролей (bcrypt).
+
+bcrypt занимает 100–300 мс CPU на операцию, поэтому выполняется не в цикле
+событий, а в ограниченном пуле потоков или процессов. Число одновременно
+принятых задач ограничено (workers + queue_size); при переполнении запрос
+сразу получает 503, а не ждёт в бесконечной очереди.
+"""
+import asyncio
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import lru_cache
+
+from passlib.context import CryptContext
+
+from app.core.config import get_settings
+from app.exceptions import PasswordHasherBusyHTTPError
+
+
+@lru_cache()
+def _crypt_context(rounds: int) -> CryptContext:
+    return CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=rounds)
+
+
+# Функции уровня модуля, чтобы их можно было передать в ProcessPoolExecutor
+
+
+def _hash(plain_password: str, rounds: int) -> str:
+    return _crypt_context(rounds).hash(plain_password)
+
+
+def _verify(plain_password: str, hashed_password: str) -> bool:
+    return _crypt_context(get_settings().BCRYPT_ROUNDS).verify(plain_password, hashed_password)
+
+
+def bcrypt_rounds(hashed_password: str) -> int | None:
+    """Cost-фактор из хеша вида $2b$12$..."""
+    parts = hashed_password.split("$")
+    if len(parts) < 4 or not parts[2].isdigit():
+        return None
+    return int(parts[2])
+
+
+class PasswordHasher:
+    def __init__(self, workers: int, queue_size: int, executor: str = "thread") -> None:
+        self.workers = workers
+        self.capacity = workers + queue_size
+        self._slots = threading.BoundedSemaphore(self.capacity)
+        self._executor: Executor
+        if executor == "process":
+            self._executor = ProcessPoolExecutor(max_workers=workers)
+        else:
+            self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="bcrypt")
+
+    async def _run(self, fn, *args):
+        # Неблокирующий захват: при заполненной очереди отвечаем 503 сразу
+        if not self._slots.acquire(blocking=False):
+            raise PasswordHasherBusyHTTPError
+        try:
+            future = self._executor.submit(fn, *args)
+        except BaseException:
+            self._slots.release()
+            raise
+        # Слот освобождается, когда задача закончилась в пуле: отменённый
+        # запрос не должен освобождать место, пока bcrypt ещё занимает поток
+        future.add_done_callback(lambda _: self._slots.release())
+        return await asyncio.wrap_future(future)
+
+    async def hash(self, plain_password: str, rounds: int | None = None) -> str:
+        return await self._run(_hash, plain_password, rounds or get_settings().BCRYPT_ROUNDS)
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        return await self._run(_verify, plain_password, hashed_password)
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+@lru_cache()
+def get_password_hasher() -> PasswordHasher:
+    settings = get_settings()
+    return PasswordHasher(
+        workers=settings.PASSWORD_HASH_WORKERS,
+        queue_size=settings.PASSWORD_HASH_QUEUE_SIZE,
+        executor=settings.PASSWORD_HASH_EXECUTOR,
+    )
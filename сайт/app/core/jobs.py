@@ -0,0 +1,294 @@
+"""
+Очередь фоновых задач в таблице jobs — без внешнего брокера.
+
+Задача ставится в очередь в транзакции вызывающего кода (enqueue), поэтому
+она появляется в БД только вместе с остальными изменениями запроса.
+Воркеры — asyncio-задачи, запущенные при старте приложения; в каждом
+процессе свои, а захват задачи условным UPDATE (status = 'queued')
+гарантирует, что одну задачу выполняет один воркер.
+
+Обработчик выполняется в отдельной сессии; отметка done коммитится в той
+же транзакции, что и его изменения. При ошибке задача возвращается в
+очередь с экспоненциальной задержкой, после max_attempts — failed.
+
+Задачи, зависшие в running дольше JOB_LOCK_TIMEOUT_SECONDS (воркер упал),
+возвращаются в очередь, а исчерпавшие попытки — помечаются failed.
+Периодические задачи (schedule_periodic) ставятся в очередь, только если
+такая же ещё не ждёт и не выполняется.
+"""
+import asyncio
+import json
+import logging
+import os
+import socket
+import traceback
+from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable
+
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.config import get_settings
+from app.models import JobModel
+
+logger = logging.getLogger(__name__)
+
+JobHandler = Callable[[AsyncSession, dict], Awaitable[Any]]
+
+handlers: dict[str, JobHandler] = {}
+
+_AFTER_COMMIT_KEY = "job_after_commit"
+_wakeup: asyncio.Event | None = None
+
+
+def job_handler(kind: str):
+    """Регистрация обработчика задач вида kind"""
+
+    def decorator(fn: JobHandler) -> JobHandler:
+        handlers[kind] = fn
+        return fn
+
+    return decorator
+
+
+def after_commit(db: AsyncSession, callback: Callable[[], Awaitable[Any]]) -> None:
+    """Действие после успешного коммита задачи (кэши, рейтинг в памяти)"""
+    db.info.setdefault(_AFTER_COMMIT_KEY, []).append(callback)
+
+
+def backoff_delay(attempts: int) -> float:
+    settings = get_settings()
+    return min(
+        settings.JOB_BACKOFF_BASE_SECONDS * 2 ** max(attempts - 1, 0),
+        settings.JOB_BACKOFF_MAX_SECONDS,
+    )
+
+
+async def enqueue(
+    db: AsyncSession,
+    kind: str,
+    payload: dict,
+    *,
+    delay: float = 0,
+    max_attempts: int | None = None,
+) -> JobModel:
+    """Постановка задачи в текущей транзакции; после коммита — notify_workers()"""
+    job = JobModel(
+        kind=kind,
+        payload=json.dumps(payload, ensure_ascii=False),
+        status="queued",
+        attempts=0,
+        max_attempts=max_attempts or get_settings().JOB_MAX_ATTEMPTS,
+        run_after=datetime.utcnow() + timedelta(seconds=delay),
+    )
+    db.add(job)
+    await db.flush()
+    return job
+
+
+async def enqueue_unique(db: AsyncSession, kind: str, payload: dict) -> JobModel | None:
+    """Постановка задачи, если такой же нет в очереди или в работе; иначе None"""
+    encoded = json.dumps(payload, ensure_ascii=False)
+    pending = (
+        await db.execute(
+            select(JobModel.id)
+            .where(
+                JobModel.kind == kind,
+                JobModel.payload == encoded,
+                JobModel.status.in_(("queued", "running")),
+            )
+            .limit(1)
+        )
+    ).scalar_one_or_none()
+    if pending is not None:
+        return None
+    return await enqueue(db, kind, payload)
+
+
+def notify_workers() -> None:
+    """Разбудить воркеры этого процесса, не дожидаясь интервала опроса"""
+    if _wakeup is not None:
+        _wakeup.set()
+
+
+class JobWorker:
+    def __init__(self, session_factory: async_sessionmaker, name: str) -> None:
+        self.session_factory = session_factory
+        self.name = name
+
+    async def claim(self) -> int | None:
+        """Захват ближайшей готовой задачи; None — очередь пуста"""
+        async with self.session_factory() as db:
+            now = datetime.utcnow()
+            candidates = (
+                await db.execute(
+                    select(JobModel.id)
+                    .where(JobModel.status == "queued", JobModel.run_after <= now)
+                    .order_by(JobModel.run_after, JobModel.id)
+                    .limit(5)
+                )
+            ).scalars().all()
+            for job_id in candidates:
+                # Другой воркер мог успеть раньше — тогда rowcount == 0
+                claimed = await db.execute(
+                    update(JobModel)
+                    .where(JobModel.id == job_id, JobModel.status == "queued")
+                    .values(
+                        status="running",
+                        locked_by=self.name,
+                        locked_at=now,
+                        attempts=JobModel.attempts + 1,
+                    )
+                )
+                if claimed.rowcount:
+                    await db.commit()
+                    return job_id
+            await db.rollback()
+        return None
+
+    async def run_one(self) -> bool:
+        """Выполнить одну задачу; False — выполнять было нечего"""
+        job_id = await self.claim()
+        if job_id is None:
+            return False
+
+        async with self.session_factory() as db:
+            job = await db.get(JobModel, job_id)
+            try:
+                handler = handlers.get(job.kind)
+                if handler is None:
+                    raise LookupError(f"Неизвестный тип задачи: {job.kind}")
+                result = await handler(db, json.loads(job.payload))
+                job.status = "done"
+                job.result = (
+                    json.dumps(result, ensure_ascii=False, default=str)
+                    if result is not None else None
+                )
+                job.last_error = None
+                job.finished_at = datetime.utcnow()
+                await db.commit()
+            except Exception:
+                await db.rollback()
+                db.info.pop(_AFTER_COMMIT_KEY, None)
+                await self._fail(job_id, traceback.format_exc(limit=5))
+                return True
+
+            for callback in db.info.pop(_AFTER_COMMIT_KEY, []):
+                try:
+                    await callback()
+                except Exception:
+                    logger.exception("Ошибка после выполнения задачи %s", job_id)
+        return True
+
+    async def _fail(self, job_id: int, error: str) -> None:
+        async with self.session_factory() as db:
+            job = await db.get(JobModel, job_id)
+            job.last_error = error
+            job.locked_by = None
+            if job.attempts >= job.max_attempts:
+                job.status = "failed"
+                job.finished_at = datetime.utcnow()
+                logger.error("Задача %s (%s) провалена окончательно", job.id, job.kind)
+            else:
+                job.status = "queued"
+                job.run_after = datetime.utcnow() + timedelta(seconds=backoff_delay(job.attempts))
+            await db.commit()
+
+    async def run(self, wakeup: asyncio.Event, poll_interval: float) -> None:
+        while True:
+            try:
+                worked = await self.run_one()
+            except Exception:
+                logger.exception("Воркер %s: ошибка при работе с очередью", self.name)
+                worked = False
+            if worked:
+                continue
+            try:
+                await asyncio.wait_for(wakeup.wait(), timeout=poll_interval)
+            except asyncio.TimeoutError:
+                pass
+            wakeup.clear()
+
+
+async def requeue_stale(session_factory: async_sessionmaker, timeout: float) -> int:
+    """Вернуть в очередь задачи, брошенные упавшими воркерами"""
+    now = datetime.utcnow()
+    stale = (
+        JobModel.status == "running",
+        JobModel.locked_at < now - timedelta(seconds=timeout),
+    )
+    async with session_factory() as db:
+        # Задача, которая раз за разом роняет воркер, не возвращается вечно:
+        # попытка засчитывается при захвате, как и при обычной ошибке
+        exhausted = await db.execute(
+            update(JobModel)
+            .where(*stale, JobModel.attempts >= JobModel.max_attempts)
+            .values(
+                status="failed",
+                locked_by=None,
+                finished_at=now,
+                last_error="Воркер не завершил задачу, попытки исчерпаны",
+            )
+        )
+        if exhausted.rowcount:
+            logger.error("Зависшие задачи провалены окончательно: %s", exhausted.rowcount)
+        result = await db.execute(
+            update(JobModel)
+            .where(*stale)
+            .values(status="queued", locked_by=None, run_after=now)
+        )
+        await db.commit()
+        return result.rowcount
+
+
+async def _recover_stale(session_factory: async_sessionmaker, timeout: float) -> None:
+    while True:
+        try:
+            await requeue_stale(session_factory, timeout)
+        except Exception:
+            logger.exception("Не удалось вернуть зависшие задачи в очередь")
+        await asyncio.sleep(timeout / 2)
+
+
+async def schedule_periodic(
+    session_factory: async_sessionmaker, kind: str, interval: float, payload: dict
+) -> None:
+    """Раз в interval секунд ставить задачу kind (из startup-хука)"""
+    while True:
+        try:
+            async with session_factory() as db:
+                if await enqueue_unique(db, kind, payload) is not None:
+                    await db.commit()
+                    notify_workers()
+        except Exception:
+            logger.exception("Не удалось поставить периодическую задачу %s", kind)
+        await asyncio.sleep(interval)
+
+
+def start_workers(session_factory: async_sessionmaker) -> list[asyncio.Task]:
+    """Запуск воркеров и возврата зависших задач (из startup-хука)"""
+    global _wakeup
+    settings = get_settings()
+    _wakeup = asyncio.Event()
+    prefix = f"{socket.gethostname()}:{os.getpid()}"
+    tasks = [
+        asyncio.create_task(
+            JobWorker(session_factory, f"{prefix}:{index}").run(
+                _wakeup, settings.JOB_POLL_INTERVAL_SECONDS
+            )
+        )
+        for index in range(settings.JOB_WORKERS)
+    ]
+    tasks.append(
+        asyncio.create_task(_recover_stale(session_factory, settings.JOB_LOCK_TIMEOUT_SECONDS))
+    )
+    return tasks
+
+
+async def drain(session_factory: async_sessionmaker, name: str = "drain") -> int:
+    """Выполнить все готовые задачи в текущем цикле событий (скрипты, тесты)"""
+    worker = JobWorker(session_factory, name)
+    done = 0
+    while await worker.run_one():
+        done += 1
+    return done
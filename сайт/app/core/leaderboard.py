@@ -0,0 +1,199 @@
+"""
+Рейтинг волонтёров в памяти процесса: общий и по городам.
+
+Каждая таблица — отсортированный список ключей (-rating, user_id), поэтому
+"место пользователя" — это bisect (O(log n)), а "топ N" — срез списка.
+Вставка и удаление — bisect плюс сдвиг элементов списка (memmove),
+что на реальных объёмах дешевле любого дерева на Python.
+
+Таблица строится из БД при старте, обновляется точечно при начислении
+часов (complete_event) и периодически сверяется с БД целиком — так
+изменения, сделанные другими процессами-воркерами, доезжают не позже
+чем через LEADERBOARD_RECONCILE_SECONDS.
+
+В рейтинг попадают пользователи с ненулевым рейтингом. Все изменения
+выполняются в цикле событий, поэтому блокировки не нужны.
+"""
+import asyncio
+import logging
+import time
+from bisect import bisect_left, insort
+from dataclasses import dataclass
+from typing import Iterable
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.models import UserModel
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class LeaderboardMember:
+    user_id: int
+    name: str
+    city: str | None
+    rating: float
+
+
+class RankedBoard:
+    """Одна таблица рейтинга: отсортированные ключи (-rating, user_id)"""
+
+    def __init__(self) -> None:
+        self._keys: list[tuple[float, int]] = []
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    @classmethod
+    def from_members(cls, members: Iterable[LeaderboardMember]) -> "RankedBoard":
+        board = cls()
+        board._keys = sorted((-m.rating, m.user_id) for m in members)
+        return board
+
+    def add(self, rating: float, user_id: int) -> None:
+        insort(self._keys, (-rating, user_id))
+
+    def remove(self, rating: float, user_id: int) -> None:
+        key = (-rating, user_id)
+        index = bisect_left(self._keys, key)
+        if index < len(self._keys) and self._keys[index] == key:
+            del self._keys[index]
+
+    def rank(self, rating: float) -> int:
+        """Место с учётом делёжки: 1 + число участников с рейтингом выше"""
+        return bisect_left(self._keys, (-rating,)) + 1
+
+    def top(self, limit: int) -> list[int]:
+        return [user_id for _, user_id in self._keys[:limit]]
+
+
+class Leaderboard:
+    def __init__(self) -> None:
+        self._members: dict[int, LeaderboardMember] = {}
+        self._global = RankedBoard()
+        self._cities: dict[str, RankedBoard] = {}
+        self._pending: list[LeaderboardMember] | None = None
+        self.last_rebuilt_at: float | None = None
+
+    def __len__(self) -> int:
+        return len(self._global)
+
+    def _board(self, city: str | None) -> RankedBoard | None:
+        return self._global if city is None else self._cities.get(city)
+
+    def _discard(self, member: LeaderboardMember) -> None:
+        self._global.remove(member.rating, member.user_id)
+        if member.city is not None:
+            board = self._cities.get(member.city)
+            if board is not None:
+                board.remove(member.rating, member.user_id)
+                if not len(board):
+                    del self._cities[member.city]
+
+    def update(self, member: LeaderboardMember) -> None:
+        """Точечное обновление после начисления часов"""
+        if self._pending is not None:
+            # Идёт перестройка: повторим обновление поверх нового снимка
+            self._pending.append(member)
+        previous = self._members.pop(member.user_id, None)
+        if previous is not None:
+            self._discard(previous)
+        if member.rating <= 0:
+            return
+        self._members[member.user_id] = member
+        self._global.add(member.rating, member.user_id)
+        if member.city is not None:
+            self._cities.setdefault(member.city, RankedBoard()).add(member.rating, member.user_id)
+
+    def begin_rebuild(self) -> None:
+        self._pending = []
+
+    def abort_rebuild(self) -> None:
+        self._pending = None
+
+    def replace(self, members: Iterable[LeaderboardMember]) -> None:
+        """Подмена таблиц снимком из БД"""
+        members = [m for m in members if m.rating > 0]
+        by_city: dict[str, list[LeaderboardMember]] = {}
+        for member in members:
+            if member.city is not None:
+                by_city.setdefault(member.city, []).append(member)
+
+        pending, self._pending = self._pending or [], None
+        self._members = {m.user_id: m for m in members}
+        self._global = RankedBoard.from_members(members)
+        self._cities = {city: RankedBoard.from_members(ms) for city, ms in by_city.items()}
+        self.last_rebuilt_at = time.time()
+        for member in pending:
+            self.update(member)
+
+    def top(self, limit: int, city: str | None = None) -> list[tuple[int, LeaderboardMember]]:
+        board = self._board(city)
+        if board is None:
+            return []
+        result = []
+        for user_id in board.top(limit):
+            member = self._members[user_id]
+            result.append((board.rank(member.rating), member))
+        return result
+
+    def rank(self, user_id: int, city: str | None = None) -> int | None:
+        member = self._members.get(user_id)
+        if member is None or (city is not None and member.city != city):
+            return None
+        board = self._board(city)
+        if board is None:
+            return None
+        return board.rank(member.rating)
+
+    def member(self, user_id: int) -> LeaderboardMember | None:
+        return self._members.get(user_id)
+
+    def size(self, city: str | None = None) -> int:
+        board = self._board(city)
+        return len(board) if board is not None else 0
+
+
+leaderboard = Leaderboard()
+
+
+def _member_columns():
+    return select(UserModel.id, UserModel.name, UserModel.city, UserModel.rating)
+
+
+def _to_member(row) -> LeaderboardMember:
+    return LeaderboardMember(
+        user_id=row.id, name=row.name, city=row.city, rating=float(row.rating or 0)
+    )
+
+
+async def rebuild_leaderboard(session_factory: async_sessionmaker) -> None:
+    """Полная перестройка рейтинга из БД"""
+    leaderboard.begin_rebuild()
+    try:
+        async with session_factory() as db:
+            result = await db.stream(_member_columns().where(UserModel.rating > 0))
+            members = [_to_member(row) async for row in result]
+    except Exception:
+        leaderboard.abort_rebuild()
+        raise
+    leaderboard.replace(members)
+
+
+async def refresh_members(db: AsyncSession, user_ids) -> None:
+    """Точечное обновление рейтинга по свежим значениям из БД"""
+    rows = await db.execute(_member_columns().where(UserModel.id.in_(user_ids)))
+    for row in rows:
+        leaderboard.update(_to_member(row))
+
+
+async def run_reconciliation(session_factory: async_sessionmaker, interval: float) -> None:
+    """Периодическая сверка с БД: подтягивает начисления других воркеров"""
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await rebuild_leaderboard(session_factory)
+        except Exception:
+            logger.exception("Не удалось перестроить рейтинг волонтёров")
@@ -0,0 +1,120 @@
+"""
+Набор read-реплик для read-only эндпоинтов.
+
+Реплики выбираются по кругу (round-robin) среди здоровых. Здоровье
+проверяется фоновой задачей (SELECT 1 с таймаутом); реплика также
+помечается недоступной сразу, если на ней оборвалось соединение.
+Если здоровых реплик нет, чтение идёт на primary.
+
+Сессия с маршрутизацией читает с реплики до первой записи в этой сессии,
+после чего все запросы (включая чтение) уходят на primary — так запрос,
+который что-то записал, видит свои изменения.
+"""
+import asyncio
+import itertools
+import logging
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+
+class ReplicaRoutingSession(Session):
+    """Чтение — с реплики, запись и всё после неё — с primary"""
+
+    def get_bind(self, mapper=None, clause=None, **kw):
+        primary = self.info["primary"]
+        replica = self.info.get("replica")
+        if replica is None or self.info.get("pinned_to_primary"):
+            return primary
+        is_write = self._flushing or (
+            clause is not None
+            and (clause.is_dml or getattr(clause, "_for_update_arg", None) is not None)
+        )
+        if is_write:
+            self.info["pinned_to_primary"] = True
+            return primary
+        self.info["replica_used"] = True
+        return replica
+
+
+class ReplicaSet:
+    def __init__(self, engines: list[AsyncEngine], health_timeout: float = 2.0) -> None:
+        self.engines = engines
+        self.health_timeout = health_timeout
+        self._healthy = [True] * len(engines)
+        self._counter = itertools.count()
+
+    def __len__(self) -> int:
+        return len(self.engines)
+
+    def pick(self) -> AsyncEngine | None:
+        """Следующая здоровая реплика или None"""
+        total = len(self.engines)
+        if not total:
+            return None
+        start = next(self._counter)
+        for offset in range(total):
+            index = (start + offset) % total
+            if self._healthy[index]:
+                return self.engines[index]
+        return None
+
+    def session(self, primary: AsyncEngine, **kwargs) -> AsyncSession:
+        """Сессия с маршрутизацией: реплика для чтения, primary для записи"""
+        replica = self.pick()
+        return AsyncSession(
+            sync_session_class=ReplicaRoutingSession,
+            info={
+                "primary": primary.sync_engine,
+                "replica": replica.sync_engine if replica is not None else None,
+            },
+            **kwargs,
+        )
+
+    def mark_unhealthy(self, engine: AsyncEngine) -> None:
+        for index, candidate in enumerate(self.engines):
+            if candidate.sync_engine is engine.sync_engine and self._healthy[index]:
+                self._healthy[index] = False
+                logger.warning("Реплика %s помечена недоступной", candidate.url)
+
+    def report_failure(self, session: AsyncSession) -> None:
+        """Ошибка соединения в сессии: если читали с реплики — выводим её из ротации"""
+        replica = session.info.get("replica")
+        if replica is None or not session.info.get("replica_used"):
+            return
+        for engine in self.engines:
+            if engine.sync_engine is replica:
+                self.mark_unhealthy(engine)
+
+    async def _ping(self, engine: AsyncEngine) -> bool:
+        try:
+            async with asyncio.timeout(self.health_timeout):
+                async with engine.connect() as conn:
+                    await conn.execute(text("SELECT 1"))
+            return True
+        except Exception:
+            return False
+
+    async def check(self) -> list[bool]:
+        """Проверка всех реплик; возвращает их состояние"""
+        results = await asyncio.gather(*(self._ping(engine) for engine in self.engines))
+        self._healthy = list(results)
+        return self._healthy
+
+    async def run_health_checks(self, interval: float) -> None:
+        while True:
+            await self.check()
+            await asyncio.sleep(interval)
+
+    def status(self) -> list[dict]:
+        return [
+            {"url": str(engine.url), "healthy": healthy}
+            for engine, healthy in zip(self.engines, self._healthy)
+        ]
+
+    async def dispose(self) -> None:
+        for engine in self.engines:
+            await engine.dispose()
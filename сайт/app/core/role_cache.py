@@ -0,0 +1,93 @@
+"""
+TTL-кэш ролей пользователей: user_id → имя роли.
+
+Проверка прав администратора (check_is_admin) при попадании в кэш не
+обращается к БД. Запись сбрасывается после коммита, в котором изменился
+role_id пользователя, а переименование роли сбрасывает кэш целиком.
+Массовые UPDATE в обход ORM нужно сопровождать вызовом invalidate()/clear();
+между процессами устаревание ограничено TTL.
+"""
+import threading
+import time
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+
+from app.core.config import get_settings
+from app.models import RoleModel, UserModel
+
+
+class RoleCache:
+    def __init__(self, ttl_seconds: float, maxsize: int = 100_000) -> None:
+        self.ttl_seconds = ttl_seconds
+        self.maxsize = maxsize
+        self._entries: dict[int, tuple[str, float]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, user_id: int) -> str | None:
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None:
+                return None
+            role, expires_at = entry
+            if expires_at <= time.monotonic():
+                del self._entries[user_id]
+                return None
+            return role
+
+    def put(self, user_id: int, role: str) -> None:
+        if self.ttl_seconds <= 0:
+            return
+        with self._lock:
+            if len(self._entries) >= self.maxsize:
+                self._entries.clear()
+            self._entries[user_id] = (role, time.monotonic() + self.ttl_seconds)
+
+    def invalidate(self, user_id: int) -> None:
+        with self._lock:
+            self._entries.pop(user_id, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+role_cache = RoleCache(ttl_seconds=get_settings().ROLE_CACHE_TTL_SECONDS)
+
+
+_PENDING_KEY = "role_cache_invalidate"
+
+
+@event.listens_for(UserModel, "after_update")
+def _user_role_changed(mapper, connection, target) -> None:
+    if inspect(target).attrs.role_id.history.has_changes():
+        session = inspect(target).session
+        if session is not None:
+            session.info.setdefault(_PENDING_KEY, set()).add(target.id)
+
+
+@event.listens_for(RoleModel, "after_update")
+def _role_renamed(mapper, connection, target) -> None:
+    if inspect(target).attrs.name.history.has_changes():
+        session = inspect(target).session
+        if session is not None:
+            session.info.setdefault(_PENDING_KEY, set()).add(None)
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_invalidations(session) -> None:
+    # Сбрасываем только после коммита, иначе параллельный запрос успел бы
+    # закэшировать ещё не изменённую роль
+    pending = session.info.pop(_PENDING_KEY, None)
+    if not pending:
+        return
+    if None in pending:
+        role_cache.clear()
+        return
+    for user_id in pending:
+        role_cache.invalidate(user_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _drop_invalidations(session) -> None:
+    session.info.pop(_PENDING_KEY, None)
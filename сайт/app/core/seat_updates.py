@@ -0,0 +1,139 @@
+"""
+Рассылка свободных мест по подписанным мероприятиям (Server-Sent Events).
+
+Пути записи (signup, complete) только помечают мероприятие изменённым —
+publish() ничего не читает из БД и не ждёт. Фоновая задача run() не чаще
+SEAT_UPDATES_PER_SECOND раз в секунду одним запросом читает состояние
+всех изменённых мероприятий, на которые кто-то подписан, и раздаёт его
+подписчикам. Поэтому всплеск записей на одно мероприятие превращается
+в одно обновление на окно, а число запросов к БД не зависит ни от числа
+записей, ни от числа открытых соединений.
+
+У подписчика хранится только последнее состояние каждого мероприятия:
+медленный клиент получит свежие данные, а не очередь устаревших.
+Рассылка — в пределах процесса; записи через другие воркеры подписчики
+этого процесса не увидят до следующего изменения здесь же.
+"""
+import asyncio
+import logging
+from typing import Iterable
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.models import EventModel
+
+logger = logging.getLogger(__name__)
+
+
+async def load_seat_states(db: AsyncSession, event_ids: Iterable[int]) -> list[dict]:
+    """Текущее состояние мест одним запросом"""
+    rows = await db.execute(
+        select(
+            EventModel.id,
+            EventModel.status,
+            EventModel.max_volunteers,
+            EventModel.seats_taken,
+        ).where(EventModel.id.in_(list(event_ids)))
+    )
+    return [
+        {
+            "id": row.id,
+            "status": row.status,
+            "max_volunteers": row.max_volunteers,
+            "seats_taken": row.seats_taken,
+            "seats_left": (
+                max(row.max_volunteers - row.seats_taken, 0)
+                if row.max_volunteers is not None else None
+            ),
+        }
+        for row in rows
+    ]
+
+
+class SeatSubscription:
+    """Одно SSE-соединение: последнее состояние по каждому мероприятию"""
+
+    def __init__(self, event_ids: Iterable[int]) -> None:
+        self.event_ids = frozenset(event_ids)
+        self._pending: dict[int, dict] = {}
+        self._ready = asyncio.Event()
+
+    def push(self, state: dict) -> None:
+        self._pending[state["id"]] = state
+        self._ready.set()
+
+    async def next_batch(self, timeout: float) -> list[dict]:
+        """Накопившиеся обновления; пустой список — истёк timeout"""
+        try:
+            await asyncio.wait_for(self._ready.wait(), timeout=timeout)
+        except asyncio.TimeoutError:
+            return []
+        self._ready.clear()
+        batch = list(self._pending.values())
+        self._pending.clear()
+        return batch
+
+
+class SeatBroadcaster:
+    def __init__(self) -> None:
+        self._subscribers: dict[int, set[SeatSubscription]] = {}
+        self._dirty: set[int] = set()
+        self._wakeup = asyncio.Event()
+
+    @property
+    def connections(self) -> int:
+        return len({sub for subs in self._subscribers.values() for sub in subs})
+
+    def subscribe(self, event_ids: Iterable[int]) -> SeatSubscription:
+        subscription = SeatSubscription(event_ids)
+        for event_id in subscription.event_ids:
+            self._subscribers.setdefault(event_id, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: SeatSubscription) -> None:
+        for event_id in subscription.event_ids:
+            subs = self._subscribers.get(event_id)
+            if subs is None:
+                continue
+            subs.discard(subscription)
+            if not subs:
+                del self._subscribers[event_id]
+
+    def publish(self, event_id: int) -> None:
+        """Мероприятие изменилось; без подписчиков — ничего не делаем"""
+        if event_id in self._subscribers:
+            self._dirty.add(event_id)
+            self._wakeup.set()
+
+    def fan_out(self, states: Iterable[dict]) -> None:
+        for state in states:
+            for subscription in self._subscribers.get(state["id"], ()):
+                subscription.push(state)
+
+    async def flush(self, session_factory: async_sessionmaker) -> int:
+        """Разослать состояние изменённых мероприятий; возвращает их число"""
+        event_ids = self._dirty & self._subscribers.keys()
+        self._dirty.clear()
+        if not event_ids:
+            return 0
+        async with session_factory() as db:
+            states = await load_seat_states(db, event_ids)
+        self.fan_out(states)
+        return len(states)
+
+    async def run(self, session_factory: async_sessionmaker, max_rate: float) -> None:
+        """Цикл рассылки: не больше max_rate обновлений в секунду на мероприятие"""
+        interval = 1 / max_rate
+        while True:
+            await self._wakeup.wait()
+            self._wakeup.clear()
+            try:
+                await self.flush(session_factory)
+            except Exception:
+                logger.exception("Не удалось разослать свободные места")
+            # Изменения за это время копятся в _dirty и уйдут одним запросом
+            await asyncio.sleep(interval)
+
+
+seat_broadcaster = SeatBroadcaster()
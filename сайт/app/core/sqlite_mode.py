@@ -0,0 +1,106 @@
+"""
+SQLite без MySQL: файловая база в режиме WAL или in-memory для разработки.
+
+Файловый режим (SQLITE_PATH):
+- WAL: читатели не блокируют писателя и друг друга, а COMMIT дописывает
+  журнал вместо перезаписи страниц; synchronous=NORMAL в WAL не теряет
+  целостность, только последние транзакции при отключении питания;
+- писатель в SQLite всегда один, поэтому пул записи — одно соединение:
+  сессии ждут его в пуле (с метриками ожидания), а не получают
+  SQLITE_BUSY посреди транзакции; busy_timeout — для других процессов;
+- читатели — отдельный пул с query_only, подключённый к ReplicaSet как
+  реплика без задержки: get_read_db читает с него до первой записи.
+
+В обоих режимах включается проверка внешних ключей: SQLite по умолчанию
+её не делает, а запись на мероприятие отсекает несуществующих
+пользователей именно ограничением FOREIGN KEY.
+
+In-memory режим: именованная база с общим кэшем живёт, пока открыто
+хотя бы одно соединение, — его держит StaticPool синхронного движка.
+Асинхронный движок — тоже одно соединение, но через очередь пула:
+StaticPool отдал бы его нескольким сессиям сразу, и их транзакции
+перемешались бы.
+"""
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, StaticPool
+
+from app.core.db_pool import PoolMetrics, make_pool_class
+
+# Для всех соединений, включая in-memory
+BASE_PRAGMAS = ["foreign_keys=ON"]
+
+
+def sqlite_pragmas(settings, read_only: bool = False) -> list[str]:
+    """PRAGMA для каждого нового соединения с файловой базой"""
+    pragmas = BASE_PRAGMAS + [
+        "journal_mode=WAL",
+        f"synchronous={settings.SQLITE_SYNCHRONOUS}",
+        f"busy_timeout={settings.SQLITE_BUSY_TIMEOUT_MS}",
+        f"mmap_size={settings.SQLITE_MMAP_SIZE}",
+        # Отрицательное значение — размер в КиБ, а не в страницах
+        f"cache_size={-settings.SQLITE_CACHE_SIZE_KB}",
+        "temp_store=MEMORY",
+    ]
+    if read_only:
+        pragmas.append("query_only=ON")
+    return pragmas
+
+
+def install_pragmas(engine: Engine, pragmas: list[str]) -> None:
+    @event.listens_for(engine, "connect")
+    def _set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for pragma in pragmas:
+            cursor.execute(f"PRAGMA {pragma}")
+        cursor.close()
+
+
+def file_engines(
+    path: str, settings, write_metrics: PoolMetrics, read_metrics: PoolMetrics
+) -> tuple[Engine, AsyncEngine, AsyncEngine]:
+    """Синхронный движок, асинхронный писатель и пул читателей для файла path"""
+    connect_args = {"check_same_thread": False}
+    engine = create_engine(f"sqlite:///{path}", connect_args=connect_args)
+    writer = create_async_engine(
+        f"sqlite+aiosqlite:///{path}",
+        connect_args=connect_args,
+        poolclass=make_pool_class(AsyncAdaptedQueuePool, write_metrics),
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+    )
+    reader = create_async_engine(
+        f"sqlite+aiosqlite:///{path}",
+        connect_args=connect_args,
+        poolclass=make_pool_class(AsyncAdaptedQueuePool, read_metrics),
+        pool_size=settings.SQLITE_READ_POOL_SIZE,
+        max_overflow=0,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+    )
+    install_pragmas(engine, sqlite_pragmas(settings))
+    install_pragmas(writer.sync_engine, sqlite_pragmas(settings))
+    install_pragmas(reader.sync_engine, sqlite_pragmas(settings, read_only=True))
+    return engine, writer, reader
+
+
+def memory_engines(
+    database: str, settings, metrics: PoolMetrics
+) -> tuple[Engine, AsyncEngine]:
+    """Движки in-memory базы database (URI с mode=memory&cache=shared)"""
+    connect_args = {"check_same_thread": False}
+    engine = create_engine(
+        f"sqlite:///{database}", connect_args=connect_args, poolclass=StaticPool
+    )
+    async_engine = create_async_engine(
+        f"sqlite+aiosqlite:///{database}",
+        connect_args=connect_args,
+        poolclass=make_pool_class(AsyncAdaptedQueuePool, metrics),
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+    )
+    install_pragmas(engine, BASE_PRAGMAS)
+    install_pragmas(async_engine.sync_engine, BASE_PRAGMAS)
+    return engine, async_engine
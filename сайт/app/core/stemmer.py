@@ -0,0 +1,140 @@
+"""
+Нормализация русского текста для полнотекстового поиска.
+
+Стеммер — алгоритм Snowball для русского языка (тот же, что в Lucene
+и PostgreSQL): окончания отсекаются только в области RV, всегда самое
+длинное из подходящих. Слова не на кириллице только приводятся
+к нижнему регистру. Служебные слова (предлоги, союзы, частицы)
+отбрасываются: в запросе они ничего не уточняют, а по префиксу
+совпадают почти с любым текстом.
+"""
+import re
+from functools import lru_cache
+
+_VOWELS = "аеиоуыэюя"
+_WORD = re.compile(r"\w+")
+_CYRILLIC = re.compile(r"^[а-я]+$")
+
+_PERFECTIVE_GERUND = (("в", "вши", "вшись"), ("ив", "ивши", "ившись", "ыв", "ывши", "ывшись"))
+_REFLEXIVE = ((), ("ся", "сь"))
+_ADJECTIVE = ((), (
+    "ее", "ие", "ые", "ое", "ими", "ыми", "ей", "ий", "ый", "ой", "ем", "им", "ым",
+    "ом", "его", "ого", "ему", "ому", "их", "ых", "ую", "юю", "ая", "яя", "ою", "ею",
+))
+_PARTICIPLE = (("ем", "нн", "вш", "ющ", "щ"), ("ивш", "ывш", "ующ"))
+_VERB = (
+    ("ла", "на", "ете", "йте", "ли", "й", "л", "ем", "н", "ло", "но", "ет", "ют",
+     "ны", "ть", "ешь", "нно"),
+    ("ила", "ыла", "ена", "ейте", "уйте", "ите", "или", "ыли", "ей", "уй", "ил", "ыл",
+     "им", "ым", "ен", "ило", "ыло", "ено", "ят", "ует", "уют", "ит", "ыт", "ены",
+     "ить", "ыть", "ишь", "ую", "ю"),
+)
+_NOUN = ((), (
+    "а", "ев", "ов", "ие", "ье", "е", "иями", "ями", "ами", "еи", "ии", "и", "ией",
+    "ей", "ой", "ий", "й", "иям", "ям", "ием", "ем", "ам", "ом", "о", "у", "ах",
+    "иях", "ях", "ы", "ь", "ию", "ью", "ю", "ия", "ья", "я",
+))
+_SUPERLATIVE = ("ейше", "ейш")
+_STOP_WORDS = frozenset("""
+    а без более бы был была были было быть в вам вас во вот все всё всех вы
+    где да для до его ее её если есть еще ещё же за и из или им их к как ко
+    когда кто ли либо мы на над не нет ни но о об от по под при про с со так
+    также то того тоже только у уже чем что чтобы это эти этот я
+""".split())
+_DERIVATIONAL = ("ость", "ост")
+
+
+def _strip(word: str, start: int, groups: tuple[tuple[str, ...], tuple[str, ...]]) -> str | None:
+    """
+    Отсечь самое длинное окончание из groups внутри word[start:].
+    Окончания первой группы отсекаются только после «а» или «я».
+    None — ни одно окончание не подошло.
+    """
+    after_a, plain = groups
+    best = max(
+        (s for s in (*after_a, *plain) if word.endswith(s) and len(word) - len(s) >= start),
+        key=len,
+        default=None,
+    )
+    if best is None:
+        return None
+    stem = word[: -len(best)]
+    if best in after_a and not (len(stem) > start and stem[-1] in "ая"):
+        return None
+    return stem
+
+
+def _regions(word: str) -> tuple[int, int]:
+    """Начала областей RV и R2"""
+
+    def after_vowel_consonant(start: int) -> int:
+        for i in range(start + 1, len(word)):
+            if word[i] not in _VOWELS and word[i - 1] in _VOWELS:
+                return i + 1
+        return len(word)
+
+    rv = next((i + 1 for i, ch in enumerate(word) if ch in _VOWELS), len(word))
+    r1 = after_vowel_consonant(0)
+    return rv, after_vowel_consonant(r1)
+
+
+# Словарь описаний мероприятий невелик: основы почти всегда берутся из кэша
+@lru_cache(maxsize=65536)
+def stem(word: str) -> str:
+    word = word.lower().replace("ё", "е")
+    if not _CYRILLIC.match(word):
+        return word
+    rv, r2 = _regions(word)
+
+    # Шаг 1
+    stripped = _strip(word, rv, _PERFECTIVE_GERUND)
+    if stripped is None:
+        word = _strip(word, rv, _REFLEXIVE) or word
+        stripped = _strip(word, rv, _ADJECTIVE)
+        if stripped is not None:
+            stripped = _strip(stripped, rv, _PARTICIPLE) or stripped
+        else:
+            stripped = _strip(word, rv, _VERB)
+            if stripped is None:
+                stripped = _strip(word, rv, _NOUN)
+    if stripped is not None:
+        word = stripped
+
+    # Шаг 2
+    if word.endswith("и") and len(word) - 1 >= rv:
+        word = word[:-1]
+
+    # Шаг 3
+    for suffix in _DERIVATIONAL:
+        if word.endswith(suffix) and len(word) - len(suffix) >= r2:
+            word = word[: -len(suffix)]
+            break
+
+    # Шаг 4
+    if word.endswith("нн") and len(word) - 2 >= rv:
+        return word[:-1]
+    for suffix in _SUPERLATIVE:
+        if word.endswith(suffix) and len(word) - len(suffix) >= rv:
+            word = word[: -len(suffix)]
+            if word.endswith("нн") and len(word) - 2 >= rv:
+                word = word[:-1]
+            return word
+    if word.endswith("ь") and len(word) - 1 >= rv:
+        word = word[:-1]
+    return word
+
+
+def tokens(text: str | None) -> list[str]:
+    """Основы значимых слов текста в исходном порядке"""
+    if not text:
+        return []
+    return [
+        stem(word)
+        for word in _WORD.findall(text.lower().replace("ё", "е"))
+        if word not in _STOP_WORDS
+    ]
+
+
+def normalize(text: str | None) -> str:
+    """Текст для полнотекстового индекса: основы слов через пробел"""
+    return " ".join(tokens(text))
@@ -0,0 +1,77 @@
+"""
+LRU-кэш уже проверенных JWT-токенов.
+
+Ключ — SHA-256 от токена (сам токен в памяти не храним), значение —
+распакованные claims и момент истечения exp. Повторные запросы той же
+сессии не пересчитывают HMAC-подпись и не разбирают JSON. Запись
+с истёкшим exp считается промахом и удаляется.
+"""
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+from app.core.config import get_settings
+
+
+class VerifiedTokenCache:
+    def __init__(self, maxsize: int) -> None:
+        self.maxsize = maxsize
+        self._entries: OrderedDict[bytes, tuple[dict, float]] = OrderedDict()
+        # Синхронные зависимости FastAPI выполняются в пуле потоков
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def _key(token: str) -> bytes:
+        return hashlib.sha256(token.encode("utf-8")).digest()
+
+    def get(self, token: str) -> dict | None:
+        key = self._key(token)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            claims, expires_at = entry
+            if expires_at <= time.time():
+                del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return dict(claims)
+
+    def put(self, token: str, claims: dict) -> None:
+        expires_at = claims.get("exp")
+        if expires_at is None or self.maxsize <= 0:
+            # Токены без срока действия не кэшируем
+            return
+        key = self._key(token)
+        with self._lock:
+            self._entries[key] = (dict(claims), float(expires_at))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
+
+
+token_cache = VerifiedTokenCache(maxsize=get_settings().TOKEN_CACHE_SIZE)
@@ -4,6 +4,12 @@ from fastapi import HTTPException
 class MyAppHTTPError(HTTPException):
     """Базовое HTTP-исключение приложения."""
 
+    status_code = 500
+    detail = None
+
+    def __init__(self) -> None:
+        super().__init__(status_code=self.status_code, detail=self.detail)
+
 
 class InvalidJWTTokenError(MyAppHTTPError):
     status_code = 401
@@ -24,6 +30,11 @@ class IsNotAdminHTTPError(MyAppHTTPError):
     status_code = 403
     detail = "Недостаточно прав"
 
+
+class PasswordHasherBusyHTTPError(MyAppHTTPError):
+    status_code = 503
+    detail = "Сервер перегружен, повторите попытку позже"
+
 from .auth import IsNotAdminHTTPError
 
 __all__ = ["IsNotAdminHTTPError"]
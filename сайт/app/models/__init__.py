@@ -1,16 +1,21 @@
 from datetime import datetime
 from typing import Optional
 
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, ConfigDict, EmailStr, Field
 from sqlalchemy import (
+    DDL,
+    Boolean,
     Column,
     DateTime,
     Float,
     ForeignKey,
+    Index,
     Integer,
     String,
     Text,
     UniqueConstraint,
+    event,
+    true,
 )
 from sqlalchemy.orm import relationship
 
@@ -42,6 +47,7 @@ class UserModel(Base):
     role_id = Column(Integer, ForeignKey("roles.id"), nullable=False)
     total_hours = Column(Integer, default=0)
     rating = Column(Float, default=0.0)
+    city = Column(String(100), nullable=True)
 
     role = relationship("RoleModel", back_populates="users")
     registrations = relationship("RegistrationModel", back_populates="volunteer")
@@ -57,25 +63,85 @@ class NGOModel(Base):
 
 class EventModel(Base):
     __tablename__ = "events"
+    # Составные индексы под keyset-пагинацию каталога: (scheduled_at, id)
+    # и те же ключи после каждого фильтра по равенству
+    __table_args__ = (
+        Index("ix_events_scheduled_at_id", "scheduled_at", "id"),
+        Index("ix_events_status_scheduled_at_id", "status", "scheduled_at", "id"),
+        Index("ix_events_ngo_id_scheduled_at_id", "ngo_id", "scheduled_at", "id"),
+        Index("ix_events_location_scheduled_at_id", "location", "scheduled_at", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String(200), nullable=False)
     description = Column(Text, nullable=True)
     ngo_id = Column(Integer, ForeignKey("ngos.id"), nullable=False)
     scheduled_at = Column(DateTime, nullable=False)
+    location = Column(String(200), nullable=True)
+    max_volunteers = Column(Integer, nullable=True)
+    # Счётчик занятых мест: меняется только условным UPDATE при записи
+    seats_taken = Column(Integer, nullable=False, default=0, server_default="0")
     duration_hours = Column(Integer, default=2)
+    status = Column(String(20), nullable=False, default="active")
 
     registrations = relationship("RegistrationModel", back_populates="event")
 
 
+# Полнотекстовый индекс мероприятий (app.core.event_search). Устройство
+# таблицы зависит от СУБД, поэтому она создаётся DDL, а не моделью
+EVENTS_SEARCH_DDL = {
+    "sqlite": (
+        "CREATE VIRTUAL TABLE IF NOT EXISTS events_search USING fts5("
+        "title, description, "
+        "tokenize = 'unicode61 remove_diacritics 2', prefix = '2 3')"
+    ),
+    "mysql": (
+        "CREATE TABLE IF NOT EXISTS events_search ("
+        "event_id INT PRIMARY KEY, "
+        "title TEXT NOT NULL, "
+        "description TEXT NOT NULL, "
+        "FULLTEXT KEY ft_events_search_title (title), "
+        "FULLTEXT KEY ft_events_search (title, description)"
+        ") ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci"
+    ),
+}
+for _dialect, _ddl in EVENTS_SEARCH_DDL.items():
+    event.listen(Base.metadata, "after_create", DDL(_ddl).execute_if(dialect=_dialect))
+event.listen(Base.metadata, "before_drop", DDL("DROP TABLE IF EXISTS events_search"))
+
+
+class CatalogueVersionModel(Base):
+    """Общая для всех процессов версия каталога (app.core.catalogue_cache); одна строка id = 1"""
+
+    __tablename__ = "catalogue_version"
+
+    id = Column(Integer, primary_key=True, autoincrement=False)
+    version = Column(Integer, nullable=False, default=0, server_default="0")
+
+
+event.listen(
+    CatalogueVersionModel.__table__,
+    "after_create",
+    DDL("INSERT INTO catalogue_version (id, version) VALUES (1, 0)"),
+)
+
+
 class RegistrationModel(Base):
     __tablename__ = "registrations"
+    __table_args__ = (
+        UniqueConstraint("event_id", "volunteer_id", name="unique_registration"),
+        # Профиль волонтёра и начисление часов по завершённому мероприятию;
+        # поиск по event_id обслуживает unique_registration
+        Index("ix_registrations_volunteer_id", "volunteer_id"),
+        Index("ix_registrations_event_id_status", "event_id", "status"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     event_id = Column(Integer, ForeignKey("events.id"), nullable=False)
     volunteer_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     registered_at = Column(DateTime, default=datetime.utcnow)
     hours_earned = Column(Integer, default=0)
+    status = Column(String(20), nullable=False, default="registered")
 
     event = relationship("EventModel", back_populates="registrations")
     volunteer = relationship("UserModel", back_populates="registrations")
@@ -83,13 +149,84 @@ class RegistrationModel(Base):
 
 class CertificateModel(Base):
     __tablename__ = "certificates"
+    __table_args__ = (
+        Index("ix_certificates_volunteer_id", "volunteer_id"),
+        # Сертификат по правилу выдаётся волонтёру один раз; у выданных
+        # вручную rule_id = NULL, и ограничение на них не действует
+        UniqueConstraint("volunteer_id", "rule_id", name="uq_certificates_volunteer_rule"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     volunteer_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    rule_id = Column(Integer, ForeignKey("certificate_rules.id"), nullable=True)
+    title = Column(String(200), nullable=True)
+    hours_required = Column(Integer, nullable=True)
     text = Column(Text, nullable=False)
     issued_at = Column(DateTime, default=datetime.utcnow)
 
 
+class JobModel(Base):
+    """Фоновая задача: очередь в той же БД, без внешнего брокера"""
+
+    __tablename__ = "jobs"
+    # Выбор следующей задачи: WHERE status = 'queued' AND run_after <= now
+    __table_args__ = (
+        Index("ix_jobs_status_run_after_id", "status", "run_after", "id"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    kind = Column(String(50), nullable=False)
+    payload = Column(Text, nullable=False, default="{}")
+    # queued → running → done | failed (после исчерпания попыток)
+    status = Column(String(20), nullable=False, default="queued")
+    attempts = Column(Integer, nullable=False, default=0)
+    max_attempts = Column(Integer, nullable=False, default=5)
+    run_after = Column(DateTime, nullable=False, default=datetime.utcnow)
+    locked_by = Column(String(64), nullable=True)
+    locked_at = Column(DateTime, nullable=True)
+    last_error = Column(Text, nullable=True)
+    result = Column(Text, nullable=True)
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    finished_at = Column(DateTime, nullable=True)
+
+
+class RecommendationModel(Base):
+    """Готовые рекомендации: top-K мероприятий на волонтёра (app.services.recommendations)"""
+
+    __tablename__ = "recommendations"
+
+    # Первичный ключ (user_id, rank) — он же индекс выдачи по порядку
+    user_id = Column(Integer, ForeignKey("users.id"), primary_key=True, autoincrement=False)
+    rank = Column(Integer, primary_key=True, autoincrement=False)
+    event_id = Column(Integer, ForeignKey("events.id"), nullable=False)
+    score = Column(Float, nullable=False)
+
+
+class RecommendationRunModel(Base):
+    """Пересчёт рекомендаций; last_registration_id последнего — водяной знак"""
+
+    __tablename__ = "recommendation_runs"
+
+    id = Column(Integer, primary_key=True, index=True)
+    last_registration_id = Column(Integer, nullable=False)
+    users_updated = Column(Integer, nullable=False)
+    full = Column(Boolean, nullable=False, default=False)
+    finished_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+
+
+class CertificateRuleModel(Base):
+    """Порог часов для автоматической выдачи сертификата"""
+
+    __tablename__ = "certificate_rules"
+
+    id = Column(Integer, primary_key=True, index=True)
+    title = Column(String(200), nullable=False)
+    hours_required = Column(Integer, nullable=False)
+    # NULL — все часы волонтёра (users.total_hours), иначе — часы на мероприятиях НКО
+    ngo_id = Column(Integer, ForeignKey("ngos.id"), nullable=True)
+    is_active = Column(Boolean, nullable=False, default=True, server_default=true())
+
+
 #
 # Pydantic-схемы (для запросов/ответов)
 #
@@ -99,8 +236,7 @@ class Role(BaseModel):
     id: int
     name: str
 
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class UserBase(BaseModel):
@@ -118,8 +254,7 @@ class UserPublic(UserBase):
     total_hours: int
     rating: float
 
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class NGO(BaseModel):
@@ -127,8 +262,7 @@ class NGO(BaseModel):
     name: str
     description: Optional[str] = None
 
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class EventBase(BaseModel):
@@ -136,6 +270,8 @@ class EventBase(BaseModel):
     description: Optional[str] = None
     ngo_id: int
     scheduled_at: datetime
+    location: Optional[str] = None
+    max_volunteers: Optional[int] = Field(None, ge=1)
     duration_hours: int = 2
 
 
@@ -145,10 +281,10 @@ class EventCreate(EventBase):
 
 class EventPublic(EventBase):
     id: int
+    status: str = "active"
     volunteers_count: int
 
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class Registration(BaseModel):
@@ -158,18 +294,81 @@ class Registration(BaseModel):
     registered_at: datetime
     hours_earned: int = 0
 
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class Certificate(BaseModel):
     id: int
     volunteer_id: int
+    rule_id: Optional[int] = None
+    title: Optional[str] = None
+    hours_required: Optional[int] = None
     text: str
     issued_at: datetime
 
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
+
+
+class Job(BaseModel):
+    id: int
+    kind: str
+    payload: str
+    status: str
+    attempts: int
+    max_attempts: int
+    run_after: datetime
+    locked_by: Optional[str] = None
+    last_error: Optional[str] = None
+    result: Optional[str] = None
+    created_at: datetime
+    finished_at: Optional[datetime] = None
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class RecommendedEvent(BaseModel):
+    id: int
+    title: str
+    description: Optional[str] = None
+    ngo_id: int
+    scheduled_at: datetime
+    location: Optional[str] = None
+    max_volunteers: Optional[int] = Field(None, ge=1)
+    seats_taken: int
+    score: float
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class CertificateRuleCreate(BaseModel):
+    title: str
+    hours_required: int
+    ngo_id: Optional[int] = None
+
+
+class CertificateRule(CertificateRuleCreate):
+    id: int
+    is_active: bool = True
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class LeaderboardEntry(BaseModel):
+    rank: int
+    user_id: int
+    name: str
+    city: Optional[str] = None
+    rating: float
+
+
+class LeaderboardRank(BaseModel):
+    user_id: int
+    rating: float
+    rank: int
+    total: int
+    city: Optional[str] = None
+    city_rank: Optional[int] = None
+    city_total: Optional[int] = None
 
 
 